@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Membership, User, Application, Club, Tournament, TournamentMembers
+from .models import Membership, User, Application, Club, Tournament, TournamentMembers, Round, Game, BracketSlot
 
 
 @admin.register(User)
@@ -38,3 +38,30 @@ class TournamentAdmin(admin.ModelAdmin):
 class TournamentMembersAdmin(admin.ModelAdmin):
     list_display = ['user',
                     'tournament']
+
+
+@admin.register(Round)
+class RoundAdmin(admin.ModelAdmin):
+    list_display = ['tournament',
+                    'number']
+
+
+@admin.register(Game)
+class GameAdmin(admin.ModelAdmin):
+    list_display = ['round',
+                    'board',
+                    'white',
+                    'black',
+                    'result']
+    # Results are recorded on the tournament round page, which updates the players' ratings
+    readonly_fields = ['result',
+                       'recorded_at']
+
+
+@admin.register(BracketSlot)
+class BracketSlotAdmin(admin.ModelAdmin):
+    list_display = ['tournament',
+                    'round_number',
+                    'position',
+                    'player',
+                    'seed']
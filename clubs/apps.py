@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ClubsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'clubs'
+
+    def ready(self):
+        from clubs import cache, signals, sqlite  # noqa: F401
+        cache.check_shared_caches()
@@ -0,0 +1,125 @@
+"""Versioned caching of per-object renderings.
+
+Each cached object has a version number in the cache, and its renderings are
+cached under keys that include the version.  Changing the object bumps the
+version, through the signal handlers in clubs.signals, so stale renderings
+are never read again and simply expire.  The backend is whatever CACHES
+configures, which every worker must share for a bump in one to reach the
+others, and hits and misses are counted in the cache itself so that every
+process sharing it adds to the same totals.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.safestring import mark_safe
+
+from clubs.routers import reading_from_replica
+
+STATS = ('hits', 'misses')
+# The caches every worker must share, with the setting choosing each one's backend
+SHARED_CACHES = {
+    # Renderings stay cached for RENDERING_CACHE_SECONDS in workers that never see their versions bumped
+    'default': 'CACHE_BACKEND',
+    # Each worker would keep its own login throttle buckets, multiplying the rates
+    'throttle': 'THROTTLE_CACHE_BACKEND',
+}
+
+
+def check_shared_caches():
+    """Refuse to start outside DEBUG when a cache every worker must share is locmem, one cache per process."""
+    if settings.DEBUG:
+        return
+    for alias, setting in SHARED_CACHES.items():
+        if isinstance(caches[alias], LocMemCache):
+            raise ImproperlyConfigured(f"The '{alias}' cache must be shared by every worker, so set {setting} to "
+                                       f"'db' or 'file', not 'locmem'")
+
+
+def _version_key(kind, pk):
+    return f'{kind}:{pk}:version'
+
+
+def version(kind, pk):
+    """Return the current version of an object."""
+    return versions(kind, [pk])[pk]
+
+
+def versions(kind, pks):
+    """Return the current versions of several objects of a kind, as a dict by primary key, in one lookup."""
+    keys = {pk: _version_key(kind, pk) for pk in pks}
+    found = cache.get_many(keys.values())
+    current = {}
+    for pk, key in keys.items():
+        if key not in found:
+            # A version that was evicted restarts from the clock, never from a number an older rendering used
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        current[pk] = found[key]
+    return current
+
+
+def bump(kind, pk):
+    """Invalidate every cached rendering of an object.
+
+    Inside a transaction the version is bumped again on commit, so a rendering
+    of the old rows cached by a concurrent request in the meantime is not
+    served afterwards.
+    """
+    _bump(_version_key(kind, pk))
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(_version_key(kind, pk)))
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def cached_rendering(kind, pk, render):
+    """Return the cached rendering of an object, calling render() to produce it on a miss."""
+    return cached_renderings([(f'{kind}:{pk}:{version(kind, pk)}', render)])[0]
+
+
+def cached_renderings(renderings):
+    """Return the cached renderings for a list of (key, render) pairs, in one lookup.
+
+    Each key must include the versions of everything its rendering shows.
+    render() is only called for the renderings missing from the cache, which
+    are then stored together, unless they were read from the replica.
+    """
+    keys = [f'{key}:rendering' for key, _ in renderings]
+    found = cache.get_many(keys)
+    missing = {key: render() for key, (_, render) in zip(keys, renderings) if key not in found}
+    # Rows read from a lagging replica may be older than the versions in the keys
+    if missing and not reading_from_replica():
+        cache.set_many(missing, settings.RENDERING_CACHE_SECONDS)
+    _count('hits', len(keys) - len(missing))
+    _count('misses', len(missing))
+    return [mark_safe(found[key] if key in found else missing[key]) for key in keys]
+
+
+def stats():
+    """Return the hits and misses counted so far."""
+    counts = cache.get_many([f'cache_stats:{stat}' for stat in STATS])
+    return {stat: counts.get(f'cache_stats:{stat}', 0) for stat in STATS}
+
+
+def reset_stats():
+    cache.delete_many([f'cache_stats:{stat}' for stat in STATS])
+
+
+def _count(stat, amount=1):
+    if not amount:
+        return
+    key = f'cache_stats:{stat}'
+    if not cache.add(key, amount, timeout=None):
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, timeout=None)
@@ -1,6 +1,6 @@
 from django import forms
 from django.contrib.auth import authenticate
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.core.validators import RegexValidator
 from clubs.models import Club, User, Application, Membership, Tournament, TournamentMembers
 import datetime
@@ -77,12 +77,14 @@ class ApplicationForm(forms.ModelForm):
     def save(self, user=None, club=None):
         super().save(commit=False)
         try:
-            application = Application.objects.create(
-                    user=user,
-                    club=club,
-                    statement=self.cleaned_data.get('statement'),
-                    status='pending'
-            )
+            with transaction.atomic():
+                application = Application.objects.create(
+                        user=user,
+                        club=club,
+                        statement=self.cleaned_data.get('statement'),
+                        status='pending'
+                )
+                club.adjust_counts(pending_applications=1)
             return application
 
         except IntegrityError as e:
@@ -119,16 +121,18 @@ class ClubForm(forms.ModelForm):
 
     def save(self, user):
         super().save(commit=False)
-        club = Club.objects.create(
-            name=self.cleaned_data.get('name'),
-            location=self.cleaned_data.get('location'),
-            description=self.cleaned_data.get('description')
-        )
-        Membership.objects.create(
-            user=user,
-            club=club,
-            type=1
-        )
+        with transaction.atomic():
+            club = Club.objects.create(
+                name=self.cleaned_data.get('name'),
+                location=self.cleaned_data.get('location'),
+                description=self.cleaned_data.get('description'),
+                member_count=1
+            )
+            Membership.objects.create(
+                user=user,
+                club=club,
+                type=1
+            )
 
 class TournamentForm(forms.ModelForm):
     class Meta:
@@ -144,6 +148,8 @@ class TournamentForm(forms.ModelForm):
       'style': 'max-width: 6em'
     }))
 
+    format = forms.ChoiceField(label='Format', choices=Tournament.FORMATS, initial=Tournament.SWISS, required=False)
+
     def clean_deadline(self):
         deadline = self.cleaned_data['deadline']
         if deadline < datetime.date.today():
@@ -163,6 +169,7 @@ class TournamentForm(forms.ModelForm):
             description=self.cleaned_data.get('description'),
             deadline=self.cleaned_data.get('deadline'),
             capacity=self.cleaned_data.get('capacity'),
+            format=self.cleaned_data.get('format') or Tournament.SWISS,
             club=club,
             organiser=user
         )
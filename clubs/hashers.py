@@ -0,0 +1,85 @@
+"""Password hashers tuned for login throughput, chosen by PASSWORD_HASHER in the settings.
+
+Django checks a password against whichever listed hasher made its hash and,
+when that is not the first hasher or its parameters have changed since,
+rehashes it with the first on the spot.  So switching hashers or retuning one
+upgrades every user's hash on their next successful login, with no migration.
+"""
+import base64
+import hashlib
+
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+
+
+class ScryptPasswordHasher(hashers.BasePasswordHasher):
+    """The scrypt hasher of later Django versions, whose hashes it reads and writes, on the standard library alone.
+
+    The work factor takes 16 MiB and tens of milliseconds on one core, against
+    hundreds for Django 3.2's PBKDF2.
+    """
+    algorithm = 'scrypt'
+    work_factor = 2 ** 14
+    block_size = 8
+    parallelism = 1
+    # Bytes scrypt may use; 0 leaves OpenSSL's 32 MiB limit
+    maxmem = 0
+
+    def encode(self, password, salt, work_factor=None, block_size=None, parallelism=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        work_factor = work_factor or self.work_factor
+        block_size = block_size or self.block_size
+        parallelism = parallelism or self.parallelism
+        hash = hashlib.scrypt(password.encode(), salt=salt.encode(), n=work_factor, r=block_size, p=parallelism,
+                              maxmem=self.maxmem, dklen=64)
+        hash = base64.b64encode(hash).decode('ascii').strip()
+        return f'{self.algorithm}${work_factor}${salt}${block_size}${parallelism}${hash}'
+
+    def decode(self, encoded):
+        algorithm, work_factor, salt, block_size, parallelism, hash = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'work_factor': int(work_factor),
+            'salt': salt,
+            'block_size': int(block_size),
+            'parallelism': int(parallelism),
+            'hash': hash,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(password, decoded['salt'], decoded['work_factor'], decoded['block_size'],
+                                decoded['parallelism'])
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            'algorithm': decoded['algorithm'],
+            'work factor': decoded['work_factor'],
+            'block size': decoded['block_size'],
+            'parallelism': decoded['parallelism'],
+            'salt': hashers.mask_hash(decoded['salt']),
+            'hash': hashers.mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (decoded['work_factor'], decoded['block_size'], decoded['parallelism']) != \
+            (self.work_factor, self.block_size, self.parallelism)
+
+    def harden_runtime(self, password, encoded):
+        # Hashes with other parameters are rehashed on login rather than padded out
+        pass
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id at the minimum memory OWASP recommends, on one thread so a login keeps to one worker's core.
+
+    Needs the argon2-cffi package.
+    """
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
@@ -0,0 +1,88 @@
+"""Single-elimination brackets for tournaments.
+
+Contestants are seeded by rating into a bracket the size of the next power of
+two, placed so that the top two seeds can only meet in the final, the top
+four only in the semi-finals and so on.  The empty places are byes, which go
+to the top seeds, whose players move straight on to the second round.  Every
+slot of every round is created up front, so recording a result only fills in
+the next slot, with BracketSlot.advance().
+"""
+import datetime
+
+from django.db import transaction
+
+from clubs.models import BracketSlot, Tournament, TournamentMembers
+
+
+def seed_positions(size):
+    """Return the seeds of a bracket of size players, a power of two, in the order of their slots."""
+    seeds = [1]
+    while len(seeds) < size:
+        # Each seed meets the seed that brings their sum to one past the doubled field
+        total = 2 * len(seeds) + 1
+        seeds = [paired for seed in seeds for paired in (seed, total - seed)]
+    return seeds
+
+
+def plan(player_ids):
+    """Return the (round number, position, player id, seed) of every slot of a bracket for players ranked best first.
+
+    Slots nobody has reached yet have player id and seed None.
+    """
+    rounds = max(1, (len(player_ids) - 1).bit_length())
+    size = 2 ** rounds
+    players = {}
+    for position, seed in enumerate(seed_positions(size)):
+        if seed <= len(player_ids):
+            players[1, position] = (player_ids[seed - 1], seed)
+    # A player drawn against a bye goes straight through to the second round
+    for position in range(0, size, 2):
+        drawn = [players.get((1, position + side)) for side in (0, 1)]
+        if drawn.count(None) == 1:
+            players[2, position // 2] = next(player for player in drawn if player is not None)
+    return [(round_number, position) + players.get((round_number, position), (None, None))
+            for round_number in range(1, rounds + 2)
+            for position in range(size >> (round_number - 1))]
+
+
+def create_bracket(tournament):
+    """Seed the contestants of a knockout whose sign-up deadline has passed by rating and store the whole bracket,
+    returning its slots.
+
+    Raises ValueError if the tournament is not a knockout, sign-up is still
+    open, it already has a bracket or it has fewer than two contestants.
+    """
+    if tournament.format != Tournament.KNOCKOUT:
+        raise ValueError('The tournament is not a knockout')
+    if tournament.deadline > datetime.datetime.now():
+        raise ValueError('Sign-up is still open')
+    with transaction.atomic():
+        if BracketSlot.objects.filter(tournament=tournament).exists():
+            raise ValueError('The tournament already has a bracket')
+        player_ids = list(TournamentMembers.objects.filter(tournament=tournament)
+                          .order_by('-user__rating', 'user_id').values_list('user_id', flat=True))
+        if len(player_ids) < 2:
+            raise ValueError('A bracket needs at least two contestants')
+        return BracketSlot.objects.bulk_create([
+            BracketSlot(tournament=tournament, round_number=round_number, position=position, player_id=player_id,
+                        seed=seed)
+            for round_number, position, player_id, seed in plan(player_ids)
+        ])
+
+
+def bracket_rounds(tournament):
+    """Return the tournament's bracket as a list of rounds, each a list of (top, bottom) slot pairs.
+
+    The champion's slot is returned as a last round of its own, paired with
+    None.  The whole bracket is read in a single query.
+    """
+    rounds = []
+    for slot in BracketSlot.objects.filter(tournament=tournament).select_related('player'):
+        if slot.round_number > len(rounds):
+            rounds.append([])
+        matches = rounds[-1]
+        if slot.position % 2 == 0:
+            matches.append((slot, None))
+        else:
+            matches[-1] = (matches[-1][0], slot)
+    return rounds
@@ -0,0 +1,40 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from faker import Faker
+
+from clubs.models import Club
+from clubs.search import search_clubs
+
+
+class Command(BaseCommand):
+    """Times full-text club searches over a simulated directory."""
+    help = 'Search a simulated directory of clubs and report the latency of each query'
+    QUERIES = ['chess', 'lon', 'new york', 'kn', 'grand master', 'zzz']
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clubs', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the simulated clubs')
+
+    def handle(self, *args, **options):
+        faker = Faker()
+        faker.seed_instance(options['seed'])
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            start = time.perf_counter()
+            Club.objects.bulk_create([
+                Club(name=f'{faker.city()} {rng.choice(["Chess", "Knights", "Rooks", "Grand Masters"])}'[:20],
+                     location=faker.city(), description=faker.sentence())
+                for _ in range(options['clubs'])
+            ], batch_size=1000)
+            self.stdout.write(f"Indexed {options['clubs']} clubs in {time.perf_counter() - start:.2f}s")
+            self.stdout.write(f"{'query':<15}{'ms':>10}{'matches':>9}")
+            for query in self.QUERIES:
+                start = time.perf_counter()
+                page = list(search_clubs(Club.objects.all(), query).order_by('rank', 'id')[:50])
+                elapsed = (time.perf_counter() - start) * 1000
+                self.stdout.write(f'{query:<15}{elapsed:>10.2f}{len(page):>9}')
+            # Leave no trace of the simulated clubs
+            transaction.set_rollback(True)
@@ -0,0 +1,50 @@
+import math
+import time
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from clubs.models import User
+
+
+class Command(BaseCommand):
+    """Times logins under each password hasher, as the CPU time of authenticate() on one core."""
+    help = 'Report the logins per second per core of every PASSWORD_HASHER profile'
+    PASSWORD = 'Password123'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=50, help='Logins timed per profile')
+        parser.add_argument('--profiles', nargs='+', choices=list(settings.PASSWORD_HASHER_PROFILES),
+                            default=list(settings.PASSWORD_HASHER_PROFILES))
+        parser.add_argument('--peak', type=float, help='Logins per second to size the cores for')
+
+    def handle(self, *args, **options):
+        logins = options['logins']
+        self.stdout.write(f"{'profile':<10}{'logins/s/core':>15}{'ms/login':>10}"
+                          + (f"{'cores':>7}" if options['peak'] else ''))
+        for profile in options['profiles']:
+            with override_settings(PASSWORD_HASHERS=[settings.PASSWORD_HASHER_PROFILES[profile]]):
+                try:
+                    password = make_password(self.PASSWORD)
+                except ValueError as error:
+                    # The hasher's library is not installed
+                    self.stdout.write(f'{profile:<10}skipped: {error}')
+                    continue
+                with transaction.atomic():
+                    user = User.objects.create(email='benchmark@example.org', name='Benchmark', password=password)
+                    start, start_cpu = time.perf_counter(), time.process_time()
+                    for _ in range(logins):
+                        if authenticate(email=user.email, password=self.PASSWORD) is None:
+                            raise CommandError(f'Logging in failed under {profile}')
+                    elapsed, cpu = time.perf_counter() - start, time.process_time() - start_cpu
+                    # Leave no trace of the benchmark user
+                    transaction.set_rollback(True)
+            rate = logins / cpu
+            line = f'{profile:<10}{rate:>15.1f}{elapsed / logins * 1000:>10.2f}'
+            if options['peak']:
+                line += f"{math.ceil(options['peak'] / rate):>7}"
+            self.stdout.write(line)
@@ -0,0 +1,48 @@
+import datetime
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from clubs.models import Club, Game, Tournament, TournamentMembers, User
+from clubs.round_robin import berger_rounds, schedule_round_robin
+
+
+class Command(BaseCommand):
+    """Times round-robin scheduling, both the Berger tables alone and stored in the database."""
+    help = 'Generate and store the schedule of a simulated round robin and report how long it takes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=96)
+
+    def handle(self, *args, **options):
+        player_count = options['players']
+        start = time.perf_counter()
+        schedule = berger_rounds(player_count)
+        elapsed = (time.perf_counter() - start) * 1000
+        games = sum(len(pairs) for pairs in schedule)
+        self.stdout.write(f'Berger tables: {len(schedule)} rounds, {games} games in {elapsed:.2f}ms')
+        with transaction.atomic():
+            tournament = self.simulated_tournament(player_count)
+            start = time.perf_counter()
+            schedule_round_robin(tournament)
+            elapsed = (time.perf_counter() - start) * 1000
+            stored = Game.objects.filter(round__tournament=tournament).count()
+            self.stdout.write(f'Stored schedule: {stored} games in {elapsed:.2f}ms')
+            # Leave no trace of the simulated tournament
+            transaction.set_rollback(True)
+
+    def simulated_tournament(self, player_count):
+        password = make_password(None)
+        User.objects.bulk_create([User(email=f'benchmark{i}@example.org', name=f'Benchmark {i}', password=password)
+                                  for i in range(player_count)])
+        club = Club.objects.create(name='benchmark', location='benchmark', description='benchmark')
+        tournament = Tournament.objects.create(name='benchmark round robin', organiser=User.objects.latest('id'),
+                                               description='benchmark', deadline=datetime.datetime.now(),
+                                               capacity=player_count, club=club, format=Tournament.ROUND_ROBIN)
+        TournamentMembers.objects.bulk_create([
+            TournamentMembers(user_id=user_id, tournament=tournament)
+            for user_id in User.objects.filter(email__startswith='benchmark').values_list('id', flat=True)
+        ])
+        return tournament
@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from clubs.models import User
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """Times authenticated page views under each session engine, against the seeded database."""
+    help = 'Report the throughput and queries per request of authenticated pages for every SESSION_MODE'
+    PAGES = ['feed', 'my_clubs', 'club_list', 'user_list', 'tournament_list']
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Page views per session mode')
+        parser.add_argument('--modes', nargs='+', choices=list(settings.SESSION_ENGINES),
+                            default=list(settings.SESSION_ENGINES))
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(membership__type=1).first() or User.objects.first()
+        if user is None:
+            raise CommandError('Seed the database first')
+        urls = [reverse(page) for page in self.PAGES]
+        self.stdout.write(f"{'mode':<16}{'req/s':>10}{'ms/req':>10}{'queries':>9}")
+        for mode in options['modes']:
+            with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[mode], ALLOWED_HOSTS=['testserver']):
+                client = Client()
+                client.force_login(user)
+                # Warm up every page once, so each mode starts with the same caches
+                for url in urls:
+                    client.get(url)
+                counter = QueryCounter()
+                start = time.perf_counter()
+                with connection.execute_wrapper(counter):
+                    for index in range(options['requests']):
+                        client.get(urls[index % len(urls)])
+                elapsed = time.perf_counter() - start
+                client.logout()
+            requests = options['requests']
+            self.stdout.write(f'{mode:<16}{requests / elapsed:>10.1f}{elapsed / requests * 1000:>10.2f}'
+                              f'{counter.count / requests:>9.1f}')
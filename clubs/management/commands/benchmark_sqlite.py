@@ -0,0 +1,78 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+
+from clubs.models import Application, Club, Membership
+
+
+class Command(BaseCommand):
+    """Times concurrent reads and writes against the SQLite database under each pragma profile.
+
+    Each reader and writer is its own process, as gunicorn workers are.
+    Readers load a random club and count its members, and writers rewrite a
+    random application's status to itself in a transaction, so the data is
+    left as it was.
+    """
+    help = 'Report the reads and writes per second of concurrent processes under every SQLITE_PROFILE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=5, help='Time each profile runs for')
+        parser.add_argument('--profiles', nargs='+', choices=list(settings.SQLITE_PROFILES),
+                            default=['default', 'production'])
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('The database is not SQLite')
+        club_ids = list(Club.objects.values_list('id', flat=True))
+        application_ids = list(Application.objects.values_list('id', flat=True))
+        if not club_ids or not application_ids:
+            raise CommandError('Seed the database first')
+        roles = ['read'] * options['readers'] + ['write'] * options['writers']
+        self.stdout.write(f"{'profile':<12}{'reads/s':>10}{'writes/s':>10}{'locked':>8}")
+        for profile in options['profiles']:
+            # Every worker opens its own connections, with the profile's pragmas
+            connections.close_all()
+            start = time.time() + 1
+            with ProcessPoolExecutor(len(roles), initializer=django.setup) as executor:
+                results = list(executor.map(
+                    run, roles, [profile] * len(roles), [start] * len(roles), [options['seconds']] * len(roles),
+                    [club_ids if role == 'read' else application_ids for role in roles]
+                ))
+            reads = sum(done for role, done, _ in results if role == 'read')
+            writes = sum(done for role, done, _ in results if role == 'write')
+            locked = sum(failed for _, _, failed in results)
+            self.stdout.write(f"{profile:<12}{reads / options['seconds']:>10.1f}{writes / options['seconds']:>10.1f}"
+                              f'{locked:>8}')
+        # Leave the database in the journal mode of the configured profile
+        connections.close_all()
+        connections['default'].ensure_connection()
+
+
+def run(role, profile, start, seconds, ids):
+    """Read or write from start for the given seconds, returning (role, operations done, operations locked out)."""
+    settings.SQLITE_PRAGMAS = settings.SQLITE_PROFILES[profile]
+    connections.close_all()
+    done = failed = 0
+    time.sleep(max(0, start - time.time()))
+    while time.time() < start + seconds:
+        try:
+            if role == 'read':
+                club = Club.objects.get(id=random.choice(ids))
+                Membership.objects.filter(club=club).count()
+            else:
+                with transaction.atomic():
+                    Application.objects.filter(id=random.choice(ids)).update(status=F('status'))
+            done += 1
+        except OperationalError:
+            # The database was locked for longer than the busy timeout
+            failed += 1
+    connections.close_all()
+    return role, done, failed
@@ -0,0 +1,36 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from clubs.models import Game
+from clubs.swiss import pair, standings_from_games
+
+
+class Command(BaseCommand):
+    """Times the Swiss pairing engine over a simulated event."""
+    help = 'Pair every round of a simulated Swiss event and report the latency of each round'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=96)
+        parser.add_argument('--rounds', type=int, default=9)
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the simulated ratings and results')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        players = [(player_id, rng.gauss(1500, 300)) for player_id in range(options['players'])]
+        games = []
+        self.stdout.write(f"{'round':>5}{'ms':>10}{'repeats':>9}")
+        for number in range(1, options['rounds'] + 1):
+            standings = standings_from_games(players, games)
+            start = time.perf_counter()
+            boards = pair(standings)
+            elapsed = (time.perf_counter() - start) * 1000
+            repeats = sum(1 for white, black in boards if black and black.player_id in white.opponents)
+            self.stdout.write(f'{number:>5}{elapsed:>10.2f}{repeats:>9}')
+            for white, black in boards:
+                if black is None:
+                    games.append((white.player_id, None, Game.WHITE_WIN))
+                else:
+                    result = rng.choice([Game.WHITE_WIN, Game.BLACK_WIN, Game.DRAW])
+                    games.append((white.player_id, black.player_id, result))
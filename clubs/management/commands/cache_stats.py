@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from clubs import cache
+
+
+class Command(BaseCommand):
+    """Reports how often cached renderings were served instead of rendered."""
+    help = 'Show the hit and miss counts of the rendering cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Start counting again from zero')
+
+    def handle(self, *args, **options):
+        stats = cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / lookups if lookups else 0
+        self.stdout.write(f"Hits: {stats['hits']}, misses: {stats['misses']}, hit ratio: {ratio:.1%}")
+        if options['reset']:
+            cache.reset_stats()
+            self.stdout.write('Counters reset.')
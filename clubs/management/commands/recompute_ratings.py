@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from clubs.models import Game, User
+from clubs.ratings import replay
+
+
+class Command(BaseCommand):
+    """Rebuilds every user's rating by replaying the full game history."""
+    help = 'Recompute all ratings from the recorded game results'
+    BATCH_SIZE = 1000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=Command.BATCH_SIZE,
+                            help='Number of users written back per query')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        with transaction.atomic():
+            user_ids = np.fromiter(User.objects.order_by('id').values_list('id', flat=True).iterator(), dtype=np.int64)
+            white, black, white_points = self.load_games(user_ids)
+            ratings, games = replay(white, black, white_points, len(user_ids))
+            self.stdout.write(f'Replayed {len(white)} games in {time.perf_counter() - start:.2f}s')
+            updated = self.write_back(user_ids, ratings, games, options['batch_size'])
+        self.stdout.write(f'Updated {updated} of {len(user_ids)} users in {time.perf_counter() - start:.2f}s')
+
+    def load_games(self, user_ids):
+        """Return the player indices and white's points of every rated game, in the order they were recorded."""
+        games = Game.objects.exclude(result='').filter(black__isnull=False).order_by('recorded_at', 'id') \
+            .values_list('white_id', 'black_id', 'result')
+        white, black, results = [], [], []
+        for white_id, black_id, result in games.iterator(chunk_size=10000):
+            white.append(white_id)
+            black.append(black_id)
+            results.append(result)
+        points = {result: white_points for result, (white_points, _) in Game.POINTS.items()}
+        return (np.searchsorted(user_ids, white), np.searchsorted(user_ids, black),
+                np.array([points[result] for result in results], dtype=np.float64))
+
+    def write_back(self, user_ids, ratings, games, batch_size):
+        """Save the ratings of every user whose rating or game count changed, returning how many did."""
+        updated = 0
+        for offset in range(0, len(user_ids), batch_size):
+            ids = user_ids[offset:offset + batch_size].tolist()
+            users = list(User.objects.filter(id__in=ids).only('id', 'rating', 'rated_games').order_by('id'))
+            changed = []
+            for user, rating, rated_games in zip(users, ratings[offset:offset + batch_size].tolist(),
+                                                 games[offset:offset + batch_size].tolist()):
+                if abs(user.rating - rating) > 1e-6 or user.rated_games != rated_games:
+                    user.rating, user.rated_games = rating, rated_games
+                    changed.append(user)
+            User.objects.bulk_update(changed, ['rating', 'rated_games'])
+            updated += len(changed)
+        return updated
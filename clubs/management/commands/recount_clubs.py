@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from clubs.models import Club, Membership, Application
+
+
+class Command(BaseCommand):
+    """Verifies the stored club counters against the real row counts and fixes any drift."""
+    help = 'Recount club members and pending applications, repairing drifted counters'
+    BATCH_SIZE = 1000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=Command.BATCH_SIZE,
+                            help='Number of clubs recounted per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        checked = fixed = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                clubs = list(self.recounted_clubs().filter(id__gt=last_id).order_by('id')
+                             .select_for_update(of=('self',))[:options['batch_size']])
+                if not clubs:
+                    break
+                last_id = clubs[-1].id
+                drifted = [club for club in clubs if self.repair(club)]
+                if drifted and not options['dry_run']:
+                    Club.objects.bulk_update(drifted, ['member_count', 'pending_application_count'])
+            checked += len(clubs)
+            fixed += len(drifted)
+            for club in drifted:
+                self.stdout.write(f'Club {club.id}: {club.member_count} members, '
+                                  f'{club.pending_application_count} pending applications')
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(f'Checked {checked} clubs. {verb} {fixed} with drifted counters.')
+
+    def recounted_clubs(self):
+        """Return clubs annotated with their member and pending application counts."""
+        return Club.objects.annotate(
+            actual_member_count=count_subquery(Membership.objects.all()),
+            actual_pending_application_count=count_subquery(Application.objects.filter(status='pending'))
+        )
+
+    def repair(self, club):
+        """Copy the recounted values onto the club, returning True if they had drifted."""
+        if (club.member_count, club.pending_application_count) == \
+                (club.actual_member_count, club.actual_pending_application_count):
+            return False
+        club.member_count = club.actual_member_count
+        club.pending_application_count = club.actual_pending_application_count
+        return True
+
+
+# Counts the rows of the queryset belonging to each club, as a correlated subquery
+def count_subquery(queryset):
+    counts = queryset.filter(club=OuterRef('pk')).order_by().values('club').annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
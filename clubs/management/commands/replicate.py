@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from clubs.routers import REPLICA
+
+
+class Command(BaseCommand):
+    """Copies the primary SQLite database into the replica, standing in for streaming replication.
+
+    The copy uses SQLite's online backup, so the primary stays available
+    throughout, and readers of the replica see the old copy or the new one,
+    never a mix.  With --interval it copies again and again, and the replica
+    lags the primary by up to the interval plus the time a copy takes.
+    """
+    help = 'Copy the primary SQLite database into the replica, once or every --interval seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Seconds between copies, copying until interrupted')
+
+    def handle(self, *args, **options):
+        if REPLICA not in connections.databases:
+            raise CommandError('No replica is configured, set REPLICA_NAME')
+        primary, replica = connections['default'], connections[REPLICA]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Only SQLite databases can be replicated by copying')
+        try:
+            while True:
+                start = time.perf_counter()
+                primary.ensure_connection()
+                replica.ensure_connection()
+                primary.connection.backup(replica.connection)
+                self.stdout.write(f'Replicated to {replica.settings_dict["NAME"]} in '
+                                  f'{(time.perf_counter() - start) * 1000:.1f}ms')
+                if options['interval'] is None:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,25 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from clubs.models import Round, Tournament
+from clubs.round_robin import schedule_round_robin
+
+
+class Command(BaseCommand):
+    """Schedules every round robin whose sign-up deadline has passed; run it periodically."""
+    help = 'Store the schedule of every round-robin tournament that has closed sign-up'
+
+    def handle(self, *args, **options):
+        due = Tournament.objects.filter(format=Tournament.ROUND_ROBIN, deadline__lte=datetime.datetime.now()) \
+            .exclude(id__in=Round.objects.values('tournament_id'))
+        scheduled = 0
+        for tournament in due:
+            try:
+                rounds = schedule_round_robin(tournament)
+            except ValueError as error:
+                self.stdout.write(f'Skipped {tournament.name}: {error}')
+                continue
+            scheduled += 1
+            self.stdout.write(f'Scheduled {len(rounds)} rounds of {tournament.name}')
+        self.stdout.write(f'Scheduled {scheduled} tournaments.')
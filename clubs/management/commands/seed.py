@@ -1,257 +1,243 @@
-from random import randint, choice
-
-import django.db.utils
-from django.core.management.base import BaseCommand
+import datetime
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 from faker import Faker
 
-from clubs.models import User, Club, Membership, Application, Tournament, TournamentMembers
+from clubs import seeding
+from clubs.models import User, Club, Membership, Application, Tournament, TournamentMembers, hash_email
 
 
-# !!! Certain users have to be added
-# !!! Needs tournaments to be added
 class Command(BaseCommand):
-    """The database seeder."""
+    """The database seeder.
+
+    Everything is drawn from one random seed, so the same seed always seeds the
+    same rows, apart from creation times and deadlines, which are relative to
+    today.  Worker processes generate the users and clubs, with their members
+    and applications, a chunk at a time with clubs.seeding, and this process
+    alone inserts each chunk with executemany as it arrives.
+    """
+    help = 'Seed the empty database with users, clubs and tournaments'
     USER_COUNT = 75  # Use to add this many fake users to database
-    CLUB_COUNT = 2  # Use to add this many fake users to database
+    CLUB_COUNT = 2  # Use to add this many fake clubs to database
+    TOURNAMENT_COUNT = 2  # Use to add this many fake tournaments to database
+    # Besides its owner, every fake club has this many members and pending applications
+    MEMBER_COUNT = 10
+    APPLICANT_COUNT = 5
     # Password for every user seeded into the database
     DEFAULT_PASSWORD = 'Password123'
-
-    def __init__(self):
-        super().__init__()
-        self.faker = Faker('en_GB')
-
-    # Creates a user using fake data
-    def create_user_seed(self):
-        fake_email = self.faker.unique.email()
-        fake_name = self.faker.name()
-        random_exp = randint(1, 4)
-        fake_bio = self.faker.text(max_nb_chars=520)
-        User.objects.create_user(
-            email=fake_email,
-            password=self.DEFAULT_PASSWORD,
-            name=fake_name,
-            experience=random_exp,
-            bio=fake_bio
-        )
-
-    # Seeds user
-    def seed_user(self):
-        user_count = 0
-        while user_count < Command.USER_COUNT:
-            print(f'Seeding user {user_count}', end='\r')
-            try:
-                self.create_user_seed()
-            except django.db.utils.IntegrityError:
-                continue
-            user_count += 1
-        print('User seeding complete')
-
-    # Seeds 5 applicants and 10 memberships of different types into the club
-    def seed_applicants_and_memberships(self, club, club_owner):
-        fake_statement = self.faker.text(max_nb_chars=50)
-        potential_applicants = list(User.objects.all())
-        potential_applicants.remove(club_owner)
-        for i in range(5):
-            random_user = choice(potential_applicants)
-            club_application = Application.objects.get_or_create(
-                user=random_user,
-                club=club,
-                statement=fake_statement,
-                status='pending'
-            )
-            potential_applicants.remove(random_user)
-        for i in range(10):
-            random_user = choice(potential_applicants)
-            random_user_type = randint(2, 3)
-            club_member = Membership.objects.create(
-                user=random_user,
-                club=club,
-                type=random_user_type
-            )
-            potential_applicants.remove(random_user)
-
-    # Creates a club using fake data, makes 5 applications, makes 10 members
-    def create_club_seed(self):
-        random_user = choice(User.objects.all())
-        club_name = create_club_name(random_user)
-        # Using Bush House as a default location for now, can be changed later if necessary
-        fake_location = "Bush House"
-        fake_description = self.faker.text(max_nb_chars=520)
-        club_seed = Club.objects.create(
-            name=club_name,
-            location=fake_location,
-            description=fake_description,
-        )
-        club_owner_membership = Membership.objects.create(
-            user=random_user,
-            club=club_seed,
-            type=1
-        )
-        self.seed_applicants_and_memberships(club_seed, random_user)
-
-    # Seeds club
-    def seed_club(self):
-        club_count = 0
-        while club_count < Command.CLUB_COUNT:
-            print(f'Seeding club {club_count}', end='\r')
-            try:
-                self.create_club_seed()
-            except django.db.utils.IntegrityError:
-                continue
-            club_count += 1
-        print('Club seeding complete')
-
-    # Seed gravatar user and club
-    def seed_gravatar(self):
-        if User.objects.filter(email__exact="getgoogle@hotmail.com"):
-            pass
-        else:
-            print(f'Seeding gravatar', end='\r')
-            gravatar_user = User.objects.create_user(
-                # This is not a fake email, but it is an inactive email that has been set up for this purpose and has a
-                # gravatar account associated with it
-                email="getgoogle@hotmail.com",
-                name="Grace Gravatar",
-                password=self.DEFAULT_PASSWORD,
-                experience=2,
-                bio="This account has been purposely seeded to show the working of gravatar. :)"
-            )
-            gravatar_club = Club.objects.create(
-                name="Gravatar Club",
-                location="Bush House",
-                description="This club is to demonstrate the working of gravatar",
-                # no users in the club
-            )
-            gravatar_membership = Membership.objects.create(
-                user=gravatar_user,
-                club=gravatar_club,
-                type=1
-            )
-            self.seed_applicants_and_memberships(gravatar_club, gravatar_user)
-            print('Gravatar seeding complete')
-
-    def seed_set_user_one(self):
-        user = User.objects.create_user(
-            email="jeb@example.org",
-            name="Jebediah Kerman",
-            password=self.DEFAULT_PASSWORD
-        )
-        return user
-
-    def seed_set_user_two(self):
-        user = User.objects.create_user(
-            email="val@example.org",
-            name="Valentina Kerman",
-            password=self.DEFAULT_PASSWORD
-        )
-        return user
-
-    def seed_set_user_three(self):
-        user = User.objects.create_user(
-            email="billie@example.org",
-            name="Billie Kerman",
-            password=self.DEFAULT_PASSWORD
-        )
-        return user
-
-    def seed_set_data(self):
-        """Create set clubs, if not in database"""
-        # c = created is a boolean
-        kerbal_chess_club, created = Club.objects.get_or_create(
-            name="Kerbal Chess Club",
-            location="Bush House",
-            description="Founded by B. Kerman",
-        )
-        if created:
-            print(f'Seeding set data', end='\r')
-        additional_club_one, one_created = Club.objects.get_or_create(
-            name="PEP Chess Club",
-            location="Bush House",
-            description="C++ and Scala",
-        )
-        if one_created:
-            one_owner = choice(User.objects.all())
-            Membership.objects.create(
-                user=one_owner,
-                club=additional_club_one,
-                type=1
-            )
-        additional_club_two, two_created = Club.objects.get_or_create(
-            name="INS Chess Club",
-            location="Bush House",
-            description="Wireshark and HTML",
-        )
-        additional_club_three, three_created = Club.objects.get_or_create(
-            name="SEG Chess Club",
-            location="Bush House",
-            description="Python and Django",
-        )
-        if three_created:
-            three_owner = choice(User.objects.all())
-            Membership.objects.create(
-                user=three_owner,
-                club=additional_club_three,
-                type=1
-            )
-
-        if User.objects.filter(email__exact="jeb@example.org"):
-            pass
-        else:
-            jebediah = self.seed_set_user_one()
-            Membership.objects.get_or_create(
-                user=jebediah,
-                club=kerbal_chess_club,
-                type=3
-            )
-            Membership.objects.get_or_create(
-                user=jebediah,
-                club=additional_club_one,
-                type=2
-            )
-
-        if User.objects.filter(email__exact="val@example.org"):
-            pass
-        else:
-            valentina = self.seed_set_user_two()
-            Membership.objects.get_or_create(
-                user=valentina,
-                club=kerbal_chess_club,
-                type=2
-            )
-            Membership.objects.get_or_create(
-                user=valentina,
-                club=additional_club_two,
-                type=1
-            )
-
-        if User.objects.filter(email__exact="billie@example.org"):
-            pass
-        else:
-            billie = self.seed_set_user_three()
-            Membership.objects.get_or_create(
-                user=billie,
-                club=kerbal_chess_club,
-                type=1
-            )
-            Membership.objects.get_or_create(
-                user=billie,
-                club=additional_club_three,
-                type=3
-            )
-        if created:
-            print('Set data seeding complete')
+    # Rows inserted with each executemany
+    BATCH_SIZE = 5000
+    # Rows generated by a worker at a time; changing them changes the data a seed seeds
+    USER_CHUNK = 5000
+    CLUB_CHUNK = 250
+    # Users and clubs seeded whatever the counts, as (email, name, experience, bio) and (name, description)
+    SET_USERS = [
+        ('jeb@example.org', 'Jebediah Kerman', 1, ''),
+        ('val@example.org', 'Valentina Kerman', 1, ''),
+        ('billie@example.org', 'Billie Kerman', 1, ''),
+        # This is not a fake email, but it is an inactive email that has been set up for this purpose and has a
+        # gravatar account associated with it
+        ('getgoogle@hotmail.com', 'Grace Gravatar', 2,
+         'This account has been purposely seeded to show the working of gravatar. :)'),
+    ]
+    SET_CLUBS = [
+        ('Kerbal Chess Club', 'Founded by B. Kerman'),
+        ('PEP Chess Club', 'C++ and Scala'),
+        ('INS Chess Club', 'Wireshark and HTML'),
+        ('SEG Chess Club', 'Python and Django'),
+        ('Gravatar Club', 'This club is to demonstrate the working of gravatar'),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=Command.USER_COUNT, help='Fake users to seed')
+        parser.add_argument('--clubs', type=int, default=Command.CLUB_COUNT, help='Fake clubs to seed')
+        parser.add_argument('--tournaments', type=int, default=Command.TOURNAMENT_COUNT,
+                            help='Fake tournaments to seed')
+        parser.add_argument('--seed', type=int, help='Random seed, the same seed seeding the same data')
+        parser.add_argument('--batch-size', type=int, default=Command.BATCH_SIZE, help='Rows inserted at a time')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Processes generating the data, 1 to generate it in this process')
 
     # Seeds the database
     def handle(self, *args, **options):
-        self.stdout.write("seeding data...")
-        self.seed_user()
-        self.seed_set_data()
-        self.seed_club()
-        self.seed_gravatar()
-        self.stdout.write("done")
-
-
-# Creates the club name using the club owners name
-def create_club_name(user):
-    club_name = f'{user.name}\'s Club'
-    return club_name
+        if User.objects.filter(is_staff=False, is_superuser=False).exists() or Club.objects.exists():
+            raise CommandError('The database is already seeded, unseed it first')
+        self.seed = options['seed'] if options['seed'] is not None else random.randrange(2 ** 32)
+        self.stdout.write(f'seeding data with --seed {self.seed}...')
+        self.random = random.Random(self.seed)
+        self.faker = Faker('en_GB')
+        self.faker.seed_instance(self.seed)
+        self.workers = options['workers']
+        self.batch_size = options['batch_size']
+        with transaction.atomic():
+            names = self.seed_users(options['users'])
+            owner_ids = self.seed_clubs(names, options['clubs'])
+            self.seed_tournaments(list(names), owner_ids, options['tournaments'])
+        self.stdout.write('done')
+
+    def generate(self, function, arguments):
+        """Yield function(*args) for each tuple of arguments in turn, called by the worker processes."""
+        if self.workers <= 1:
+            for args in arguments:
+                yield function(*args)
+            return
+        with ProcessPoolExecutor(self.workers, initializer=django.setup) as executor:
+            pending = deque()
+            for args in arguments:
+                pending.append(executor.submit(function, *args))
+                # Keep every worker busy, without piling up chunks faster than they are inserted
+                if len(pending) > 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def progress(self, kind, total, chunks):
+        """Yield the chunks of rows, reporting how many of the total have been seeded and how fast."""
+        start, done = time.perf_counter(), 0
+        for chunk in chunks:
+            yield chunk
+            done += len(chunk)
+            rate = done / max(time.perf_counter() - start, 1e-6)
+            self.stdout.write(f'\rSeeding {kind}: {done}/{total}, {rate:.0f} per second', ending='')
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'\rSeeded {done} {kind} in {elapsed:.1f}s, {done / max(elapsed, 1e-6):.0f} per second')
+
+    def insert_rows(self, model, fields, rows):
+        """Insert rows of values for the named fields with executemany, in chunks of the batch size.
+
+        Each value is prepared for the database by its field, and every other
+        field takes the value a new model instance would save, as bulk_create
+        would do.  Unlike bulk_create, one INSERT is compiled for every row
+        rather than one for every few dozen, which SQLite's limit on parameters
+        would otherwise impose.
+        """
+        given = [model._meta.get_field(name) for name in fields]
+        instance = model()
+        others = [field for field in model._meta.concrete_fields if not field.primary_key and field not in given]
+        defaults = tuple(field.get_db_prep_save(field.pre_save(instance, True), connection) for field in others)
+        preparers = [partial(field.get_db_prep_save, connection=connection) for field in given]
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in given + others)
+        placeholders = ', '.join(['%s'] * (len(given) + len(others)))
+        sql = f'INSERT INTO {connection.ops.quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})'
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), self.batch_size):
+                cursor.executemany(sql, [
+                    tuple(prepare(value) for prepare, value in zip(preparers, row)) + defaults
+                    for row in rows[start:start + self.batch_size]
+                ])
+
+    def insert_returning_ids(self, model, fields, rows):
+        """Insert the rows as insert_rows() does, returning the ids of the new rows in order."""
+        last_id = model.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        self.insert_rows(model, fields, rows)
+        return list(model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True))
+
+    # Seeds the set users and then the fake ones, returning the names of all of them by id
+    def seed_users(self, count):
+        password = make_password(self.DEFAULT_PASSWORD)
+        set_rows = [(email, hash_email(email), name, experience, bio, password)
+                    for email, name, experience, bio in self.SET_USERS]
+        chunks = chain([set_rows], self.generate(seeding.users, (
+            (self.seed, start, min(self.USER_CHUNK, count - start), password)
+            for start in range(0, count, self.USER_CHUNK)
+        )))
+        names = {}
+        for rows in self.progress('users', len(set_rows) + count, chunks):
+            user_ids = self.insert_returning_ids(User, seeding.USER_FIELDS, rows)
+            names.update(zip(user_ids, (row[2] for row in rows)))
+        return names
+
+    # Seeds the set clubs and then the fake ones with their members and applicants, returning the owner of each
+    def seed_clubs(self, names, count):
+        user_ids = list(names)
+        jeb, val, billie, grace = user_ids[:len(self.SET_USERS)]
+        fake_ids = user_ids[len(self.SET_USERS):] or user_ids
+
+        def owner_besides(*members):
+            # Without fake users, a set user owns the club, though never one already in it
+            return self.random.choice([user_id for user_id in fake_ids if user_id not in members])
+
+        statements = [self.faker.text(max_nb_chars=50) for _ in range(seeding.POOL_SIZE)]
+        set_clubs = [
+            (name, 'Bush House', description, members, applications)
+            for (name, description), (members, applications) in zip(self.SET_CLUBS, [
+                ([(billie, 1), (jeb, 3), (val, 2)], []),
+                ([(owner_besides(jeb), 1), (jeb, 2)], []),
+                ([(val, 1)], []),
+                ([(owner_besides(billie), 1), (billie, 3)], []),
+                seeding.plan_members(self.random, grace, fake_ids, statements, self.MEMBER_COUNT,
+                                     self.APPLICANT_COUNT),
+            ])
+        ]
+        # The users' ids are consecutive, so the workers can be sent a range rather than every id
+        if user_ids[-1] - user_ids[0] == len(user_ids) - 1:
+            user_ids = range(user_ids[0], user_ids[-1] + 1)
+        chunks = chain([set_clubs], (
+            [(create_club_name(names[owner_id]), *club) for owner_id, *club in chunk]
+            for chunk in self.generate(seeding.clubs, (
+                (self.seed, start, min(self.CLUB_CHUNK, count - start), user_ids, self.MEMBER_COUNT,
+                 self.APPLICANT_COUNT)
+                for start in range(0, count, self.CLUB_CHUNK)
+            ))
+        ))
+        owner_ids = []
+        memberships = applications = 0
+        for clubs in self.progress('clubs', len(set_clubs) + count, chunks):
+            club_ids = self.insert_returning_ids(Club, (
+                'name', 'location', 'description', 'member_count', 'pending_application_count'
+            ), [(name, location, description, len(members), len(applicants))
+                for name, location, description, members, applicants in clubs])
+            club_members = [(user_id, club_id, type)
+                            for club_id, club in zip(club_ids, clubs) for user_id, type in club[3]]
+            club_applications = [(user_id, club_id, statement, 'pending')
+                                 for club_id, club in zip(club_ids, clubs) for user_id, statement in club[4]]
+            self.insert_rows(Membership, ('user', 'club', 'type'), club_members)
+            self.insert_rows(Application, ('user', 'club', 'statement', 'status'), club_applications)
+            memberships += len(club_members)
+            applications += len(club_applications)
+            owner_ids += [(club_id, club[3][0][0]) for club_id, club in zip(club_ids, clubs)]
+        self.stdout.write(f'Seeded {memberships} memberships and {applications} applications')
+        return owner_ids
+
+    # Seeds tournaments organised by the owners of random clubs, each with contestants up to its capacity
+    def seed_tournaments(self, user_ids, owner_ids, count):
+        today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        descriptions = [self.faker.text(max_nb_chars=520) for _ in range(seeding.POOL_SIZE)]
+        formats = [format for format, _ in Tournament.FORMATS]
+        plans = []
+        for index in range(count):
+            club_id, organiser_id = self.random.choice(owner_ids)
+            capacity = self.random.randint(2, 96)
+            contestants = self.random.sample(user_ids, min(self.random.randint(2, capacity), len(user_ids)))
+            plans.append((club_id, organiser_id, capacity, contestants))
+        # Tournaments are few, so they are built here rather than by the workers
+        last_id = Tournament.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        Tournament.objects.bulk_create([
+            Tournament(name=f'Tournament {index}', organiser_id=organiser_id, club_id=club_id, capacity=capacity,
+                       description=self.random.choice(descriptions), format=self.random.choice(formats),
+                       # Some sign-ups have closed, so their tournaments can be paired or scheduled
+                       deadline=today + datetime.timedelta(days=self.random.randint(-7, 30)),
+                       contestant_count=len(contestants))
+            for index, (club_id, organiser_id, capacity, contestants) in enumerate(plans, start=1)
+        ])
+        tournament_ids = Tournament.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)
+        contestants = [(user_id, tournament_id)
+                       for tournament_id, (*_, contestants) in zip(tournament_ids, plans) for user_id in contestants]
+        self.insert_rows(TournamentMembers, ('user', 'tournament'), contestants)
+        self.stdout.write(f'Seeded {len(plans)} tournaments with {len(contestants)} contestants')
+
+
+# Creates the club name using the club owner's first name, cut short to fit the club's name field
+def create_club_name(name):
+    suffix = '\'s Club'
+    return name.split()[0][:Club._meta.get_field('name').max_length - len(suffix)] + suffix
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.5 on 2026-10-18 15:30
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset):
+    counts = queryset.filter(club=OuterRef('pk')).order_by().values('club').annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    Club = apps.get_model('clubs', 'Club')
+    Membership = apps.get_model('clubs', 'Membership')
+    Application = apps.get_model('clubs', 'Application')
+    Club.objects.update(
+        member_count=count_subquery(Membership.objects.all()),
+        pending_application_count=count_subquery(Application.objects.filter(status='pending'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='club',
+            name='pending_application_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.5 on 2026-10-18 15:33
+
+from django.db import migrations, models
+from libgravatar import md5_hash, sanitize_email
+
+BATCH_SIZE = 1000
+
+
+def backfill_email_hashes(apps, schema_editor):
+    User = apps.get_model('clubs', 'User')
+    last_id = 0
+    while True:
+        users = list(User.objects.filter(id__gt=last_id).order_by('id').only('id', 'email')[:BATCH_SIZE])
+        if not users:
+            break
+        for user in users:
+            user.email_hash = md5_hash(sanitize_email(user.email))
+        User.objects.bulk_update(users, ['email_hash'])
+        last_id = users[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_club_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(backfill_email_hashes, migrations.RunPython.noop),
+    ]
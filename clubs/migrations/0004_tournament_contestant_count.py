@@ -0,0 +1,29 @@
+# Generated by Django 3.2.5 on 2026-10-18 15:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_contestant_counts(apps, schema_editor):
+    Tournament = apps.get_model('clubs', 'Tournament')
+    TournamentMembers = apps.get_model('clubs', 'TournamentMembers')
+    counts = TournamentMembers.objects.filter(tournament=OuterRef('pk')).order_by().values('tournament') \
+        .annotate(count=Count('pk')).values('count')
+    Tournament.objects.update(contestant_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_user_email_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='contestant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_contestant_counts, migrations.RunPython.noop),
+    ]
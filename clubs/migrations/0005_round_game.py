@@ -0,0 +1,42 @@
+# Generated by Django 3.2.5 on 2026-10-18 15:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_tournament_contestant_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Round',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='clubs.tournament')),
+            ],
+            options={
+                'ordering': ['number'],
+                'unique_together': {('tournament', 'number')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Game',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.PositiveIntegerField()),
+                ('result', models.CharField(blank=True, choices=[('1-0', 'white won'), ('0-1', 'black won'), ('1/2-1/2', 'draw')], max_length=7)),
+                ('black', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='games_as_black', to=settings.AUTH_USER_MODEL)),
+                ('round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='clubs.round')),
+                ('white', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='games_as_white', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['board'],
+                'unique_together': {('round', 'board')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.5 on 2026-10-18 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0005_round_game'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='recorded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rated_games',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating',
+            field=models.FloatField(default=1200),
+        ),
+    ]
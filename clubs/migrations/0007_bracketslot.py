@@ -0,0 +1,30 @@
+# Generated by Django 3.2.5 on 2026-10-18 15:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0006_ratings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BracketSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round_number', models.PositiveIntegerField()),
+                ('position', models.PositiveIntegerField()),
+                ('seed', models.PositiveIntegerField(blank=True, null=True)),
+                ('player', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bracket_slots', to=settings.AUTH_USER_MODEL)),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='clubs.tournament')),
+            ],
+            options={
+                'ordering': ['round_number', 'position'],
+                'unique_together': {('tournament', 'round_number', 'position')},
+            },
+        ),
+    ]
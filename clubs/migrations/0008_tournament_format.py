@@ -0,0 +1,18 @@
+# Generated by Django 3.2.5 on 2026-10-18 15:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0007_bracketslot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='format',
+            field=models.CharField(choices=[('swiss', 'swiss'), ('knockout', 'knockout'), ('round_robin', 'round robin')], default='swiss', max_length=11),
+        ),
+    ]
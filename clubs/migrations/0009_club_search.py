@@ -0,0 +1,65 @@
+# Generated by Django 3.2.5 on 2026-10-18 15:55
+
+import clubs.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The index stores only tokens and reads the text back from clubs_club, and
+# the prefix indexes make two and three letter prefixes as fast as whole words
+CREATE_INDEX = [
+    """CREATE VIRTUAL TABLE clubs_club_fts USING fts5(
+        name, location, description, content='clubs_club', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER clubs_club_fts_insert AFTER INSERT ON clubs_club BEGIN
+        INSERT INTO clubs_club_fts(rowid, name, location, description)
+        VALUES (new.id, new.name, new.location, new.description);
+    END""",
+    """CREATE TRIGGER clubs_club_fts_delete AFTER DELETE ON clubs_club BEGIN
+        INSERT INTO clubs_club_fts(clubs_club_fts, rowid, name, location, description)
+        VALUES ('delete', old.id, old.name, old.location, old.description);
+    END""",
+    """CREATE TRIGGER clubs_club_fts_update AFTER UPDATE OF name, location, description ON clubs_club BEGIN
+        INSERT INTO clubs_club_fts(clubs_club_fts, rowid, name, location, description)
+        VALUES ('delete', old.id, old.name, old.location, old.description);
+        INSERT INTO clubs_club_fts(rowid, name, location, description)
+        VALUES (new.id, new.name, new.location, new.description);
+    END""",
+    "INSERT INTO clubs_club_fts(clubs_club_fts) VALUES ('rebuild')",
+]
+
+DROP_INDEX = [
+    'DROP TRIGGER clubs_club_fts_update',
+    'DROP TRIGGER clubs_club_fts_delete',
+    'DROP TRIGGER clubs_club_fts_insert',
+    'DROP TABLE clubs_club_fts',
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0008_tournament_format'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClubSearch',
+            fields=[
+                ('club', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='clubs.club')),
+                ('document', clubs.search.SearchField(db_column='clubs_club_fts')),
+            ],
+            options={
+                'db_table': 'clubs_club_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(run_on_sqlite(CREATE_INDEX), run_on_sqlite(DROP_INDEX)),
+    ]
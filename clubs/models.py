@@ -1,10 +1,15 @@
+import datetime
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, F
 from django.db.models.deletion import DO_NOTHING
+from django.db.models.functions import Lower
 from django.shortcuts import get_object_or_404
 from clubs.manager import UserManager
+from clubs.ratings import INITIAL_RATING, rating_changes
+from clubs.search import SearchField
 from django.core.validators import MinValueValidator, MaxValueValidator
-from libgravatar import Gravatar
+from libgravatar import md5_hash, sanitize_email
 
 
 class User(AbstractUser):
@@ -17,17 +22,27 @@ class User(AbstractUser):
     name = models.CharField(max_length=100, blank=False)
     experience = models.IntegerField(default=1, choices=LEVEL)
     bio = models.CharField(max_length=520, blank=True)
+    # MD5 of the sanitised email, as used in gravatar URLs, refreshed on every save
+    email_hash = models.CharField(max_length=32, blank=True, editable=False)
+    rating = models.FloatField(default=INITIAL_RATING)
+    rated_games = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
     objects = UserManager()
 
+    def save(self, *args, **kwargs):
+        self.email_hash = hash_email(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_hash'}
+        super().save(*args, **kwargs)
+
     def gravatar(self, size=120):
         """Return an URL to the user's gravatar."""
-        gravatar_object = Gravatar(self.email)
-        gravatar_url = gravatar_object.get_image(size=size, default='mp')
-        return gravatar_url
+        email_hash = self.email_hash or hash_email(self.email)
+        return f'https://www.gravatar.com/avatar/{email_hash}?size={size}&default=mp'
 
     def mini_gravatar(self):
         """Return a URL to a miniature version of the user's gravatar"""
@@ -35,6 +50,13 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ['experience']
+        indexes = [
+            # Serve the prefix searches of clubs.search.search_users
+            models.Index(Lower('name'), name='user_name_prefix_idx'),
+            models.Index(Lower('email'), name='user_email_prefix_idx'),
+            # The pages of the user list, in keyset order
+            models.Index(fields=['experience', 'id'], name='user_experience_id_idx'),
+        ]
 
     def get_membership(self, club_id):
         return get_object_or_404(Membership, user=self, club=Club.objects.get(id=club_id))
@@ -47,16 +69,26 @@ class Club(models.Model):
     name = models.CharField(max_length=20, blank=False)
     location = models.CharField(max_length=40, blank=False)
     description = models.CharField(max_length=520, blank=False)
+    # Denormalised counters, kept in step by adjust_counts() and repaired by the recount_clubs command
+    member_count = models.PositiveIntegerField(default=0)
+    pending_application_count = models.PositiveIntegerField(default=0)
 
     def get_club_owner(self):
         ownership = Membership.objects.get(club=self, type=1)
         return ownership.user
 
     def num_of_applications(self):
-        return len([i for i in self.application_set.all() if i in Application.objects.filter(status='pending')])
+        return self.application_set.filter(status='pending').count()
 
     def num_of_members(self):
-        return len(Membership.objects.filter(club=self))
+        return self.membership_set.count()
+
+    def adjust_counts(self, members=0, pending_applications=0):
+        """Atomically shift the stored member and pending application counters."""
+        Club.objects.filter(pk=self.pk).update(
+            member_count=F('member_count') + members,
+            pending_application_count=F('pending_application_count') + pending_applications
+        )
 
 
 class Application(models.Model):
@@ -69,6 +101,22 @@ class Application(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ('user', 'club')
+        indexes = [
+            # A club's pending applications and a user's applications, newest first in keyset order
+            models.Index(fields=['club', 'status', '-created_at', 'id'], name='application_club_status_idx'),
+            models.Index(fields=['user', '-created_at', 'id'], name='application_user_created_idx'),
+        ]
+
+
+class ClubSearch(models.Model):
+    """A club's row in the full-text index, an FTS5 table on SQLite that triggers keep in sync with clubs_club."""
+    club = models.OneToOneField('Club', on_delete=DO_NOTHING, primary_key=True, db_column='rowid',
+                                related_name='search')
+    document = SearchField(db_column='clubs_club_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'clubs_club_fts'
 
 
 class Membership(models.Model):
@@ -86,9 +134,20 @@ class Membership(models.Model):
     class Meta:
         ordering = ['type']
         unique_together = ('user', 'club')
+        indexes = [
+            # A user's clubs of one membership type, and a club's owner or officers
+            models.Index(fields=['user', 'type'], name='membership_user_type_idx'),
+            models.Index(fields=['club', 'type'], name='membership_club_type_idx'),
+        ]
 
 
 class Tournament(models.Model):
+    SWISS = 'swiss'
+    KNOCKOUT = 'knockout'
+    ROUND_ROBIN = 'round_robin'
+    FORMATS = [(SWISS, 'swiss'),
+               (KNOCKOUT, 'knockout'),
+               (ROUND_ROBIN, 'round robin')]
     name = models.CharField(max_length=100, blank=False, unique=True)
     organiser = models.ForeignKey('User', on_delete=models.CASCADE)
     description = models.CharField(max_length=520, blank=False)
@@ -96,9 +155,38 @@ class Tournament(models.Model):
     capacity = models.IntegerField(validators=[MinValueValidator(2), MaxValueValidator(96)])
     organiser = models.ForeignKey('User', on_delete=DO_NOTHING)
     club = models.ForeignKey('Club', on_delete=models.CASCADE, blank=True)
+    # Seats taken, claimed and released only through claim_seat() and release_seat()
+    contestant_count = models.PositiveIntegerField(default=0)
+    format = models.CharField(max_length=11, choices=FORMATS, default=SWISS)
+
+    def claim_seat(self, user):
+        """Sign the user up if a seat is free and the deadline has not passed, returning whether they were.
+
+        The seat is claimed with a conditional UPDATE, so concurrent sign-ups can
+        never take more seats than the capacity.
+        """
+        try:
+            with transaction.atomic():
+                claimed = Tournament.objects.filter(
+                    pk=self.pk, deadline__gt=datetime.datetime.now(), contestant_count__lt=F('capacity')
+                ).update(contestant_count=F('contestant_count') + 1)
+                if claimed:
+                    TournamentMembers.objects.create(user=user, tournament_id=self.pk)
+        except IntegrityError:
+            # Already a contestant, the claimed seat is rolled back
+            return False
+        return bool(claimed)
+
+    def release_seat(self, user):
+        """Withdraw the user from the tournament, freeing their seat."""
+        with transaction.atomic():
+            deleted, _ = TournamentMembers.objects.filter(user=user, tournament_id=self.pk).delete()
+            if deleted:
+                Tournament.objects.filter(pk=self.pk).update(contestant_count=F('contestant_count') - 1)
+        return bool(deleted)
 
     def num_of_contestants(self):
-        return len([i for i in TournamentMembers.objects.filter(tournament=self)])
+        return self.tournamentmembers_set.count()
     
     def is_contestant(self, user):
         try:
@@ -108,7 +196,14 @@ class Tournament(models.Model):
             return False
     
     def contestants(self):
-        return [i.user for i in TournamentMembers.objects.filter(tournament=self)]
+        return [i.user for i in self.tournamentmembers_set.select_related('user')]
+
+    class Meta:
+        indexes = [
+            # The tournaments of a user's clubs, by deadline
+            models.Index(fields=['club', 'deadline'], name='tournament_club_deadline_idx'),
+        ]
+
 
 class TournamentMembers(models.Model):
     user = models.ForeignKey('User', on_delete=models.CASCADE)
@@ -116,3 +211,97 @@ class TournamentMembers(models.Model):
 
     class Meta:
         unique_together = ('user', 'tournament')
+
+
+class Round(models.Model):
+    tournament = models.ForeignKey('Tournament', on_delete=models.CASCADE)
+    number = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['number']
+        unique_together = ('tournament', 'number')
+
+    def is_finished(self):
+        return not self.game_set.filter(result='').exists()
+
+
+class Game(models.Model):
+    WHITE_WIN = '1-0'
+    BLACK_WIN = '0-1'
+    DRAW = '1/2-1/2'
+    RESULTS = [(WHITE_WIN, 'white won'),
+               (BLACK_WIN, 'black won'),
+               (DRAW, 'draw')]
+    # Points scored by white and black for each result
+    POINTS = {WHITE_WIN: (1, 0), BLACK_WIN: (0, 1), DRAW: (0.5, 0.5)}
+
+    round = models.ForeignKey('Round', on_delete=models.CASCADE)
+    board = models.PositiveIntegerField()
+    white = models.ForeignKey('User', on_delete=models.CASCADE, related_name='games_as_white')
+    # A game without black is a bye, scored as a win for white
+    black = models.ForeignKey('User', on_delete=models.CASCADE, related_name='games_as_black', null=True, blank=True)
+    result = models.CharField(max_length=7, choices=RESULTS, blank=True)
+    recorded_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['board']
+        unique_together = ('round', 'board')
+
+    def record_result(self, result):
+        """Record the result of an unfinished game and update both players' ratings, returning whether it was recorded."""
+        with transaction.atomic():
+            recorded = Game.objects.filter(pk=self.pk, result='', black__isnull=False).update(
+                result=result, recorded_at=datetime.datetime.now()
+            )
+            if not recorded:
+                return False
+            players = User.objects.select_for_update().in_bulk([self.white_id, self.black_id])
+            white, black = players[self.white_id], players[self.black_id]
+            white_change, black_change = rating_changes(white.rating, black.rating, white.rated_games,
+                                                        black.rated_games, Game.POINTS[result][0])
+            User.objects.filter(pk=white.pk).update(rating=F('rating') + white_change,
+                                                    rated_games=F('rated_games') + 1)
+            User.objects.filter(pk=black.pk).update(rating=F('rating') + black_change,
+                                                    rated_games=F('rated_games') + 1)
+        self.result = result
+        return True
+
+
+class BracketSlot(models.Model):
+    """A place in a knockout bracket, filled by the player who reaches it.
+
+    The players in slots 2k and 2k + 1 of a round meet, and the winner moves
+    to slot k of the next round.  The single slot after the final round holds
+    the champion.
+    """
+    tournament = models.ForeignKey('Tournament', on_delete=models.CASCADE)
+    round_number = models.PositiveIntegerField()
+    position = models.PositiveIntegerField()
+    # Empty until a player reaches the slot, and forever empty for a bye
+    player = models.ForeignKey('User', on_delete=models.CASCADE, related_name='bracket_slots', null=True, blank=True)
+    seed = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['round_number', 'position']
+        unique_together = ('tournament', 'round_number', 'position')
+
+    def advance(self):
+        """Move this slot's player on to the next round as the winner of their match, returning whether they moved.
+
+        Only a player whose opponent has arrived can advance, and only into an
+        empty slot, so a match is decided at most once.
+        """
+        if self.player_id is None:
+            return False
+        opponent_arrived = BracketSlot.objects.filter(
+            tournament_id=self.tournament_id, round_number=self.round_number, position=self.position ^ 1,
+            player__isnull=False
+        )
+        return bool(BracketSlot.objects.filter(
+            tournament_id=self.tournament_id, round_number=self.round_number + 1, position=self.position // 2,
+            player__isnull=True
+        ).filter(Exists(opponent_arrived)).update(player_id=self.player_id))
+
+# Hashes an email address the way gravatar expects
+def hash_email(email):
+    return md5_hash(sanitize_email(email))
@@ -0,0 +1,143 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+
+
+class KeysetPage(Sequence):
+    """One page of a keyset paginated queryset, with cursors for its neighbours."""
+
+    def __init__(self, object_list, request, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.request = request
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_query(self):
+        return self._query(self.next_cursor)
+
+    def previous_query(self):
+        return self._query(self.previous_cursor)
+
+    def _query(self, cursor):
+        """Return the current query string with the cursor replaced."""
+        query = self.request.GET.copy()
+        query['cursor'] = cursor
+        return query.urlencode()
+
+
+def paginate(request, queryset, ordering, per_page):
+    """Return the page of the queryset selected by the request's cursor parameter.
+
+    `ordering` lists the fields the queryset is sorted by, prefixed with '-' for
+    descending order, and must end in a unique field so every row has a
+    distinct position.  Rows are found by comparing against the boundary row of
+    the previous page instead of counting an offset, so every page costs the
+    same however deep it is: at most one index seek per field of the ordering.
+    """
+    position = decode_cursor(request.GET.get('cursor'), len(ordering))
+    tiers = [queryset]
+    if position is not None:
+        try:
+            values = _clean(queryset.model, ordering, position['values'])
+            tiers = _tiers_after(queryset, ordering, values, position['direction'] == 'previous')
+        except (TypeError, ValueError, ValidationError):
+            # A cursor with values its fields cannot hold was tampered with, so it is ignored like a malformed one
+            position = None
+    backwards = position is not None and position['direction'] == 'previous'
+    order_by = [_reverse(field) for field in ordering] if backwards else ordering
+    rows = []
+    for tier in tiers:
+        rows += tier.order_by(*order_by)[:per_page + 1 - len(rows)]
+        if len(rows) > per_page:
+            break
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+    # A page reached from a cursor always has rows on the side it was reached from
+    has_next = rows and (backwards or more)
+    has_previous = rows and (more if backwards else position is not None)
+    next_cursor = encode_cursor(ordering, rows[-1], 'next') if has_next else None
+    previous_cursor = encode_cursor(ordering, rows[0], 'previous') if has_previous else None
+    return KeysetPage(rows, request, next_cursor, previous_cursor)
+
+
+def encode_cursor(ordering, row, direction):
+    values = [_value(row, field.lstrip('-')) for field in ordering]
+    data = json.dumps({'values': values, 'direction': direction}, default=str)
+    return urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor, length):
+    """Return the position encoded in a cursor, or None for a missing or malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        position = json.loads(urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        return None
+    if not isinstance(position, dict) or position.get('direction') not in ('next', 'previous') \
+            or not isinstance(position.get('values'), list) or len(position['values']) != length:
+        return None
+    return position
+
+
+def _clean(model, ordering, values):
+    """Return a cursor's values converted and validated by the model fields they are sorted on."""
+    cleaned = []
+    for field, value in zip(ordering, values):
+        try:
+            field = model._meta.get_field(field.lstrip('-'))
+        except FieldDoesNotExist:
+            # Annotations, such as a search rank, are checked as the filter is built
+            cleaned.append(value)
+        else:
+            cleaned.append(field.clean(value, None))
+        # Primary keys have no range validators, but no database holds integers over 64 bits
+        if isinstance(cleaned[-1], int) and cleaned[-1].bit_length() > 63:
+            raise ValueError(f'{cleaned[-1]} is out of range')
+    return cleaned
+
+
+def _tiers_after(queryset, ordering, values, backwards):
+    """Return the rows that sort after the given values, or before when backwards, as querysets in sort order.
+
+    The first holds the rows sharing every value but the last, the next those
+    sharing every value but the last two, and so on.  Each is one seek on an
+    index of the ordering, where a single OR of them, or a row value
+    comparison, makes SQLite scan every row sharing the first value.
+    """
+    tiers = []
+    for index in reversed(range(len(ordering))):
+        field = ordering[index].lstrip('-')
+        descending = ordering[index].startswith('-') != backwards
+        equal = {name.lstrip('-'): value for name, value in zip(ordering[:index], values)}
+        tiers.append(queryset.filter(**equal, **{f'{field}__{"lt" if descending else "gt"}': values[index]}))
+    return tiers
+
+
+def _reverse(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _value(row, field):
+    for attribute in field.split('__'):
+        row = getattr(row, attribute)
+    return row
@@ -0,0 +1,68 @@
+"""Round-robin scheduling for tournaments, from Berger tables.
+
+Every contestant meets every other once, over one round fewer than the
+field, or as many rounds as the field when it is odd and one player rests
+each round.  The schedule follows the FIDE Berger tables, which balance
+colours so that no player's whites and blacks differ by more than one.  The
+whole schedule is stored when the sign-up deadline has passed, with the
+rounds and games each inserted in bulk.
+"""
+import datetime
+
+from django.db import transaction
+
+from clubs.models import Game, Round, Tournament, TournamentMembers
+
+# Games inserted per query; 96 players play 4,560 games
+BATCH_SIZE = 500
+
+
+def berger_rounds(player_count):
+    """Return the rounds of a round robin between player_count players, numbered from 0 by pairing number.
+
+    Each round is a list of (white, black) pairs ordered by board.  With an
+    odd player count the player drawn against the missing last pairing number
+    rests and is left out of the round.
+    """
+    size = player_count + player_count % 2
+    last = size - 1
+    rounds = []
+    for number in range(1, size):
+        # The player on board one meets the last player, and the boards below pair the players either side of them
+        first = ((number + 1) * size // 2 - 1) % last
+        pairs = [(first, last) if number % 2 else (last, first)]
+        pairs += [((first + board) % last, (first - board) % last) for board in range(1, size // 2)]
+        rounds.append([(white, black) for white, black in pairs if player_count not in (white, black)])
+    return rounds
+
+
+def schedule_round_robin(tournament):
+    """Store the full round-robin schedule of a tournament whose sign-up deadline has passed, returning its rounds.
+
+    Contestants take pairing numbers in order of rating.  Raises ValueError if
+    the tournament is not a round robin, sign-up is still open, it already has
+    rounds or it has fewer than two contestants.
+    """
+    if tournament.format != Tournament.ROUND_ROBIN:
+        raise ValueError('The tournament is not a round robin')
+    if tournament.deadline > datetime.datetime.now():
+        raise ValueError('Sign-up is still open')
+    with transaction.atomic():
+        # Lock the tournament so a second scheduler waits and then finds the rounds
+        Tournament.objects.select_for_update().filter(pk=tournament.pk).exists()
+        if Round.objects.filter(tournament=tournament).exists():
+            raise ValueError('The tournament is already scheduled')
+        player_ids = list(TournamentMembers.objects.filter(tournament=tournament)
+                          .order_by('-user__rating', 'user_id').values_list('user_id', flat=True))
+        if len(player_ids) < 2:
+            raise ValueError('A round robin needs at least two contestants')
+        schedule = berger_rounds(len(player_ids))
+        Round.objects.bulk_create([Round(tournament=tournament, number=number)
+                                   for number in range(1, len(schedule) + 1)])
+        rounds = list(Round.objects.filter(tournament=tournament))
+        Game.objects.bulk_create([
+            Game(round=round, board=board, white_id=player_ids[white], black_id=player_ids[black])
+            for round, pairs in zip(rounds, schedule)
+            for board, (white, black) in enumerate(pairs, start=1)
+        ], batch_size=BATCH_SIZE)
+    return rounds
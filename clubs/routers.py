@@ -0,0 +1,91 @@
+"""Routing the reads of list views to a read replica, while every write goes to the primary.
+
+Views decorated with read_from_replica() read the clubs models from the
+'replica' database, when settings.REPLICA_NAME configures one.  Reads go to the
+primary instead inside a transaction, after the request has written, and for
+REPLICA_STICKY_SECONDS after a browser's last write, remembered in a cookie
+by ReplicaMiddleware, so users always read their own writes even while the
+replica lags behind.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA = 'replica'
+STICKY_COOKIE = 'replica_sticky_until'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+# The writes of the current request, a dict that ReplicaMiddleware sets and the router marks
+_request_writes = ContextVar('request_writes', default=None)
+
+
+def reading_from_replica():
+    """Return whether reads of the clubs models go to the replica right now."""
+    writes = _request_writes.get()
+    return _replica_reads.get() and not (writes and writes['wrote']) and bool(settings.REPLICA_NAME) \
+        and not connections['default'].in_atomic_block
+
+
+def read_from_replica(view):
+    """Send the view's reads to the replica, unless the browser wrote within the last REPLICA_STICKY_SECONDS.
+
+    Put it below login_required, so that the user is loaded from the primary.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            sticky = float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            sticky = False
+        token = _replica_reads.set(not sticky)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Reads the clubs models from the replica where read_from_replica() allows, and everything else from the primary."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'clubs' and reading_from_replica():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        writes = _request_writes.get()
+        if writes is not None and model._meta.app_label == 'clubs':
+            writes['wrote'] = True
+        # Even rows read from the replica are saved to the primary
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The replica is copied from the primary, schema and all, by the replicate command
+        return db != REPLICA
+
+
+class ReplicaMiddleware:
+    """Marks a browser sticky to the primary for REPLICA_STICKY_SECONDS after a request that writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = {'wrote': False}
+        token = _request_writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_writes.reset(token)
+        if writes['wrote']:
+            response.set_cookie(STICKY_COOKIE, f'{time.time() + settings.REPLICA_STICKY_SECONDS:.3f}',
+                                max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,84 @@
+"""Full-text search over clubs and prefix search over users.
+
+On SQLite clubs are indexed in an FTS5 table, clubs_club_fts, kept in sync
+with clubs_club by triggers and ranked by bm25, weighing a match in a club's
+name above one in its location and that above one in its description.  Every
+search term matches as a prefix, so the box can autocomplete a club from its
+first few letters.  On other databases search falls back to unranked
+substring matching.
+
+Users are found by the start of their name or email, matched as a range over
+the lowercased column so the expression indexes on User answer it.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Count, F, FloatField, Func, Lookup, Q, TextField, Value
+from django.db.models.functions import Lower
+
+# bm25 weights of the name, location and description columns
+WEIGHTS = (10.0, 5.0, 1.0)
+
+
+class SearchField(TextField):
+    """The hidden column of an FTS5 table that matches a query against every indexed column."""
+
+
+@SearchField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class BM25(Func):
+    """The bm25 relevance of the current FTS5 match, lower is better."""
+    function = 'bm25'
+    output_field = FloatField()
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text)
+
+
+def fts_query(terms):
+    """Return the FTS5 query matching every term as a prefix."""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_clubs(clubs, text):
+    """Narrow a Club queryset to the clubs matching the search text, annotated with a rank that sorts best first."""
+    terms = search_terms(text)
+    if not terms:
+        return clubs.annotate(rank=Value(0.0, output_field=FloatField())).none()
+    if connections[clubs.db].vendor != 'sqlite':
+        matches = Q()
+        for term in terms:
+            matches &= Q(name__icontains=term) | Q(location__icontains=term) | Q(description__icontains=term)
+        return clubs.filter(matches).annotate(rank=Value(0.0, output_field=FloatField()))
+    return clubs.filter(search__document__match=fts_query(terms)).annotate(
+        rank=BM25(F('search__document'), *[Value(weight) for weight in WEIGHTS])
+    )
+
+
+def search_users(users, text):
+    """Narrow a User queryset to the users whose name or email starts with the text, ignoring case."""
+    prefix = text.strip()
+    if not prefix:
+        return users
+    # The database lowercases the prefix too, as its case folding may differ from Python's.  Every string
+    # starting with the prefix sorts below the prefix followed by the last code point.
+    end = Lower(Value(prefix + '\U0010ffff'))
+    prefix = Lower(Value(prefix))
+    return users.annotate(name_key=Lower('name'), email_key=Lower('email')).filter(
+        Q(name_key__gte=prefix, name_key__lt=end) | Q(email_key__gte=prefix, email_key__lt=end)
+    )
+
+
+def experience_facets(users):
+    """Return how many of the users are at each experience level, as (level, label, count) for every level."""
+    counts = dict(users.order_by().values_list('experience').annotate(count=Count('id')))
+    return [(level, label, counts.get(level, 0)) for level, label in users.model.LEVEL]
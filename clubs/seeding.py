@@ -0,0 +1,79 @@
+"""Fake data for the seed command, generated in chunks that worker processes build in parallel.
+
+Each chunk draws from its own Random and Faker, seeded from the command's
+seed, the kind of row and the index the chunk starts at, so a chunk holds the
+same rows whichever process builds it and however many there are.  Names and
+texts are drawn from small pools that Faker fills for each chunk.  Rows come
+back as tuples of values ready for the database, which the command alone
+writes.
+"""
+import random
+import re
+
+from faker import Faker
+
+from clubs.models import hash_email
+
+# Fake names and texts Faker generates for each chunk, and then reused at random within it
+POOL_SIZE = 100
+# The values of a user row, in order
+USER_FIELDS = ('email', 'email_hash', 'name', 'experience', 'bio', 'password')
+
+_faker = None
+
+
+def chunk_random(seed, kind, start):
+    """Return a Random and a Faker seeded for the chunk of rows of a kind starting at an index."""
+    global _faker
+    if _faker is None:
+        # Building a Faker is slow, so each process reseeds the same one for every chunk
+        _faker = Faker('en_GB')
+    _faker.seed_instance(f'{seed}:{kind}:{start}:faker')
+    return random.Random(f'{seed}:{kind}:{start}'), _faker
+
+
+def pool(fake):
+    return [fake() for _ in range(POOL_SIZE)]
+
+
+def users(seed, start, count, password):
+    """Return the fake users numbered start to start + count, as values of USER_FIELDS, all with the password hash."""
+    rng, faker = chunk_random(seed, 'users', start)
+    first_names, last_names = pool(faker.first_name), pool(faker.last_name)
+    bios = pool(lambda: faker.text(max_nb_chars=520))
+    rows = []
+    for index in range(start, start + count):
+        first_name, last_name = rng.choice(first_names), rng.choice(last_names)
+        # The index keeps every email unique
+        email = re.sub(r'[^a-z.]', '', f'{first_name}.{last_name}'.lower()) + f'{index}@example.org'
+        rows.append((email, hash_email(email), f'{first_name} {last_name}', rng.randint(1, 4), rng.choice(bios),
+                     password))
+    return rows
+
+
+def clubs(seed, start, count, user_ids, member_count, applicant_count):
+    """Return the fake clubs numbered start to start + count, each as (owner id, location, description, members,
+    applications) and owned by a random user.
+
+    See plan_members() for the members and applications.
+    """
+    rng, faker = chunk_random(seed, 'clubs', start)
+    locations, statements = pool(faker.city), pool(lambda: faker.text(max_nb_chars=50))
+    descriptions = pool(lambda: faker.text(max_nb_chars=520))
+    rows = []
+    for _ in range(count):
+        owner_id = rng.choice(user_ids)
+        members, applications = plan_members(rng, owner_id, user_ids, statements, member_count, applicant_count)
+        rows.append((owner_id, rng.choice(locations), rng.choice(descriptions), members, applications))
+    return rows
+
+
+def plan_members(rng, owner_id, user_ids, statements, member_count, applicant_count):
+    """Return the members of a club, as (user id, type) pairs with its owner first, and its applications, as
+    (user id, statement) pairs, drawing distinct users other than the owner.
+    """
+    wanted = member_count + applicant_count
+    others = [user_id for user_id in rng.sample(user_ids, min(wanted + 1, len(user_ids)))
+              if user_id != owner_id][:wanted]
+    members = [(owner_id, 1)] + [(user_id, rng.randint(2, 3)) for user_id in others[:member_count]]
+    return members, [(user_id, rng.choice(statements)) for user_id in others[member_count:]]
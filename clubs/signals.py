@@ -0,0 +1,31 @@
+"""Signal handlers bumping the cache versions of the objects a change affects."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from clubs.cache import bump
+from clubs.models import Club, Membership, User
+
+# User fields saved on their own that no cached rendering shows
+UNRENDERED_USER_FIELDS = {'last_login', 'password'}
+
+
+@receiver([post_save, post_delete], sender=Club)
+def club_changed(sender, instance, **kwargs):
+    bump('club', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Membership)
+def membership_changed(sender, instance, **kwargs):
+    bump('membership', instance.pk)
+    # A club's profile names its owner
+    bump('club', instance.club_id)
+    bump('user', instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= UNRENDERED_USER_FIELDS:
+        return
+    bump('user', instance.pk)
+    for club_id in Membership.objects.filter(user_id=instance.pk, type=1).values_list('club_id', flat=True):
+        bump('club', club_id)
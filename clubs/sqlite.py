@@ -0,0 +1,25 @@
+"""Pragmas tuning every new SQLite connection for several workers sharing one database file.
+
+In WAL mode readers read on while a writer commits, so only writers queue,
+and they wait for each other up to the busy timeout instead of failing at
+once with "database is locked".  The pragmas are those of the SQLITE_PROFILE
+chosen in the settings, each overridable by an environment variable.
+"""
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            # Pragma values cannot be query parameters, so only plain words and numbers are let through
+            if not re.fullmatch(r'-?\w+', str(value)):
+                raise ImproperlyConfigured(f'Invalid value for the SQLite pragma {name}: {value!r}')
+            cursor.execute(f'PRAGMA {name} = {value}')
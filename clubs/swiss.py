@@ -0,0 +1,185 @@
+"""Swiss-system pairing for tournaments.
+
+Players are paired within score groups, top half against bottom half, never
+meeting the same opponent twice, with colours chosen to keep each player's
+whites and blacks balanced.  Pairing is a depth-first search over candidate
+opponents in order of preference, so the first complete pairing found is the
+preferred one and in practice it is found without backtracking.  The search
+is bounded and, should it run out, repeat pairings are allowed rather than
+searching exhaustively.
+"""
+import datetime
+
+from django.db import transaction
+
+from clubs.models import Game, Round, Tournament, TournamentMembers
+
+# Candidate pairings tried before giving up on avoiding repeat pairings
+SEARCH_LIMIT = 20000
+
+
+class Standing:
+    """A player's state going into a round."""
+
+    def __init__(self, player_id, rating=0):
+        self.player_id = player_id
+        self.rating = rating
+        self.score = 0
+        self.opponents = set()
+        self.colours = []
+        self.had_bye = False
+
+    @property
+    def colour_difference(self):
+        return self.colours.count('white') - self.colours.count('black')
+
+    def record(self, opponent_id, colour, points):
+        self.score += points
+        self.opponents.add(opponent_id)
+        self.colours.append(colour)
+
+    def record_bye(self):
+        self.score += 1
+        self.had_bye = True
+
+    def due_colour(self):
+        """Return the colour this player should get next, or None without a preference."""
+        if self.colour_difference < 0 or (self.colour_difference == 0 and self.colours[-1:] == ['black']):
+            return 'white'
+        if self.colour_difference > 0 or self.colours[-1:] == ['white']:
+            return 'black'
+        return None
+
+    def forbidden_colour(self):
+        """Return the colour that would give this player three in a row or an imbalance of three."""
+        if self.colour_difference >= 2 or self.colours[-2:] == ['white', 'white']:
+            return 'white'
+        if self.colour_difference <= -2 or self.colours[-2:] == ['black', 'black']:
+            return 'black'
+        return None
+
+
+def standings_from_games(players, games):
+    """Build the standings of players, given as (id, rating) pairs, from (white, black, result) game tuples."""
+    standings = {player_id: Standing(player_id, rating) for player_id, rating in players}
+    for white_id, black_id, result in games:
+        if black_id is None:
+            standings[white_id].record_bye()
+        else:
+            white_points, black_points = Game.POINTS.get(result, (0, 0))
+            standings[white_id].record(black_id, 'white', white_points)
+            standings[black_id].record(white_id, 'black', black_points)
+    return list(standings.values())
+
+
+def pair(standings):
+    """Pair the players for the next round.
+
+    Returns a list of (white, black) Standing pairs ordered by board, where the
+    last pair has black None if the player count is odd and that player gets a bye.
+    """
+    ranked = sorted(standings, key=lambda s: (-s.score, -s.rating, s.player_id))
+    bye = None
+    if len(ranked) % 2:
+        # The lowest ranked player who has not had a bye yet sits out
+        bye = next((s for s in reversed(ranked) if not s.had_bye), ranked[-1])
+        ranked.remove(bye)
+    # Relax the colour limits, and then repeat pairings, only when no pairing respects them
+    pairs = _search(ranked, strict_colours=True, allow_repeats=False) \
+        or _search(ranked, strict_colours=False, allow_repeats=False) \
+        or _search(ranked, strict_colours=False, allow_repeats=True)
+    boards = [_allocate_colours(first, second, board) for board, (first, second) in enumerate(pairs)]
+    if bye is not None:
+        boards.append((bye, None))
+    return boards
+
+
+def _search(ranked, strict_colours, allow_repeats):
+    budget = [SEARCH_LIMIT]
+
+    def search(remaining):
+        if not remaining:
+            return []
+        first, rest = remaining[0], remaining[1:]
+        for index in _candidates(first, rest, strict_colours, allow_repeats):
+            budget[0] -= 1
+            if budget[0] < 0:
+                return None
+            paired = search(rest[:index] + rest[index + 1:])
+            if paired is not None:
+                return [(first, rest[index])] + paired
+        return None
+
+    return search(ranked)
+
+
+def _candidates(player, rest, strict_colours, allow_repeats):
+    """Return the indices of possible opponents in rest, most preferred first.
+
+    The preferred opponent is new to the player, has the same score and sits
+    half a score group below the player, as in the Dutch system, and can take
+    the other colour.
+    """
+    group_size = 1 + sum(1 for other in rest if other.score == player.score)
+    ideal = group_size // 2 - 1
+    due = player.due_colour()
+    forbidden = player.forbidden_colour()
+    candidates = []
+    for index, other in enumerate(rest):
+        repeat = other.player_id in player.opponents
+        if repeat and not allow_repeats or strict_colours and forbidden is not None \
+                and other.forbidden_colour() == forbidden:
+            continue
+        colour_clash = due is not None and other.due_colour() == due
+        candidates.append((repeat, abs(player.score - other.score), colour_clash, abs(index - ideal), index))
+    candidates.sort()
+    return [index for *_, index in candidates]
+
+
+def _allocate_colours(first, second, board):
+    """Return the pair as (white, black).
+
+    Colours that would break a player's colour limits are ruled out first.
+    Otherwise the player with fewer whites, or who had black last, gets white.
+    Ties, such as every pair in the first round, alternate from board to board.
+    """
+    if first.forbidden_colour() == 'white' or second.forbidden_colour() == 'black':
+        return second, first
+    if first.forbidden_colour() == 'black' or second.forbidden_colour() == 'white':
+        return first, second
+    first_key = (first.colour_difference, first.colours[-1:] == ['white'])
+    second_key = (second.colour_difference, second.colours[-1:] == ['white'])
+    if first_key != second_key:
+        return (first, second) if first_key < second_key else (second, first)
+    return (first, second) if board % 2 == 0 else (second, first)
+
+
+def pair_next_round(tournament):
+    """Pair and store the next round of a Swiss tournament whose sign-up has closed, returning the new Round.
+
+    Raises ValueError if the tournament is not Swiss, sign-up is still open, it
+    has fewer than two contestants or a game of the previous round has no
+    result yet.
+    """
+    if tournament.format != Tournament.SWISS:
+        raise ValueError('The tournament is not a Swiss tournament')
+    if tournament.deadline > datetime.datetime.now():
+        raise ValueError('Sign-up is still open')
+    with transaction.atomic():
+        # Lock the tournament so a second pairing waits and then finds this round unfinished
+        Tournament.objects.select_for_update().filter(pk=tournament.pk).exists()
+        games = list(Game.objects.filter(round__tournament=tournament).values_list('white_id', 'black_id', 'result'))
+        if any(black_id is not None and not result for _, black_id, result in games):
+            raise ValueError('The previous round has unfinished games')
+        players = list(TournamentMembers.objects.filter(tournament=tournament).values_list('user_id', 'user__rating'))
+        if len(players) < 2:
+            raise ValueError('Pairing needs at least two contestants')
+        boards = pair(standings_from_games(players, games))
+        number = Round.objects.filter(tournament=tournament).count() + 1
+        new_round = Round.objects.create(tournament=tournament, number=number)
+        Game.objects.bulk_create([
+            Game(round=new_round, board=board, white_id=white.player_id,
+                 black_id=black.player_id if black else None, result='' if black else Game.WHITE_WIN)
+            for board, (white, black) in enumerate(boards, start=1)
+        ])
+    return new_round
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from clubs.models import Club, User, Tournament, Round, Game
+from clubs.ratings import INITIAL_RATING
+
+
+class RecomputeRatingsCommandTestCase(TestCase):
+    """Tests of the recompute_ratings management command"""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(email=f'user{i}@test.org', password='Password123', name=f'Name{i}',
+                                               experience=1) for i in range(4)]
+        club = Club.objects.create(name='alpha_bravo', location='charlie delta', description='echo foxtrot')
+        tournament = Tournament.objects.create(name='test', organiser=self.users[0], description='test',
+                                               deadline=datetime.now() + timedelta(days=7), capacity=8, club=club)
+        first, second = (Round.objects.create(tournament=tournament, number=number) for number in (1, 2))
+        results = [(first, 0, 1, Game.WHITE_WIN), (first, 2, 3, Game.DRAW),
+                   (second, 1, 2, Game.BLACK_WIN), (second, 3, 0, Game.WHITE_WIN)]
+        for board, (round, white, black, result) in enumerate(results, start=1):
+            Game.objects.create(round=round, board=board, white=self.users[white],
+                                black=self.users[black]).record_result(result)
+        Game.objects.create(round=second, board=5, white=self.users[0], black=None, result=Game.WHITE_WIN)
+        Game.objects.create(round=second, board=6, white=self.users[1], black=self.users[3])
+
+    def test_recompute_matches_incremental_ratings(self):
+        expected = dict(User.objects.values_list('id', 'rating'))
+        User.objects.update(rating=INITIAL_RATING, rated_games=0)
+        out = StringIO()
+        call_command('recompute_ratings', batch_size=3, stdout=out)
+        for user_id, rating in User.objects.values_list('id', 'rating'):
+            self.assertAlmostEqual(rating, expected[user_id])
+        self.assertEqual(sorted(User.objects.values_list('rated_games', flat=True)), [2, 2, 2, 2])
+        self.assertIn('Replayed 4 games', out.getvalue())
+        self.assertIn('Updated 4 of 4 users', out.getvalue())
+
+    def test_recompute_leaves_correct_ratings_alone(self):
+        out = StringIO()
+        call_command('recompute_ratings', stdout=out)
+        self.assertIn('Updated 0 of 4 users', out.getvalue())
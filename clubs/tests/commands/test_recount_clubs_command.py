@@ -0,0 +1,46 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from clubs.models import Club, User, Membership, Application
+
+
+class RecountClubsCommandTestCase(TestCase):
+    """Tests of the recount_clubs management command"""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+    ]
+
+    def setUp(self):
+        self.club = Club.objects.get(name='alpha_bravo')
+        Membership.objects.create(user=User.objects.get(email='johndoe@example.org'), club=self.club, type=1)
+        Membership.objects.create(user=User.objects.get(email='janedoe@example.org'), club=self.club, type=3)
+        Application.objects.create(user=User.objects.get(email='petrapickles@example.org'), club=self.club,
+                                   statement='Hello', status='pending')
+        Application.objects.create(user=User.objects.get(email='peterpickles@example.org'), club=self.club,
+                                   statement='Hello', status='rejected')
+        self.empty_club = Club.objects.create(name='empty', location='nowhere', description='nobody')
+
+    def test_recount_fixes_drifted_counters(self):
+        out = StringIO()
+        call_command('recount_clubs', batch_size=1, stdout=out)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.member_count, 2)
+        self.assertEqual(self.club.pending_application_count, 1)
+        self.assertIn('Checked 2 clubs. Fixed 1', out.getvalue())
+
+    def test_recount_leaves_correct_counters_alone(self):
+        call_command('recount_clubs', stdout=StringIO())
+        out = StringIO()
+        call_command('recount_clubs', stdout=out)
+        self.assertIn('Fixed 0', out.getvalue())
+
+    def test_dry_run_does_not_fix_counters(self):
+        out = StringIO()
+        call_command('recount_clubs', dry_run=True, stdout=out)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.member_count, 0)
+        self.assertIn('Found 1', out.getvalue())
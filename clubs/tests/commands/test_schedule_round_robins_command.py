@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from clubs.models import Club, User, Tournament, TournamentMembers, Game
+
+
+class ScheduleRoundRobinsCommandTestCase(TestCase):
+    """Tests of the schedule_round_robins management command"""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+    ]
+
+    def setUp(self):
+        organiser = User.objects.get(email='johndoe@example.org')
+        club = Club.objects.get(name='alpha_bravo')
+        self.closed = self._create_tournament('closed', organiser, club, timedelta(minutes=-1))
+        self.open = self._create_tournament('open', organiser, club, timedelta(days=1))
+        for user in User.objects.all():
+            for tournament in (self.closed, self.open):
+                TournamentMembers.objects.create(user=user, tournament=tournament)
+
+    def test_schedules_closed_round_robins_once(self):
+        out = StringIO()
+        call_command('schedule_round_robins', stdout=out)
+        self.assertIn('Scheduled 1 tournaments.', out.getvalue())
+        self.assertEqual(Game.objects.filter(round__tournament=self.closed).count(), 6)
+        self.assertFalse(Game.objects.filter(round__tournament=self.open).exists())
+        out = StringIO()
+        call_command('schedule_round_robins', stdout=out)
+        self.assertIn('Scheduled 0 tournaments.', out.getvalue())
+
+    def _create_tournament(self, name, organiser, club, time_to_deadline):
+        return Tournament.objects.create(name=name, organiser=organiser, description='test', capacity=8, club=club,
+                                         deadline=datetime.now() + time_to_deadline,
+                                         format=Tournament.ROUND_ROBIN)
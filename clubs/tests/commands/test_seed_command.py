@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from clubs.management.commands.seed import Command
+from clubs.models import Application, Club, Membership, Tournament, TournamentMembers, User
+
+
+class SeedCommandTestCase(TestCase):
+    """Tests of the seed management command"""
+
+    def seed(self, seed=7, workers=1):
+        out = StringIO()
+        command = Command()
+        # Small chunks and batches, so that several are generated and inserted of each kind
+        command.USER_CHUNK, command.CLUB_CHUNK = 16, 2
+        call_command(command, users=40, clubs=3, tournaments=2, seed=seed, workers=workers, batch_size=7, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self):
+        """Return the seeded data without the ids and times that differ between runs."""
+        return (
+            list(User.objects.order_by('id').values_list('email', 'name', 'experience', 'bio', 'email_hash')),
+            list(Club.objects.order_by('id').values_list('name', 'location', 'description', 'member_count',
+                                                         'pending_application_count')),
+            list(Membership.objects.order_by('id').values_list('user__email', 'club__name', 'type')),
+            list(Application.objects.order_by('id').values_list('user__email', 'club__name', 'statement')),
+            list(Tournament.objects.order_by('id').values_list('name', 'organiser__email', 'club__name', 'capacity',
+                                                               'format', 'contestant_count')),
+            list(TournamentMembers.objects.order_by('id').values_list('user__email', 'tournament__name')),
+        )
+
+    def test_seeds_the_requested_counts(self):
+        out = self.seed()
+        self.assertIn('Seeded 44 users in', out)
+        self.assertIn('Seeded 8 clubs in', out)
+        self.assertEqual(User.objects.count(), 44)
+        self.assertEqual(Club.objects.count(), 8)
+        self.assertEqual(Tournament.objects.count(), 2)
+        self.assertTrue(User.objects.get(email='jeb@example.org').check_password('Password123'))
+        self.assertTrue(User.objects.get(email='getgoogle@hotmail.com').email_hash)
+
+    def test_seeded_names_fit_their_fields(self):
+        self.seed()
+        for club in Club.objects.all():
+            club.full_clean()
+
+    def test_seeded_counters_match_the_rows(self):
+        self.seed()
+        out = StringIO()
+        call_command('recount_clubs', dry_run=True, stdout=out)
+        self.assertIn('Found 0 with drifted counters.', out.getvalue())
+        for tournament in Tournament.objects.all():
+            self.assertEqual(tournament.contestant_count, tournament.num_of_contestants())
+            self.assertLessEqual(tournament.contestant_count, tournament.capacity)
+
+    def test_same_seed_seeds_the_same_data(self):
+        self.seed()
+        first = self.snapshot()
+        call_command('unseed', stdout=StringIO())
+        self.seed()
+        self.assertEqual(self.snapshot(), first)
+        call_command('unseed', stdout=StringIO())
+        self.seed(seed=8)
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_worker_processes_seed_the_same_data(self):
+        self.seed()
+        first = self.snapshot()
+        call_command('unseed', stdout=StringIO())
+        self.seed(workers=2)
+        self.assertEqual(self.snapshot(), first)
+
+    def test_seeds_set_clubs_without_fake_users(self):
+        for seed in range(1, 7):
+            call_command('seed', users=0, clubs=0, tournaments=0, seed=seed, workers=1, stdout=StringIO())
+            self.assertEqual(User.objects.count(), 4)
+            self.assertEqual(Club.objects.count(), 5)
+            call_command('unseed', stdout=StringIO())
+
+    def test_refuses_to_seed_a_seeded_database(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
@@ -44,3 +44,10 @@ class ApplicationFormTestCase(TestCase):
         application = Application.objects.get(user=self.user, club=self.club)
         self.assertEqual(application.statement, 'Hello, I would like to join this club')
         self.assertEqual(application.status, 'pending')
+
+    def test_application_form_counts_pending_application(self):
+        form = ApplicationForm(data=self.form_input)
+        form.is_valid()
+        form.save(self.user, self.club)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.pending_application_count, 1)
@@ -42,6 +42,14 @@ class ClubFormTestCase(TestCase):
         membership = Membership.objects.get(user=self.user, club=club)
         self.assertEqual(membership.type, 1)
 
+    def test_club_starts_with_owner_counted(self):
+        form = ClubForm(data=self.form_input)
+        form.is_valid()
+        form.save(self.user)
+        club = Club.objects.get(name='alpha_bravo')
+        self.assertEqual(club.member_count, 1)
+        self.assertEqual(club.pending_application_count, 0)
+
     def test_valid_club_form(self):
         form = ClubForm(self.form_input)
         self.assertTrue(form.is_valid())
@@ -1,6 +1,7 @@
 """Unit tests of the user form."""
 from django import forms
 from django.test import TestCase
+from libgravatar import Gravatar
 from clubs.forms import ProfileForm
 from clubs.models import User
 
@@ -52,3 +53,10 @@ class ProfileFormTestCase(TestCase):
         self.assertEqual(user.experience, 2)
         self.assertEqual(user.email, 'janedoe@example.org')
         self.assertEqual(user.bio, 'My bio')
+
+    def test_form_refreshes_email_hash(self):
+        user = User.objects.get(email='johndoe@example.org')
+        form = ProfileForm(instance=user, data=self.form_input)
+        form.save()
+        user.refresh_from_db()
+        self.assertEqual(user.email_hash, Gravatar('janedoe@example.org').email_hash)
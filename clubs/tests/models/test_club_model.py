@@ -32,6 +32,13 @@ class ClubModelTestCase(TestCase):
         after_count = self.test_club.num_of_applications()
         self.assertEqual(after_count, before_count + 1)
 
+    def test_adjust_counts(self):
+        self.test_club.adjust_counts(members=2, pending_applications=1)
+        self.test_club.adjust_counts(pending_applications=-1)
+        self.test_club.refresh_from_db()
+        self.assertEqual(self.test_club.member_count, 2)
+        self.assertEqual(self.test_club.pending_application_count, 0)
+
     def test_num_of_members(self):
         before_count = self.test_club.num_of_members()
         self.assertEqual(before_count, 2)  # owner and membership_one
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 from clubs.models import Tournament, User, Club, Membership, TournamentMembers
@@ -52,6 +54,39 @@ class TournamentModelTestCase(TestCase):
         after_count = len(self.tournament.contestants())
         self.assertEqual(after_count, before_count + 1)
 
+    def test_claim_seat(self):
+        self.tournament.deadline = datetime.now() + timedelta(days=1)
+        self.tournament.save()
+        self.assertTrue(self.tournament.claim_seat(self.user_one))
+        self.assertFalse(self.tournament.claim_seat(self.user_one))
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.contestant_count, 1)
+        self.assertTrue(self.tournament.is_contestant(self.user_one))
+
+    def test_claim_seat_respects_capacity(self):
+        self.tournament.deadline = datetime.now() + timedelta(days=1)
+        self.tournament.capacity = 2
+        self.tournament.save()
+        self.assertTrue(self.tournament.claim_seat(self.owner))
+        self.assertTrue(self.tournament.claim_seat(self.user_one))
+        self.assertFalse(self.tournament.claim_seat(self.user_two))
+        self.assertEqual(self.tournament.num_of_contestants(), 2)
+
+    def test_claim_seat_rejected_after_deadline(self):
+        self.tournament.deadline = datetime.now() - timedelta(days=1)
+        self.tournament.save()
+        self.assertFalse(self.tournament.claim_seat(self.user_one))
+        self.assertEqual(self.tournament.num_of_contestants(), 0)
+
+    def test_release_seat(self):
+        self.tournament.deadline = datetime.now() + timedelta(days=1)
+        self.tournament.save()
+        self.tournament.claim_seat(self.user_one)
+        self.assertTrue(self.tournament.release_seat(self.user_one))
+        self.assertFalse(self.tournament.release_seat(self.user_one))
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.contestant_count, 0)
+
     def test_tournament_name_must_be_unique(self):
         second_tournament = Tournament.objects.create(
             name='test2',
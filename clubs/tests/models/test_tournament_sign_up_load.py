@@ -0,0 +1,60 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+from clubs.models import Club, User, Tournament, TournamentMembers
+
+
+class TournamentSignUpLoadTestCase(TransactionTestCase):
+    """Load test of concurrent sign-ups to a tournament with limited seats."""
+
+    CONTESTANT_COUNT = 500
+    CAPACITY = 96
+    WORKERS = 32
+    # Attempts per sign-up before a busy database counts as a failure
+    ATTEMPTS = 100
+
+    def setUp(self):
+        password = make_password('Password123')
+        User.objects.bulk_create([
+            User(email=f'user{i}@test.org', name=f'Name{i}', password=password) for i in range(self.CONTESTANT_COUNT)
+        ])
+        self.users = list(User.objects.all())
+        club = Club.objects.create(name='alpha_bravo', location='charlie delta', description='echo foxtrot')
+        self.tournament = Tournament.objects.create(
+            name='test',
+            organiser=self.users[0],
+            description='test',
+            deadline=datetime.now() + timedelta(days=7),
+            capacity=self.CAPACITY,
+            club=club
+        )
+
+    def test_concurrent_sign_ups_fill_exactly_the_capacity(self):
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            outcomes = list(executor.map(self._sign_up, self.users))
+        errors = [str(error) for _, error in outcomes if error is not None]
+        self.assertEqual(errors, [], f'{len(errors)} sign-ups gave up after {self.ATTEMPTS} attempts')
+        self.assertEqual(sum(claimed for claimed, _ in outcomes), self.CAPACITY)
+        self.assertEqual(TournamentMembers.objects.filter(tournament=self.tournament).count(), self.CAPACITY)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.contestant_count, self.CAPACITY)
+
+    def _sign_up(self, user):
+        """Claim a seat from a worker thread, retrying like a user would when the database is busy.
+
+        Returns whether the seat was claimed and, if every attempt failed, the last error.
+        """
+        try:
+            for _ in range(self.ATTEMPTS):
+                try:
+                    return Tournament(id=self.tournament.id).claim_seat(user), None
+                except OperationalError as error:
+                    last_error = error
+                    time.sleep(0.001)
+            return False, last_error
+        finally:
+            connection.close()
@@ -1,6 +1,7 @@
 """Unit tests for the User model."""
 from django.core.exceptions import ValidationError
 from django.test import TestCase
+from libgravatar import Gravatar
 from clubs.models import User, Club, Membership
 
 """16 Tests currently running"""
@@ -118,6 +119,26 @@ class UserModelTestCase(TestCase):
         self.assertEqual(self.other_user_one.get_membership(test_club.id), officer_relationship)
         self.assertEqual(self.other_user_two.get_membership(test_club.id), membership)
 
+    def test_save_stores_email_hash(self):
+        self.user.save()
+        self.assertEqual(self.user.email_hash, Gravatar(self.user.email).email_hash)
+
+    def test_save_with_update_fields_refreshes_email_hash(self):
+        self.user.email = 'johnny@example.org'
+        self.user.save(update_fields=['email'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email_hash, Gravatar('johnny@example.org').email_hash)
+
+    def test_gravatar(self):
+        self.user.save()
+        expected = Gravatar(self.user.email).get_image(size=120, default='mp')
+        self.assertEqual(self.user.gravatar(), expected)
+        self.assertEqual(self.user.mini_gravatar(), Gravatar(self.user.email).get_image(size=60, default='mp'))
+
+    def test_gravatar_without_stored_hash(self):
+        self.user.email_hash = ''
+        self.assertEqual(self.user.gravatar(), Gravatar(self.user.email).get_image(size=120, default='mp'))
+
     """Tests below are for validity"""
 
     def _assert_user_is_valid(self):
@@ -0,0 +1,144 @@
+"""Unit tests for the versioned rendering cache."""
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache as backend, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs import cache
+from clubs.models import Club, Membership, User
+
+
+class RenderingCacheTestCase(TestCase):
+
+    def setUp(self):
+        backend.clear()
+        self.renders = 0
+
+    def _render(self):
+        self.renders += 1
+        return f'rendering {self.renders}'
+
+    def test_rendering_is_cached_until_bumped(self):
+        self.assertEqual(cache.cached_rendering('club', 1, self._render), 'rendering 1')
+        self.assertEqual(cache.cached_rendering('club', 1, self._render), 'rendering 1')
+        cache.bump('club', 1)
+        self.assertEqual(cache.cached_rendering('club', 1, self._render), 'rendering 2')
+        self.assertEqual(cache.cached_rendering('club', 2, self._render), 'rendering 3')
+
+    def test_evicted_version_never_reuses_an_old_version(self):
+        old = cache.version('club', 1)
+        backend.delete('club:1:version')
+        self.assertGreater(cache.version('club', 1), old)
+
+    def test_hits_and_misses_are_counted(self):
+        cache.cached_rendering('club', 1, self._render)
+        cache.cached_rendering('club', 1, self._render)
+        cache.cached_rendering('club', 1, self._render)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1})
+        out = StringIO()
+        call_command('cache_stats', reset=True, stdout=out)
+        self.assertIn('Hits: 2, misses: 1, hit ratio: 66.7%', out.getvalue())
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 0})
+
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+DATABASE = {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'clubs_cache'}
+
+
+@override_settings(DEBUG=False)
+class SharedCachesTestCase(TestCase):
+
+    def test_refuses_a_cache_of_its_own_in_each_process(self):
+        for caches in ({'default': LOCMEM, 'throttle': DATABASE}, {'default': DATABASE, 'throttle': LOCMEM}):
+            with self.settings(CACHES=caches), self.assertRaises(ImproperlyConfigured):
+                cache.check_shared_caches()
+
+    @override_settings(CACHES={'default': DATABASE, 'throttle': DATABASE})
+    def test_accepts_shared_caches(self):
+        cache.check_shared_caches()
+
+    @override_settings(DEBUG=True, CACHES={'default': LOCMEM, 'throttle': LOCMEM})
+    def test_accepts_any_cache_in_debug(self):
+        cache.check_shared_caches()
+
+
+class InvalidationSignalsTestCase(TestCase):
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json',
+    ]
+
+    def setUp(self):
+        backend.clear()
+        self.user = User.objects.get(email='johndoe@example.org')
+        self.club = Club.objects.get(name='alpha_bravo')
+        Membership.objects.create(user=self.user, club=self.club, type=1)
+
+    def test_club_changes_bump_its_version(self):
+        version = cache.version('club', self.club.id)
+        self.club.description = 'Changed'
+        self.club.save()
+        self.assertNotEqual(cache.version('club', self.club.id), version)
+
+    def test_membership_changes_bump_club_and_user(self):
+        club_version = cache.version('club', self.club.id)
+        user_version = cache.version('user', self.user.id)
+        Membership.objects.filter(club=self.club).delete()
+        self.assertNotEqual(cache.version('club', self.club.id), club_version)
+        self.assertNotEqual(cache.version('user', self.user.id), user_version)
+
+    def test_owner_changes_bump_their_clubs(self):
+        version = cache.version('club', self.club.id)
+        self.user.name = 'Renamed'
+        self.user.save()
+        self.assertNotEqual(cache.version('club', self.club.id), version)
+
+    def test_logging_in_keeps_the_cached_profile(self):
+        version = cache.version('user', self.user.id)
+        self.client.login(email=self.user.email, password='Password123')
+        self.assertEqual(cache.version('user', self.user.id), version)
+
+    def test_profiles_are_served_from_the_cache_until_edited(self):
+        self.client.login(email=self.user.email, password='Password123')
+        url = reverse('club_profile', kwargs={'club_id': self.club.id})
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertContains(response, self.club.description)
+        self.club.description = 'Changed'
+        self.club.save()
+        self.assertContains(self.client.get(url), 'Changed')
+
+
+@override_settings(CACHES={'default': DATABASE, 'throttle': DATABASE})
+class SharedInvalidationTestCase(TestCase):
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+    ]
+
+    def setUp(self):
+        backend.clear()
+        self.owner = User.objects.get(email='johndoe@example.org')
+        self.club = Club.objects.get(name='alpha_bravo')
+        Membership.objects.create(user=self.owner, club=self.club, type=1)
+        self.member = Membership.objects.create(user=User.objects.get(email='janedoe@example.org'), club=self.club,
+                                                type=3)
+        self.client.force_login(self.owner)
+        self.url = reverse('club_members', kwargs={'club_id': self.club.id})
+
+    def test_roster_rows_are_rerendered_after_a_change_made_by_another_worker(self):
+        rows = self.client.get(self.url).context['rows']
+        self.assertIn('<td>member</td>', rows[-1])
+        # Another worker, with a connection of its own to the shared cache, promotes the member
+        with mock.patch('clubs.cache.cache', caches.create_connection('default')):
+            self.member.type = 2
+            self.member.save()
+        rows = self.client.get(self.url).context['rows']
+        self.assertIn('<td>officer</td>', rows[-1])
@@ -0,0 +1,79 @@
+"""Tests of the password hashers and of rehashing passwords on login."""
+import unittest
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from clubs.cache import version
+from clubs.hashers import ScryptPasswordHasher
+from clubs.models import User
+
+try:
+    import argon2
+except ImportError:
+    argon2 = None
+
+PROFILE_HASHERS = [settings.PASSWORD_HASHER_PROFILES[profile] for profile in ('scrypt', 'argon2', 'pbkdf2')]
+
+
+class WeakerScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = 2 ** 10
+
+
+@override_settings(PASSWORD_HASHERS=PROFILE_HASHERS)
+class HashersTestCase(TestCase):
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(email='johndoe@example.org')
+
+    def log_in(self, password):
+        return self.client.post(reverse('log_in'), {'email': self.user.email, 'password': password})
+
+    def test_scrypt_hash_verifies_only_its_password(self):
+        encoded = make_password('Password123')
+        self.assertTrue(encoded.startswith('scrypt$16384$'))
+        self.assertTrue(check_password('Password123', encoded))
+        self.assertFalse(check_password('Password124', encoded))
+
+    def test_scrypt_summary_masks_the_salt_and_hash(self):
+        encoded = make_password('Password123', salt='seasalt')
+        summary = ScryptPasswordHasher().safe_summary(encoded)
+        self.assertEqual(summary['work factor'], 16384)
+        self.assertNotIn('seasalt', summary['salt'])
+
+    @unittest.skipIf(argon2 is None, 'argon2-cffi is not installed')
+    def test_argon2_uses_the_tuned_parameters(self):
+        with self.settings(PASSWORD_HASHERS=[settings.PASSWORD_HASHER_PROFILES['argon2']]):
+            encoded = make_password('Password123')
+        self.assertIn('$m=19456,t=2,p=1$', encoded)
+        self.assertTrue(check_password('Password123', encoded))
+
+    def test_log_in_rehashes_an_old_hash_with_the_preferred_hasher(self):
+        self.assertEqual(identify_hasher(self.user.password).algorithm, 'pbkdf2_sha256')
+        user_version = version('user', self.user.pk)
+        response = self.log_in('Password123')
+        self.assertRedirects(response, reverse('feed'))
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).algorithm, 'scrypt')
+        self.assertTrue(self.user.check_password('Password123'))
+        # A new hash changes nothing the cached profiles show
+        self.assertEqual(version('user', self.user.pk), user_version)
+
+    def test_failed_log_in_keeps_the_old_hash(self):
+        password = self.user.password
+        self.log_in('WrongPassword123')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, password)
+
+    def test_log_in_rehashes_when_the_scrypt_parameters_change(self):
+        with self.settings(PASSWORD_HASHERS=['clubs.tests.test_hashers.WeakerScryptPasswordHasher']):
+            self.user.set_password('Password123')
+            self.user.save()
+        self.assertTrue(self.user.password.startswith('scrypt$1024$'))
+        self.log_in('Password123')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$16384$'))
@@ -0,0 +1,102 @@
+"""Unit tests for knockout brackets."""
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase, TestCase
+from clubs.knockout import bracket_rounds, create_bracket, plan, seed_positions
+from clubs.models import BracketSlot, Club, User, Tournament, TournamentMembers
+
+
+class KnockoutPlanTestCase(SimpleTestCase):
+
+    def test_seed_positions_keep_top_seeds_apart(self):
+        self.assertEqual(seed_positions(8), [1, 8, 4, 5, 2, 7, 3, 6])
+
+    def test_full_bracket_has_no_byes(self):
+        slots = plan(list(range(8)))
+        self.assertEqual(len(slots), 8 + 4 + 2 + 1)
+        self.assertTrue(all(player is not None for round_number, _, player, _ in slots if round_number == 1))
+        self.assertTrue(all(player is None for round_number, _, player, _ in slots if round_number > 1))
+
+    def test_byes_go_to_top_seeds(self):
+        slots = plan([f'seed{seed}' for seed in range(1, 6)])
+        second_round = [player for round_number, _, player, _ in slots if round_number == 2]
+        self.assertEqual(second_round, ['seed1', None, 'seed2', 'seed3'])
+        first_round = [player for round_number, _, player, _ in slots if round_number == 1]
+        self.assertEqual(first_round.count(None), 3)
+
+    def test_two_players_meet_in_the_final(self):
+        self.assertEqual(plan([1, 2]), [(1, 0, 1, 1), (1, 1, 2, 2), (2, 0, None, None)])
+
+    def test_ninety_six_players(self):
+        slots = plan(list(range(96)))
+        self.assertEqual(len(slots), 2 * 128 - 1)
+        second_round = [player for round_number, _, player, _ in slots if round_number == 2 and player is not None]
+        self.assertEqual(sorted(second_round), list(range(32)))
+
+
+class BracketTestCase(TestCase):
+
+    def setUp(self):
+        self.users = [User.objects.create_user(email=f'user{i}@test.org', password='Password123', name=f'Name{i}',
+                                               experience=1, rating=2000 - 100 * i) for i in range(3)]
+        club = Club.objects.create(name='alpha_bravo', location='charlie delta', description='echo foxtrot')
+        self.tournament = Tournament.objects.create(name='test', organiser=self.users[0], description='test',
+                                                    deadline=datetime.now() - timedelta(days=1), capacity=8,
+                                                    club=club, format=Tournament.KNOCKOUT)
+        for user in reversed(self.users):
+            TournamentMembers.objects.create(user=user, tournament=self.tournament)
+
+    def test_create_bracket_seeds_by_rating(self):
+        create_bracket(self.tournament)
+        first = BracketSlot.objects.get(tournament=self.tournament, round_number=2, position=0)
+        self.assertEqual((first.player, first.seed), (self.users[0], 1))
+        semi_final = BracketSlot.objects.filter(tournament=self.tournament, round_number=1, position__in=(2, 3))
+        self.assertEqual([slot.player for slot in semi_final], [self.users[1], self.users[2]])
+        self.assertEqual(BracketSlot.objects.filter(tournament=self.tournament).count(), 7)
+
+    def test_create_bracket_only_once(self):
+        create_bracket(self.tournament)
+        with self.assertRaises(ValueError):
+            create_bracket(self.tournament)
+
+    def test_create_bracket_needs_two_contestants(self):
+        TournamentMembers.objects.filter(user__in=self.users[1:]).delete()
+        with self.assertRaises(ValueError):
+            create_bracket(self.tournament)
+
+    def test_create_bracket_waits_for_deadline(self):
+        self.tournament.deadline = datetime.now() + timedelta(days=1)
+        with self.assertRaises(ValueError):
+            create_bracket(self.tournament)
+        self.assertFalse(BracketSlot.objects.filter(tournament=self.tournament).exists())
+
+    def test_create_bracket_only_for_knockouts(self):
+        for format in (Tournament.SWISS, Tournament.ROUND_ROBIN):
+            self.tournament.format = format
+            with self.assertRaises(ValueError):
+                create_bracket(self.tournament)
+        self.assertFalse(BracketSlot.objects.filter(tournament=self.tournament).exists())
+
+    def test_advance_moves_winner_on(self):
+        create_bracket(self.tournament)
+        winner = BracketSlot.objects.get(tournament=self.tournament, round_number=1, position=3)
+        self.assertTrue(winner.advance())
+        final = BracketSlot.objects.get(tournament=self.tournament, round_number=2, position=1)
+        self.assertEqual(final.player, self.users[2])
+        loser = BracketSlot.objects.get(tournament=self.tournament, round_number=1, position=2)
+        self.assertFalse(loser.advance())
+
+    def test_cannot_advance_before_opponent_arrives(self):
+        create_bracket(self.tournament)
+        waiting = BracketSlot.objects.get(tournament=self.tournament, round_number=2, position=0)
+        self.assertFalse(waiting.advance())
+        self.assertFalse(BracketSlot.objects.filter(tournament=self.tournament, round_number=3,
+                                                    player__isnull=False).exists())
+
+    def test_bracket_rounds(self):
+        create_bracket(self.tournament)
+        with self.assertNumQueries(1):
+            rounds = bracket_rounds(self.tournament)
+            names = [[(top.player and top.player.name, bottom and bottom.player and bottom.player.name)
+                      for top, bottom in matches] for matches in rounds]
+        self.assertEqual(names, [[('Name0', None), ('Name1', 'Name2')], [('Name0', None)], [(None, None)]])
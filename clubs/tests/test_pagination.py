@@ -0,0 +1,79 @@
+"""Unit tests for keyset pagination."""
+import json
+from base64 import urlsafe_b64encode
+
+from django.test import RequestFactory, TestCase
+from clubs.models import User
+from clubs.pagination import paginate, decode_cursor
+
+
+class PaginateTestCase(TestCase):
+
+    PER_PAGE = 4
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        for user_id in range(10):
+            User.objects.create_user(
+                email=f'user{user_id}@test.org',
+                password='Password123',
+                name=f'Name{user_id}',
+                experience=user_id % 3 + 1
+            )
+        self.ordered = list(User.objects.order_by('experience', 'id'))
+
+    def test_first_page(self):
+        page = self._page()
+        self.assertEqual(list(page), self.ordered[:4])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+
+    def test_walks_forwards_through_every_page(self):
+        seen = []
+        cursor = None
+        while True:
+            page = self._page(cursor)
+            seen.extend(page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.ordered)
+        self.assertTrue(page.has_previous())
+
+    def test_walks_backwards_from_the_last_page(self):
+        second = self._page(self._page().next_cursor)
+        last = self._page(second.next_cursor)
+        self.assertEqual(list(last), self.ordered[8:])
+        back = self._page(last.previous_cursor)
+        self.assertEqual(list(back), self.ordered[4:8])
+        self.assertTrue(back.has_next())
+        first = self._page(back.previous_cursor)
+        self.assertEqual(list(first), self.ordered[:4])
+        self.assertFalse(first.has_previous())
+
+    def test_descending_ordering(self):
+        ordered = list(User.objects.order_by('-experience', 'id'))
+        first = self._page(ordering=['-experience', 'id'])
+        second = self._page(first.next_cursor, ordering=['-experience', 'id'])
+        self.assertEqual(list(first) + list(second), ordered[:8])
+
+    def test_malformed_cursor_gives_first_page(self):
+        self.assertEqual(list(self._page('not a cursor')), self.ordered[:4])
+        self.assertIsNone(decode_cursor('bm90IGpzb24=', 2))
+
+    def test_tampered_cursor_gives_first_page(self):
+        for values in (['x', 1], [[1], {}], [None, 1], [1, 10 ** 30]):
+            cursor = urlsafe_b64encode(json.dumps({'values': values, 'direction': 'next'}).encode()).decode()
+            page = self._page(cursor)
+            self.assertEqual(list(page), self.ordered[:4])
+            self.assertFalse(page.has_previous())
+
+    def test_query_keeps_other_parameters(self):
+        request = self.factory.get('/users/', {'q': 'name'})
+        page = paginate(request, User.objects.all(), ['experience', 'id'], self.PER_PAGE)
+        self.assertIn('q=name', page.next_query())
+        self.assertIn('cursor=', page.next_query())
+
+    def _page(self, cursor=None, ordering=('experience', 'id')):
+        request = self.factory.get('/users/', {'cursor': cursor} if cursor else {})
+        return paginate(request, User.objects.all(), list(ordering), self.PER_PAGE)
@@ -0,0 +1,102 @@
+"""Tests that the hot lookups are answered from indexes, checked with EXPLAIN QUERY PLAN on SQLite."""
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.models import Application, Club, Membership, Tournament, User
+
+
+class QueryPlansTestCase(TestCase):
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+    ]
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plans are checked on SQLite')
+        self.owner = User.objects.get(email='johndoe@example.org')
+        self.club = Club.objects.get(name='alpha_bravo')
+        Membership.objects.create(user=self.owner, club=self.club, type=1)
+        for user in User.objects.exclude(pk=self.owner.pk):
+            Application.objects.create(user=user, club=self.club, statement='Hello', status='pending')
+        Tournament.objects.create(name='Open', organiser=self.owner, description='test', capacity=8, club=self.club,
+                                  deadline=datetime.datetime.now() + datetime.timedelta(days=1))
+        self.client.login(email=self.owner.email, password='Password123')
+
+    def plans(self, table, run):
+        """Return the query plans of the queries on the table that run() makes, one string each."""
+        with CaptureQueriesContext(connection) as context:
+            run()
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                if f'FROM "{table}"' in query['sql']:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                    plans.append('\n'.join(row[-1] for row in cursor.fetchall()))
+        self.assertTrue(plans, f'No query on {table}')
+        return plans
+
+    def assertUsesIndex(self, plans, table, index):
+        for plan in plans:
+            self.assertIn(f'{table} USING INDEX {index}', plan)
+            self.assertNotRegex(plan, rf'SCAN (TABLE )?{table}\b')
+
+    def assertUsesIndexInOrder(self, plans, table, index):
+        """Assert the plans read the table in the index's order, without sorting it.
+
+        A first page may walk the index from its start, stopping after a page of rows.
+        """
+        for plan in plans:
+            self.assertIn(f'{table} USING INDEX {index}', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def page_plans(self, table, url, page_name):
+        """Return the query plans on the table of the first two pages of a list, and the page reached by going back."""
+        with self.settings(PAGE_SIZE=1):
+            page = self.client.get(url).context[page_name]
+            plans = self.plans(table, lambda: self.client.get(url))
+            plans += self.plans(table, lambda: self.client.get(url, {'cursor': page.next_cursor}))
+            second = self.client.get(url, {'cursor': page.next_cursor}).context[page_name]
+            plans += self.plans(table, lambda: self.client.get(url, {'cursor': second.previous_cursor}))
+        return plans
+
+    def test_user_list_pages_through_users_by_index(self):
+        plans = self.page_plans('clubs_user', reverse('user_list'), 'users')
+        # The logged in user is loaded by primary key, every other query reads the list's index
+        self.assertUsesIndexInOrder([plan for plan in plans if 'INTEGER PRIMARY KEY' not in plan], 'clubs_user',
+                                    'user_experience_id_idx')
+
+    def test_view_applications_pages_through_a_users_applications_by_index(self):
+        for index in range(3):
+            club = Club.objects.create(name=f'club{index}', location='here', description='test')
+            Application.objects.create(user=self.owner, club=club, statement='Hello', status='pending')
+        plans = self.page_plans('clubs_application', reverse('view_applications'), 'applications')
+        self.assertUsesIndexInOrder(plans, 'clubs_application', 'application_user_created_idx')
+
+    def test_view_app_to_club_pages_through_pending_applications_by_index(self):
+        plans = self.page_plans('clubs_application', reverse('view_app_to_club', kwargs={'club_id': self.club.id}),
+                                'applications')
+        self.assertUsesIndexInOrder(plans, 'clubs_application', 'application_club_status_idx')
+
+    def test_view_app_to_club_finds_pending_applications_by_index(self):
+        plans = self.plans('clubs_application', lambda: self.client.get(
+            reverse('view_app_to_club', kwargs={'club_id': self.club.id})
+        ))
+        self.assertUsesIndex(plans, 'clubs_application', 'application_club_status_idx')
+
+    def test_my_clubs_finds_memberships_of_a_type_by_index(self):
+        plans = self.plans('clubs_membership', lambda: self.client.get(reverse('my_club', kwargs={'type': 1})))
+        self.assertUsesIndex(plans, 'clubs_membership', 'membership_user_type_idx')
+
+    def test_get_club_owner_finds_the_owner_by_index(self):
+        plans = self.plans('clubs_membership', self.club.get_club_owner)
+        self.assertUsesIndex(plans, 'clubs_membership', 'membership_club_type_idx')
+
+    def test_tournament_list_finds_tournaments_by_index(self):
+        plans = self.plans('clubs_tournament', lambda: self.client.get(reverse('tournament_list')))
+        self.assertUsesIndex(plans, 'clubs_tournament', 'tournament_club_deadline_idx')
@@ -0,0 +1,89 @@
+"""Unit tests for Elo ratings."""
+import random
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase, TestCase
+from clubs.models import Club, User, Tournament, Round, Game
+from clubs.ratings import INITIAL_RATING, PROVISIONAL_GAMES, expected_score, k_factor, rating_changes, replay
+
+
+class RatingsTestCase(SimpleTestCase):
+
+    def test_expected_score_of_equal_players_is_half(self):
+        self.assertEqual(expected_score(1500, 1500), 0.5)
+
+    def test_expected_scores_sum_to_one(self):
+        self.assertAlmostEqual(expected_score(1800, 1400) + expected_score(1400, 1800), 1)
+
+    def test_k_factor_drops_once_established(self):
+        self.assertGreater(k_factor(PROVISIONAL_GAMES - 1), k_factor(PROVISIONAL_GAMES))
+
+    def test_rating_changes_are_zero_sum_with_equal_k_factors(self):
+        white_change, black_change = rating_changes(1600, 1400, 50, 50, 0)
+        self.assertLess(white_change, 0)
+        self.assertAlmostEqual(white_change + black_change, 0)
+
+    def test_replay_without_games_gives_initial_ratings(self):
+        ratings, games = replay([], [], [], 3)
+        self.assertEqual(ratings.tolist(), [INITIAL_RATING] * 3)
+        self.assertEqual(games.tolist(), [0, 0, 0])
+
+    def test_replay_matches_game_by_game_updates(self):
+        rng = random.Random(0)
+        player_count = 40
+        history = []
+        for _ in range(2000):
+            white, black = rng.sample(range(player_count), 2)
+            history.append((white, black, rng.choice([0, 0.5, 1])))
+        ratings = [INITIAL_RATING] * player_count
+        games = [0] * player_count
+        for white, black, points in history:
+            white_change, black_change = rating_changes(ratings[white], ratings[black], games[white], games[black],
+                                                        points)
+            ratings[white] += white_change
+            ratings[black] += black_change
+            games[white] += 1
+            games[black] += 1
+        replayed, replayed_games = replay(*zip(*history), player_count)
+        self.assertEqual(replayed_games.tolist(), games)
+        for expected, actual in zip(ratings, replayed.tolist()):
+            self.assertAlmostEqual(expected, actual, places=6)
+
+
+class RecordResultTestCase(TestCase):
+
+    def setUp(self):
+        self.white = User.objects.create_user(email='white@test.org', password='Password123', name='White',
+                                              experience=1)
+        self.black = User.objects.create_user(email='black@test.org', password='Password123', name='Black',
+                                              experience=1)
+        club = Club.objects.create(name='alpha_bravo', location='charlie delta', description='echo foxtrot')
+        tournament = Tournament.objects.create(name='test', organiser=self.white, description='test',
+                                               deadline=datetime.now() + timedelta(days=7), capacity=8, club=club)
+        self.round = Round.objects.create(tournament=tournament, number=1)
+        self.game = Game.objects.create(round=self.round, board=1, white=self.white, black=self.black)
+
+    def test_record_result_updates_ratings(self):
+        self.assertTrue(self.game.record_result(Game.WHITE_WIN))
+        self.white.refresh_from_db()
+        self.black.refresh_from_db()
+        self.assertEqual(self.white.rating, INITIAL_RATING + 20)
+        self.assertEqual(self.black.rating, INITIAL_RATING - 20)
+        self.assertEqual(self.white.rated_games, 1)
+        self.assertEqual(self.black.rated_games, 1)
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.result, Game.WHITE_WIN)
+        self.assertIsNotNone(self.game.recorded_at)
+
+    def test_record_result_only_once(self):
+        self.game.record_result(Game.DRAW)
+        self.assertFalse(Game.objects.get(pk=self.game.pk).record_result(Game.WHITE_WIN))
+        self.white.refresh_from_db()
+        self.assertEqual(self.white.rating, INITIAL_RATING)
+        self.assertEqual(self.white.rated_games, 1)
+
+    def test_byes_are_not_rated(self):
+        bye = Game.objects.create(round=self.round, board=2, white=self.white, black=None)
+        self.assertFalse(bye.record_result(Game.WHITE_WIN))
+        self.white.refresh_from_db()
+        self.assertEqual(self.white.rated_games, 0)
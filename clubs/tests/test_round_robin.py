@@ -0,0 +1,78 @@
+"""Unit tests for round-robin scheduling."""
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase, TestCase
+from clubs.models import Club, User, Tournament, TournamentMembers, Round, Game
+from clubs.round_robin import berger_rounds, schedule_round_robin
+
+
+class BergerTablesTestCase(SimpleTestCase):
+
+    def test_matches_fide_table_for_six_players(self):
+        rounds = [[(white + 1, black + 1) for white, black in pairs] for pairs in berger_rounds(6)]
+        self.assertEqual(rounds, [
+            [(1, 6), (2, 5), (3, 4)],
+            [(6, 4), (5, 3), (1, 2)],
+            [(2, 6), (3, 1), (4, 5)],
+            [(6, 5), (1, 4), (2, 3)],
+            [(3, 6), (4, 2), (5, 1)],
+        ])
+
+    def test_everyone_meets_once_with_balanced_colours(self):
+        for player_count in (2, 5, 8, 95, 96):
+            with self.subTest(players=player_count):
+                rounds = berger_rounds(player_count)
+                pairings = [frozenset(pair) for pairs in rounds for pair in pairs]
+                self.assertEqual(len(pairings), player_count * (player_count - 1) // 2)
+                self.assertEqual(len(set(pairings)), len(pairings))
+                whites = [0] * player_count
+                for pairs in rounds:
+                    players = [player for pair in pairs for player in pair]
+                    self.assertEqual(len(players), len(set(players)))
+                    for white, _ in pairs:
+                        whites[white] += 1
+                games = player_count - 1
+                self.assertTrue(all(abs(2 * count - games) <= 1 for count in whites))
+
+    def test_odd_player_count_rests_one_player_per_round(self):
+        rounds = berger_rounds(5)
+        self.assertEqual(len(rounds), 5)
+        self.assertTrue(all(len(pairs) == 2 for pairs in rounds))
+
+
+class ScheduleRoundRobinTestCase(TestCase):
+
+    def setUp(self):
+        self.users = [User.objects.create_user(email=f'user{i}@test.org', password='Password123', name=f'Name{i}',
+                                               experience=1, rating=1000 + 100 * i) for i in range(5)]
+        club = Club.objects.create(name='alpha_bravo', location='charlie delta', description='echo foxtrot')
+        self.tournament = Tournament.objects.create(name='test', organiser=self.users[0], description='test',
+                                                    deadline=datetime.now() - timedelta(minutes=1), capacity=8,
+                                                    club=club, format=Tournament.ROUND_ROBIN)
+        for user in self.users:
+            TournamentMembers.objects.create(user=user, tournament=self.tournament)
+
+    def test_schedule_stores_every_round_and_game(self):
+        rounds = schedule_round_robin(self.tournament)
+        self.assertEqual([round.number for round in rounds], [1, 2, 3, 4, 5])
+        self.assertEqual(Game.objects.filter(round__tournament=self.tournament).count(), 10)
+        first = Game.objects.get(round__tournament=self.tournament, round__number=1, board=1)
+        # The highest rated player takes pairing number one and rests in the first round
+        self.assertNotIn(self.users[4].id, (first.white_id, first.black_id))
+        self.assertEqual(first.white_id, self.users[3].id)
+
+    def test_schedule_only_once(self):
+        schedule_round_robin(self.tournament)
+        with self.assertRaises(ValueError):
+            schedule_round_robin(self.tournament)
+        self.assertEqual(Round.objects.filter(tournament=self.tournament).count(), 5)
+
+    def test_schedule_waits_for_deadline(self):
+        self.tournament.deadline = datetime.now() + timedelta(days=1)
+        with self.assertRaises(ValueError):
+            schedule_round_robin(self.tournament)
+
+    def test_schedule_only_round_robins(self):
+        self.tournament.format = Tournament.SWISS
+        with self.assertRaises(ValueError):
+            schedule_round_robin(self.tournament)
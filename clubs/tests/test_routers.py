@@ -0,0 +1,98 @@
+"""Tests of routing the reads of list views to the read replica."""
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from clubs.cache import cached_renderings
+from clubs.models import Club, User
+from clubs.routers import STICKY_COOKIE, ReplicaMiddleware, ReplicaRouter, read_from_replica
+
+
+@override_settings(REPLICA_NAME='replica.sqlite3', REPLICA_STICKY_SECONDS=10)
+class ReplicaRouterTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def read_in_view(self, model=Club, cookie=None, write_first=False):
+        """Return where the router sends a read of the model from a list view."""
+        reads = []
+
+        @read_from_replica
+        def view(request):
+            if write_first:
+                self.router.db_for_write(Club)
+            reads.append(self.router.db_for_read(model))
+            return HttpResponse()
+
+        request = RequestFactory().get('/club_list/')
+        if cookie is not None:
+            request.COOKIES[STICKY_COOKIE] = cookie
+        ReplicaMiddleware(view)(request)
+        return reads[0]
+
+    def test_list_view_reads_from_the_replica(self):
+        self.assertEqual(self.read_in_view(), 'replica')
+
+    def test_reads_elsewhere_use_the_primary(self):
+        self.assertIsNone(self.router.db_for_read(Club))
+        self.assertIsNone(self.read_in_view(model=Session))
+
+    @override_settings(REPLICA_NAME=None)
+    def test_reads_use_the_primary_without_a_replica(self):
+        self.assertIsNone(self.read_in_view())
+
+    def test_sticky_browser_reads_from_the_primary(self):
+        self.assertIsNone(self.read_in_view(cookie=str(time.time() + 5)))
+        self.assertEqual(self.read_in_view(cookie=str(time.time() - 5)), 'replica')
+        self.assertEqual(self.read_in_view(cookie='soon'), 'replica')
+
+    def test_reads_after_a_write_in_the_request_use_the_primary(self):
+        self.assertIsNone(self.read_in_view(write_first=True))
+
+    def test_writes_and_migrations_use_the_primary(self):
+        self.assertEqual(self.router.db_for_write(Club), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'clubs'))
+        self.assertTrue(self.router.allow_migrate('default', 'clubs'))
+
+    def test_renderings_read_from_the_replica_are_not_cached(self):
+        cache.clear()
+
+        @read_from_replica
+        def view(request):
+            return cached_renderings([('club:1:1', lambda: 'stale')])
+
+        request = RequestFactory().get('/club_members/1/')
+        self.assertEqual(view(request), ['stale'])
+        self.assertEqual(cached_renderings([('club:1:1', lambda: 'fresh')]), ['fresh'])
+        self.assertEqual(cached_renderings([('club:1:1', lambda: 'other')]), ['fresh'])
+
+
+@override_settings(REPLICA_STICKY_SECONDS=10)
+class ReplicaMiddlewareTestCase(TestCase):
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(email='johndoe@example.org')
+
+    def test_writing_makes_the_browser_sticky(self):
+        response = self.client.post(reverse('log_in'), {'email': self.user.email, 'password': 'Password123'})
+        cookie = response.cookies[STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], 10)
+        self.assertAlmostEqual(float(cookie.value), time.time() + 10, delta=5)
+
+    def test_reading_leaves_the_browser_unsticky(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('club_list'))
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_replicate_needs_a_replica(self):
+        with self.assertRaises(CommandError):
+            call_command('replicate')
@@ -0,0 +1,69 @@
+"""Unit tests for club search."""
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from clubs.models import Club, ClubSearch, User
+from clubs.search import fts_query, search_clubs, search_terms, search_users
+
+
+class SearchQueryTestCase(SimpleTestCase):
+
+    def test_search_terms_drop_punctuation(self):
+        self.assertEqual(search_terms('"knights" OR (rooks*'), ['knights', 'OR', 'rooks'])
+
+    def test_every_term_matches_as_prefix(self):
+        self.assertEqual(fts_query(['grand', 'mas']), '"grand"* "mas"*')
+
+
+class SearchClubsTestCase(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name='Knights', location='London', description='Blitz every Monday')
+
+    def _search(self, text):
+        return list(search_clubs(Club.objects.all(), text).order_by('rank', 'id'))
+
+    def test_new_clubs_are_indexed(self):
+        self.assertEqual(self._search('lond'), [self.club])
+        self.assertEqual(self._search('blitz monday'), [self.club])
+
+    def test_edits_are_reindexed(self):
+        self.club.location = 'Paris'
+        self.club.save()
+        self.assertEqual(self._search('london'), [])
+        self.assertEqual(self._search('paris'), [self.club])
+
+    def test_deleted_clubs_leave_the_index(self):
+        self.club.delete()
+        self.assertEqual(self._search('knights'), [])
+        self.assertFalse(ClubSearch.objects.exists())
+
+    def test_bulk_created_clubs_are_indexed(self):
+        Club.objects.bulk_create([Club(name=f'Rooks {i}', location='Leeds', description='Rapid') for i in range(3)])
+        self.assertEqual(len(self._search('rooks')), 3)
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self._search('knights paris'), [])
+
+    def test_empty_search_matches_nothing(self):
+        self.assertEqual(self._search(' * '), [])
+
+
+class SearchUsersTestCase(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(email='ally@test.org', password='Password123', name='Alice')
+        self.bob = User.objects.create_user(email='bob@test.org', password='Password123', name='Bob Allen')
+
+    def test_matches_start_of_name_or_email_ignoring_case(self):
+        self.assertEqual(list(search_users(User.objects.all(), 'AL').order_by('id')), [self.alice])
+        self.assertEqual(list(search_users(User.objects.all(), 'bob@').order_by('id')), [self.bob])
+
+    def test_empty_search_matches_everyone(self):
+        self.assertEqual(search_users(User.objects.all(), '  ').count(), 2)
+
+    def test_search_uses_prefix_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plans are checked on SQLite')
+        plan = search_users(User.objects.all(), 'al').explain()
+        self.assertIn('user_name_prefix_idx', plan)
+        self.assertIn('user_email_prefix_idx', plan)
@@ -0,0 +1,34 @@
+"""Tests that the site works under every configurable session engine."""
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs.models import User
+
+
+class SessionModesTestCase(TestCase):
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(email='johndoe@example.org')
+
+    def test_log_in_browse_and_change_password_in_every_mode(self):
+        for mode, engine in settings.SESSION_ENGINES.items():
+            with self.subTest(mode=mode), override_settings(SESSION_ENGINE=engine):
+                response = self.client.post(reverse('log_in'), {'email': self.user.email, 'password': 'Password123'},
+                                            follow=True)
+                self.assertTemplateUsed(response, 'feed.html')
+                self.client.post(reverse('change_password'), {
+                    'password': 'Password123', 'new_password': 'NewPassword123',
+                    'password_confirmation': 'NewPassword123'
+                })
+                self.user.refresh_from_db()
+                self.assertTrue(self.user.check_password('NewPassword123'))
+                # Changing the password keeps the session logged in
+                response = self.client.get(reverse('feed'))
+                self.assertEqual(response.status_code, 200)
+                self.client.get(reverse('log_out'))
+                response = self.client.get(reverse('feed'))
+                self.assertEqual(response.status_code, 302)
+                self.user.set_password('Password123')
+                self.user.save()
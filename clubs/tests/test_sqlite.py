@@ -0,0 +1,52 @@
+"""Tests of the pragmas run on new SQLite connections."""
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+from django.test import TestCase, override_settings
+
+
+class SQLitePragmasTestCase(TestCase):
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Pragmas are only run on SQLite')
+        # The test database lives in memory, which has no journal to switch, so connect to a file
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'test.sqlite3')
+
+    def connect(self):
+        wrapper = type(connections['default'])({**connection.settings_dict, 'NAME': self.path})
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    @override_settings(SQLITE_PRAGMAS=settings.SQLITE_PROFILES['production'])
+    def test_production_profile_is_applied_to_new_connections(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 5000)
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -65536)
+        self.assertEqual(self.pragma(wrapper, 'temp_store'), 2)
+
+    @override_settings(SQLITE_PRAGMAS=settings.SQLITE_PROFILES['default'])
+    def test_default_profile_switches_back_to_a_rollback_journal(self):
+        with self.settings(SQLITE_PRAGMAS=settings.SQLITE_PROFILES['production']):
+            self.connect().close()
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 2)
+
+    @override_settings(SQLITE_PRAGMAS={'cache_size': '-2000; DROP TABLE clubs_user'})
+    def test_rejects_values_that_are_not_plain(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.connect()
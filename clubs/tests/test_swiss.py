@@ -0,0 +1,107 @@
+"""Unit tests for Swiss pairing."""
+import random
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase, TestCase
+from clubs.models import Club, User, Tournament, TournamentMembers, Round, Game
+from clubs.swiss import pair, pair_next_round, standings_from_games
+
+
+class SwissPairingTestCase(SimpleTestCase):
+
+    def test_first_round_pairs_top_half_against_bottom_half(self):
+        players = [(player_id, 8 - player_id) for player_id in range(8)]
+        boards = pair(standings_from_games(players, []))
+        pairs = [{white.player_id, black.player_id} for white, black in boards]
+        self.assertEqual(pairs, [{0, 4}, {1, 5}, {2, 6}, {3, 7}])
+
+    def test_first_round_alternates_colours(self):
+        players = [(player_id, 8 - player_id) for player_id in range(8)]
+        boards = pair(standings_from_games(players, []))
+        self.assertEqual([white.player_id for white, _ in boards], [0, 5, 2, 7])
+
+    def test_odd_player_count_gives_lowest_ranked_a_bye(self):
+        players = [(player_id, 5 - player_id) for player_id in range(5)]
+        boards = pair(standings_from_games(players, []))
+        self.assertEqual(boards[-1][0].player_id, 4)
+        self.assertIsNone(boards[-1][1])
+
+    def test_no_player_gets_two_byes(self):
+        players = [(player_id, 3 - player_id) for player_id in range(3)]
+        games = [(2, None, Game.WHITE_WIN), (0, 1, Game.WHITE_WIN)]
+        boards = pair(standings_from_games(players, games))
+        self.assertNotEqual(boards[-1][0].player_id, 2)
+
+    def test_pairs_players_within_score_groups(self):
+        players = [(player_id, 0) for player_id in range(4)]
+        games = [(0, 2, Game.WHITE_WIN), (3, 1, Game.BLACK_WIN)]
+        boards = pair(standings_from_games(players, games))
+        self.assertEqual([{white.player_id, black.player_id} for white, black in boards], [{0, 1}, {2, 3}])
+
+    def test_ninety_six_player_event_avoids_repeats_and_balances_colours(self):
+        rng = random.Random(0)
+        players = [(player_id, rng.randint(1, 4)) for player_id in range(96)]
+        games = []
+        for _ in range(9):
+            boards = pair(standings_from_games(players, games))
+            self.assertEqual(len(boards), 48)
+            for white, black in boards:
+                games.append((white.player_id, black.player_id, rng.choice(list(Game.POINTS))))
+        pairings = [frozenset((white_id, black_id)) for white_id, black_id, _ in games]
+        self.assertEqual(len(pairings), len(set(pairings)))
+        for standing in standings_from_games(players, games):
+            self.assertLessEqual(abs(standing.colour_difference), 1)
+            self.assertEqual(len(standing.opponents), 9)
+
+
+class PairNextRoundTestCase(TestCase):
+
+    def setUp(self):
+        users = [User.objects.create_user(email=f'user{i}@test.org', password='Password123', name=f'Name{i}',
+                                          experience=i % 4 + 1) for i in range(5)]
+        club = Club.objects.create(name='alpha_bravo', location='charlie delta', description='echo foxtrot')
+        self.tournament = Tournament.objects.create(name='test', organiser=users[0], description='test',
+                                                    deadline=datetime.now() - timedelta(days=1), capacity=8, club=club)
+        for user in users:
+            TournamentMembers.objects.create(user=user, tournament=self.tournament)
+
+    def test_pair_next_round_stores_round_and_games(self):
+        first_round = pair_next_round(self.tournament)
+        self.assertEqual(first_round.number, 1)
+        games = list(first_round.game_set.all())
+        self.assertEqual(len(games), 3)
+        self.assertEqual([game.board for game in games], [1, 2, 3])
+        bye = games[-1]
+        self.assertIsNone(bye.black)
+        self.assertEqual(bye.result, Game.WHITE_WIN)
+        self.assertFalse(first_round.is_finished())
+
+    def test_pair_next_round_requires_finished_round(self):
+        pair_next_round(self.tournament)
+        with self.assertRaises(ValueError):
+            pair_next_round(self.tournament)
+        self.assertEqual(Round.objects.filter(tournament=self.tournament).count(), 1)
+
+    def test_pair_next_round_requires_closed_swiss_tournament_with_contestants(self):
+        self.tournament.deadline = datetime.now() + timedelta(days=1)
+        with self.assertRaisesMessage(ValueError, 'Sign-up is still open'):
+            pair_next_round(self.tournament)
+        self.tournament.deadline = datetime.now() - timedelta(days=1)
+        self.tournament.format = Tournament.KNOCKOUT
+        with self.assertRaisesMessage(ValueError, 'The tournament is not a Swiss tournament'):
+            pair_next_round(self.tournament)
+        self.tournament.format = Tournament.SWISS
+        TournamentMembers.objects.exclude(user=self.tournament.organiser).delete()
+        with self.assertRaisesMessage(ValueError, 'Pairing needs at least two contestants'):
+            pair_next_round(self.tournament)
+        self.assertFalse(Round.objects.filter(tournament=self.tournament).exists())
+
+    def test_pair_next_round_after_results(self):
+        first_round = pair_next_round(self.tournament)
+        first_round.game_set.filter(result='').update(result=Game.DRAW)
+        self.assertTrue(first_round.is_finished())
+        second_round = pair_next_round(self.tournament)
+        self.assertEqual(second_round.number, 2)
+        first = {frozenset((g.white_id, g.black_id)) for g in first_round.game_set.exclude(black=None)}
+        second = {frozenset((g.white_id, g.black_id)) for g in second_round.game_set.exclude(black=None)}
+        self.assertFalse(first & second)
@@ -0,0 +1,109 @@
+"""Tests of the token-bucket throttling of failed logins."""
+import time
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from clubs.models import User
+from clubs.tests.helpers import LogInTester
+from clubs.throttle import LoginThrottle, client_ip
+
+
+class CountingPasswordHasher(PBKDF2PasswordHasher):
+    verified = 0
+
+    def verify(self, password, encoded):
+        CountingPasswordHasher.verified += 1
+        return super().verify(password, encoded)
+
+
+@override_settings(LOGIN_THROTTLE_RATES={'ip': (4, 2), 'email': (2, 60)}, NUM_PROXIES=0)
+class LoginThrottleTestCase(TestCase):
+
+    def setUp(self):
+        caches['throttle'].clear()
+        self.request = RequestFactory().post('/log_in/', REMOTE_ADDR='10.0.0.1')
+
+    def tearDown(self):
+        caches['throttle'].clear()
+
+    def fail(self, email='johndoe@example.org', request=None):
+        LoginThrottle(request or self.request, email).failed()
+
+    def test_first_attempt_is_allowed_without_writing_to_the_cache(self):
+        throttle = LoginThrottle(self.request, 'johndoe@example.org')
+        self.assertEqual(throttle.wait(), 0)
+        self.assertEqual(caches['throttle'].get_many(throttle.keys.values()), {})
+
+    def test_failures_empty_the_email_bucket(self):
+        self.fail()
+        self.assertEqual(LoginThrottle(self.request, 'johndoe@example.org').wait(), 0)
+        self.fail()
+        wait = LoginThrottle(self.request, 'johndoe@example.org').wait()
+        self.assertTrue(59 <= wait <= 60)
+        # The email is throttled whatever its case and wherever the attempt comes from
+        other_request = RequestFactory().post('/log_in/', REMOTE_ADDR='10.0.0.2')
+        self.assertGreater(LoginThrottle(other_request, 'JohnDoe@example.org').wait(), 0)
+        self.assertEqual(LoginThrottle(self.request, 'janedoe@example.org').wait(), 0)
+
+    def test_failures_for_many_emails_empty_the_ip_bucket(self):
+        for index in range(4):
+            self.fail(f'user{index}@example.org')
+        self.assertGreater(LoginThrottle(self.request, 'janedoe@example.org').wait(), 0)
+        other_request = RequestFactory().post('/log_in/', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(LoginThrottle(other_request, 'janedoe@example.org').wait(), 0)
+
+    def test_bucket_refills_over_time(self):
+        self.fail()
+        self.fail()
+        throttle = LoginThrottle(self.request, 'johndoe@example.org')
+        caches['throttle'].set(throttle.keys['email'], (0, time.time() - 60))
+        self.assertEqual(LoginThrottle(self.request, 'johndoe@example.org').wait(), 0)
+
+    @override_settings(NUM_PROXIES=1)
+    def test_client_ip_is_read_from_the_last_proxy(self):
+        request = RequestFactory().post('/log_in/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='1.2.3.4, 5.6.7.8')
+        self.assertEqual(client_ip(request), '5.6.7.8')
+
+    def test_client_ip_ignores_forwarded_addresses_without_proxies(self):
+        request = RequestFactory().post('/log_in/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='1.2.3.4')
+        self.assertEqual(client_ip(request), '10.0.0.1')
+
+
+@override_settings(LOGIN_THROTTLE_RATES={'ip': (30, 2), 'email': (2, 60)},
+                   PASSWORD_HASHERS=['clubs.tests.test_throttle.CountingPasswordHasher'])
+class LogInThrottleViewTestCase(TestCase, LogInTester):
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        caches['throttle'].clear()
+        self.url = reverse('log_in')
+        self.user = User.objects.get(email='johndoe@example.org')
+
+    def tearDown(self):
+        caches['throttle'].clear()
+
+    def log_in(self, password):
+        return self.client.post(self.url, {'email': self.user.email, 'password': password})
+
+    def test_throttled_log_in_is_rejected_before_hashing(self):
+        self.log_in('WrongPassword123')
+        self.log_in('WrongPassword123')
+        verified = CountingPasswordHasher.verified
+        response = self.log_in('Password123')
+        self.assertEqual(response.status_code, 429)
+        self.assertTemplateUsed(response, 'log_in.html')
+        self.assertEqual(CountingPasswordHasher.verified, verified)
+        self.assertFalse(self._is_logged_in())
+        messages_list = list(response.context['messages'])
+        self.assertEqual(len(messages_list), 1)
+        self.assertIn('too many failed attempts', messages_list[0].message)
+
+    def test_successful_log_ins_are_not_throttled(self):
+        for _ in range(3):
+            response = self.log_in('Password123')
+            self.assertRedirects(response, reverse('feed'))
+            self.client.logout()
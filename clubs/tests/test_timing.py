@@ -0,0 +1,58 @@
+"""Tests of the per-request timings reported by TimingMiddleware."""
+import re
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from clubs.models import User
+
+SERVER_TIMING = re.compile(
+    r'sql;dur=(?P<sql>[\d.]+);desc="(?P<queries>\d+) queries", template;dur=(?P<template>[\d.]+), '
+    r'total;dur=(?P<total>[\d.]+)'
+)
+
+
+@override_settings(TIMING_SAMPLE_RATE=1)
+class TimingMiddlewareTestCase(TestCase):
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(email='johndoe@example.org')
+        self.client.force_login(self.user)
+
+    def get(self, url):
+        with self.assertLogs('clubs.timing', 'INFO') as logs:
+            response = self.client.get(url)
+        return response, logs.records
+
+    def test_server_timing_header_reports_queries_templates_and_total(self):
+        response, _ = self.get(reverse('club_list'))
+        timing = SERVER_TIMING.fullmatch(response['Server-Timing'])
+        self.assertIsNotNone(timing)
+        self.assertGreater(int(timing['queries']), 0)
+        self.assertGreater(float(timing['template']), 0)
+        self.assertGreaterEqual(float(timing['total']), float(timing['template']))
+
+    def test_counts_every_query(self):
+        with self.assertNumQueries(3):
+            # The session, the user and the user's profile
+            response, _ = self.get(reverse('show_user', kwargs={'user_id': self.user.id}))
+        self.assertEqual(SERVER_TIMING.fullmatch(response['Server-Timing'])['queries'], '3')
+
+    def test_logs_a_line_tagged_with_the_url_name(self):
+        response, records = self.get(reverse('club_list'))
+        self.assertEqual(len(records), 1)
+        line = records[0].getMessage()
+        self.assertTrue(line.startswith('url_name=club_list method=GET status=200 total_ms='))
+        self.assertIn(f'queries={SERVER_TIMING.fullmatch(response["Server-Timing"])["queries"]} ', line)
+
+    def test_unresolved_urls_are_logged_without_a_name(self):
+        _, records = self.get('/no_such_page/')
+        self.assertTrue(records[0].getMessage().startswith('url_name=- method=GET status=404'))
+
+    @override_settings(TIMING_SAMPLE_RATE=0)
+    def test_requests_that_are_not_sampled_are_left_alone(self):
+        with self.assertNoLogs('clubs.timing', 'INFO'):
+            response = self.client.get(reverse('club_list'))
+        self.assertNotIn('Server-Timing', response)
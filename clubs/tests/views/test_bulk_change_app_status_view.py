@@ -0,0 +1,84 @@
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import Club, User, Application, Membership
+from clubs.tests.helpers import reverse_with_next
+
+
+class BulkChangeAppStatusViewTestCase(TestCase):
+    """Tests of the bulk change application status view"""
+    VIEW = 'bulk_change_app_status'
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+    ]
+
+    def setUp(self):
+        self.owner = User.objects.get(email='johndoe@example.org')
+        self.member = User.objects.get(email='janedoe@example.org')
+        self.club = Club.objects.get(name='alpha_bravo')
+        Membership.objects.create(user=self.owner, club=self.club, type=1)
+        Membership.objects.create(user=self.member, club=self.club, type=3)
+        self.club.adjust_counts(members=2, pending_applications=2)
+        self.applications = [
+            Application.objects.create(user=User.objects.get(email=email), club=self.club, statement='Hello',
+                                       status='pending')
+            for email in ('petrapickles@example.org', 'peterpickles@example.org')
+        ]
+        self.url = reverse(self.VIEW, kwargs={'club_id': self.club.id})
+        self.form_input = {'application_ids': [i.id for i in self.applications], 'accept': '1'}
+
+    def test_bulk_change_app_status_url(self):
+        self.assertEqual(self.url, f'/{self.VIEW}/{self.club.id}/')
+
+    def test_bulk_change_app_status_redirects_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.post(self.url, self.form_input)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_bulk_accept(self):
+        self.client.login(email=self.owner.email, password='Password123')
+        response = self.client.post(self.url, self.form_input, follow=True)
+        self.assertRedirects(response, reverse('view_app_to_club', kwargs={'club_id': self.club.id}),
+                             status_code=302, target_status_code=200)
+        self.assertEqual(Application.objects.filter(club=self.club, status='accepted').count(), 2)
+        self.assertEqual(Membership.objects.filter(club=self.club, type=3).count(), 3)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.member_count, 4)
+        self.assertEqual(self.club.pending_application_count, 0)
+
+    def test_bulk_reject(self):
+        self.client.login(email=self.owner.email, password='Password123')
+        self.form_input['accept'] = '0'
+        self.client.post(self.url, self.form_input)
+        self.assertEqual(Application.objects.filter(club=self.club, status='rejected').count(), 2)
+        self.assertEqual(Membership.objects.filter(club=self.club).count(), 2)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.pending_application_count, 0)
+
+    def test_bulk_accept_twice_does_not_duplicate_memberships(self):
+        self.client.login(email=self.owner.email, password='Password123')
+        self.client.post(self.url, self.form_input)
+        self.client.post(self.url, self.form_input)
+        self.assertEqual(Membership.objects.filter(club=self.club).count(), 4)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.member_count, 4)
+
+    def test_bulk_accept_ignores_applications_to_other_clubs(self):
+        other_club = Club.objects.create(name='other', location='elsewhere', description='other club')
+        other = Application.objects.create(user=self.member, club=other_club, statement='Hello', status='pending')
+        self.client.login(email=self.owner.email, password='Password123')
+        self.client.post(self.url, {'application_ids': [other.id], 'accept': '1'})
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'pending')
+
+    def test_members_cannot_review_applications(self):
+        self.client.login(email=self.member.email, password='Password123')
+        self.client.post(self.url, self.form_input)
+        self.assertEqual(Application.objects.filter(club=self.club, status='pending').count(), 2)
+
+    def test_get_does_not_change_applications(self):
+        self.client.login(email=self.owner.email, password='Password123')
+        self.client.get(self.url, self.form_input)
+        self.assertEqual(Application.objects.filter(club=self.club, status='pending').count(), 2)
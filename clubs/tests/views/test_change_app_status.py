@@ -24,6 +24,7 @@ class ChangeAppStatusViewTestCase(TestCase):
             club=self.club,
             type=1
         )
+        self.club.adjust_counts(members=1, pending_applications=2)
         self.application_one = Application.objects.create(
             user=self.user_one,
             club=self.club,
@@ -68,3 +69,26 @@ class ChangeAppStatusViewTestCase(TestCase):
         self.assertEqual(member_after_count, member_before_count)
         self.application_two.refresh_from_db()
         self.assertEqual(self.application_two.status, 'rejected')
+
+    def test_change_app_status_updates_club_counters(self):
+        self.client.login(email='johndoe@example.org', password='Password123')
+        self.client.get(self.accept_one_url)
+        self.client.get(self.reject_two_url)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.member_count, 2)
+        self.assertEqual(self.club.pending_application_count, 0)
+
+    def test_change_app_status_only_counts_pending_applications_once(self):
+        self.client.login(email='johndoe@example.org', password='Password123')
+        self.client.get(self.reject_two_url)
+        self.client.get(self.reject_two_url)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.pending_application_count, 1)
+
+    def test_change_app_status_accepts_application_only_once(self):
+        self.client.login(email='johndoe@example.org', password='Password123')
+        self.client.get(self.accept_one_url)
+        self.client.get(self.accept_one_url)
+        self.assertEqual(Membership.objects.filter(user=self.user_one, club=self.club).count(), 1)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.member_count, 2)
@@ -1,7 +1,7 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
-from clubs.models import Club, User, Membership
+from clubs.models import Club, User, Membership, Application
 from clubs.tests.helpers import reverse_with_next
 
 
@@ -41,6 +41,70 @@ class ClubListViewTest(TestCase):
         #     self.assertContains(response, f'Location{club_id}')
         #     self.assertContains(response, f'Description{club_id}')
 
+    def test_club_list_shows_owner_and_member_count(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_club(1)
+        Club.objects.filter(name='Name0').update(member_count=2)
+        response = self.client.get(self.url)
+        listed = response.context['clubs'][0]
+        self.assertEqual(listed.owner_name, 'name0')
+        self.assertEqual(listed.member_count, 2)
+
+    def test_club_list_excludes_applied_clubs(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_club(3)
+        applied = Club.objects.get(name='Name1')
+        Application.objects.create(user=self.user, club=applied, statement='Hello', status='pending')
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['clubs']), 2)
+        self.assertNotIn(applied, response.context['clubs'])
+
+    def test_club_list_excludes_clubs_without_owner(self):
+        self.client.login(email=self.user.email, password='Password123')
+        Club.objects.create(name='Ownerless', location='Nowhere', description='Nobody')
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['clubs']), 0)
+
+    @override_settings(PAGE_SIZE=10)
+    def test_club_list_is_paginated(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_club(self.CLUB_COUNT)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['clubs']), 10)
+        response = self.client.get(self.url, {'cursor': response.context['clubs'].next_cursor})
+        self.assertEqual(len(response.context['clubs']), self.CLUB_COUNT - 10)
+        self.assertContains(response, 'Name14')
+
+    def test_club_list_search_ranks_name_matches_first(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_club(3)
+        Club.objects.filter(name='Name0').update(description='Knights of the round table')
+        Club.objects.filter(name='Name2').update(name='Knights')
+        response = self.client.get(self.url, {'q': 'knig'})
+        self.assertEqual([club.name for club in response.context['clubs']], ['Knights', 'Name0'])
+        self.assertEqual(response.context['query'], 'knig')
+
+    @override_settings(PAGE_SIZE=2)
+    def test_club_list_search_is_paginated(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_club(5)
+        response = self.client.get(self.url, {'q': 'description'})
+        first_page = list(response.context['clubs'])
+        self.assertEqual(len(first_page), 2)
+        self.assertIn('q=description', response.context['clubs'].next_query())
+        response = self.client.get(self.url, {'q': 'description', 'cursor': response.context['clubs'].next_cursor})
+        self.assertEqual(len(response.context['clubs']), 2)
+        self.assertFalse(set(first_page) & set(response.context['clubs']))
+
+    def test_club_autocomplete(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_club(3)
+        Club.objects.filter(name='Name1').update(name='Rookies')
+        response = self.client.get(reverse('club_autocomplete'), {'q': 'roo'})
+        self.assertEqual(response.json(), {'clubs': ['Rookies']})
+        response = self.client.get(reverse('club_autocomplete'), {'q': ' '})
+        self.assertEqual(response.json(), {'clubs': []})
+
     def _create_test_club(self, club_count=10):
         for club_id in range(club_count):
             test_owner = User.objects.create_user(
@@ -1,5 +1,7 @@
+from django.core.cache import cache as backend
 from django.test import TestCase
 from django.urls import reverse
+from clubs import cache
 from clubs.models import Club, User, Membership
 from clubs.tests.helpers import reverse_with_next
 
@@ -65,3 +67,27 @@ class ClubMembersViewTest(TestCase):
         self.assertContains(response, self.owner.name)
         self.assertContains(response, self.officer.name)
         self.assertContains(response, self.member.name)
+
+    def test_roster_rows_are_cached_per_viewer_type(self):
+        backend.clear()
+        self.client.login(email=self.owner.email, password="Password123")
+        self.client.get(self.url)
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 3})
+        response = self.client.get(self.url)
+        self.assertEqual(cache.stats(), {'hits': 3, 'misses': 3})
+        self.assertContains(response, 'OWNER')
+        self.client.login(email=self.officer.email, password="Password123")
+        response = self.client.get(self.url)
+        self.assertEqual(cache.stats(), {'hits': 3, 'misses': 6})
+        self.assertNotContains(response, 'OWNER </a>')
+
+    def test_roster_rows_are_rerendered_after_changes(self):
+        backend.clear()
+        self.client.login(email=self.owner.email, password="Password123")
+        self.client.get(self.url)
+        Membership.objects.get(user=self.member).save()
+        self.member.name = 'Renamed'
+        self.member.save()
+        response = self.client.get(self.url)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 4})
+        self.assertContains(response, 'Renamed')
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import Club, Game, Membership, Round, User, Tournament, TournamentMembers
+from clubs.tests.helpers import reverse_with_next
+
+
+class PairNextRoundViewTest(TestCase):
+    """Tests for the pair next round view"""
+
+    VIEW = 'pair_next_round'
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        self.organiser = User.objects.get(email='johndoe@example.org')
+        self.user = User.objects.get(email='janedoe@example.org')
+        club = Club.objects.get(name='alpha_bravo')
+        Membership.objects.create(user=self.organiser, club=club, type=1)
+        self.tournament = Tournament.objects.create(name='test', organiser=self.organiser, description='test',
+                                                    deadline=datetime.now() - timedelta(days=1), capacity=8,
+                                                    club=club, format=Tournament.SWISS)
+        for user in User.objects.all():
+            TournamentMembers.objects.create(user=user, tournament=self.tournament)
+        self.url = reverse(self.VIEW, kwargs={'tournament_id': self.tournament.id})
+
+    def test_pair_next_round_url(self):
+        self.assertEqual(self.url, f'/{self.VIEW}/{self.tournament.id}/')
+
+    def test_pair_next_round_redirects_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.post(self.url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_organiser_pairs_the_first_round_from_the_tournament_list(self):
+        self.client.login(email=self.organiser.email, password='Password123')
+        self.assertContains(self.client.get(reverse('tournament_list')), 'pair round 1')
+        response = self.client.post(self.url)
+        round_url = reverse('tournament_round', kwargs={'tournament_id': self.tournament.id, 'number': 1})
+        self.assertRedirects(response, round_url, status_code=302, target_status_code=200)
+        self.assertEqual(Round.objects.filter(tournament=self.tournament).count(), 1)
+        self.assertNotContains(self.client.get(reverse('tournament_list')), 'pair round 1')
+
+    def test_organiser_pairs_the_next_round_once_the_last_is_finished(self):
+        self.client.login(email=self.organiser.email, password='Password123')
+        self.client.post(self.url)
+        round_url = reverse('tournament_round', kwargs={'tournament_id': self.tournament.id, 'number': 1})
+        self.assertContains(self.client.get(round_url), 'pair next round')
+        response = self.client.post(self.url, follow=True)
+        self.assertRedirects(response, round_url, status_code=302, target_status_code=200)
+        self.assertContains(response, 'The previous round has unfinished games')
+        Game.objects.filter(round__tournament=self.tournament, result='').update(result=Game.DRAW)
+        response = self.client.post(self.url)
+        self.assertRedirects(response, reverse('tournament_round', kwargs={'tournament_id': self.tournament.id,
+                                                                           'number': 2}),
+                             status_code=302, target_status_code=200)
+        self.assertEqual(Round.objects.filter(tournament=self.tournament).count(), 2)
+
+    def test_organiser_cannot_pair_while_sign_up_is_open(self):
+        self.tournament.deadline = datetime.now() + timedelta(days=1)
+        self.tournament.save()
+        self.client.login(email=self.organiser.email, password='Password123')
+        response = self.client.post(self.url, follow=True)
+        self.assertContains(response, 'Sign-up is still open')
+        self.assertFalse(Round.objects.filter(tournament=self.tournament).exists())
+
+    def test_only_the_organiser_pairs_and_only_by_post(self):
+        self.client.login(email=self.organiser.email, password='Password123')
+        self.client.get(self.url)
+        self.client.login(email=self.user.email, password='Password123')
+        self.assertNotContains(self.client.get(reverse('tournament_list')), 'pair round 1')
+        self.client.post(self.url)
+        self.assertFalse(Round.objects.filter(tournament=self.tournament).exists())
@@ -0,0 +1,266 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import URLPattern, reverse
+from system import urls
+from clubs.knockout import create_bracket
+from clubs.round_robin import schedule_round_robin
+from clubs.models import Club, User, Application, Membership, Tournament, TournamentMembers, BracketSlot, Game, Round
+
+
+class QueryCounter:
+    """Database execute wrapper counting every query, unlike connection.queries which is capped."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetTest(TestCase):
+    """Query-count budgets for every named route, measured at several data sizes.
+
+    Each route is visited once per size in SIZES.  A route fails if it issues
+    more queries than its budget, or if its query count grows with the size of
+    the seeded data.  A budget of None marks a view with a known N+1 that has
+    not been fixed yet: it is measured and reported but not asserted on.
+    """
+
+    # Rows seeded per table before each measurement; run QUERY_BUDGET_SIZES=10,1000,10000 for the full sweep
+    SIZES = [int(size) for size in os.environ.get('QUERY_BUDGET_SIZES', '10,1000').split(',')]
+
+    BUDGETS = {
+        'home': 0,
+        'sign_up': 0,
+        'log_in': 0,
+        'feed': 2,
+        'log_out': 4,
+        'new_application': 2,
+        'show_user': 3,
+        'user_list': 3,
+        'user_autocomplete': 3,
+        'view_applications': 3,
+        'edit_application': 3,
+        'edit_profile': 3,
+        'create_club': 2,
+        'club_list': 4,
+        'club_autocomplete': 3,
+        'change_password': 2,
+        'my_clubs': 3,
+        'my_club': 3,
+        'view_app_to_club': 3,
+        'change_app_status': 12,
+        'bulk_change_app_status': 11,
+        'club_members': 5,
+        'change_member_type': 6,
+        'create_tournament': 4,
+        'tournament_list': 3,
+        'sign_up_tournament': 6,
+        'withdraw_tournament': 6,
+        'club_profile': 5,
+        'tournament_bracket': 4,
+        'create_bracket': 7,
+        'advance_bracket_slot': 4,
+        'tournament_round': 5,
+        'record_game_result': 9,
+        'pair_next_round': 11,
+    }
+
+    # Views guarded by @login_prohibited are measured without a session
+    ANONYMOUS = {'home', 'sign_up', 'log_in'}
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json',
+    ]
+
+    results = {}
+
+    def setUp(self):
+        self.viewer = User.objects.get(email='johndoe@example.org')
+        self.club = Club.objects.get(name='alpha_bravo')
+        Membership.objects.create(user=self.viewer, club=self.club, type=1)
+        self.password = make_password('Password123')
+        self.seeded = 0
+        self.knockout = Tournament.objects.create(name='Knockout', organiser=self.viewer, description='Knockout',
+                                                  deadline=datetime.now(), capacity=4, club=self.club,
+                                                  format=Tournament.KNOCKOUT)
+        for i in range(4):
+            user = User.objects.create(email=f'contestant{i}@example.org', name=f'Contestant {i}',
+                                       password=self.password)
+            TournamentMembers.objects.create(user=user, tournament=self.knockout)
+        create_bracket(self.knockout)
+        self.round_robin = Tournament.objects.create(name='Round robin', organiser=self.viewer,
+                                                     description='Round robin', deadline=datetime.now(), capacity=4,
+                                                     club=self.club, format=Tournament.ROUND_ROBIN)
+        TournamentMembers.objects.bulk_create([
+            TournamentMembers(user=contestant.user, tournament=self.round_robin)
+            for contestant in self.knockout.tournamentmembers_set.select_related('user')
+        ])
+        schedule_round_robin(self.round_robin)
+        self.swiss = Tournament.objects.create(name='Swiss', organiser=self.viewer, description='Swiss',
+                                               deadline=datetime.now(), capacity=4, club=self.club,
+                                               format=Tournament.SWISS)
+        TournamentMembers.objects.bulk_create([
+            TournamentMembers(user_id=contestant.user_id, tournament=self.swiss)
+            for contestant in self.knockout.tournamentmembers_set.all()
+        ])
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.results:
+            sys.stderr.write('\n' + cls._format_table() + '\n')
+
+    def test_every_named_route_has_a_budget(self):
+        names = {pattern.name for pattern in urls.urlpatterns if isinstance(pattern, URLPattern) and pattern.name}
+        self.assertEqual(names - set(self.BUDGETS), set(), 'Declare a query budget for every new route')
+        self.assertEqual(set(self.BUDGETS) - names, set(), 'Remove budgets of routes that no longer exist')
+
+    def test_query_counts_stay_within_budget(self):
+        for size in self.SIZES:
+            self._seed(size)
+            for name in self.BUDGETS:
+                self.results.setdefault(name, {})[size] = self._count_queries(name)
+        for name, budget in self.BUDGETS.items():
+            counts = self.results[name]
+            with self.subTest(view=name):
+                if budget is None:
+                    continue
+                for size, count in counts.items():
+                    self.assertLessEqual(count, budget, f'{name} issued {count} queries with {size} rows\n'
+                                         + self._format_table())
+                self.assertEqual(len(set(counts.values())), 1, f'{name} query count grows with the data\n'
+                                 + self._format_table())
+
+    def _count_queries(self, name):
+        url, data = self._request_for(name)
+        client = Client()
+        if name not in self.ANONYMOUS:
+            client.force_login(self.viewer)
+        # Measure every view with a cold cache
+        cache.clear()
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = client.get(url) if data is None else client.post(url, data)
+        self.assertIn(response.status_code, (200, 302), f'{name} returned {response.status_code}')
+        self._undo(name)
+        return counter.count
+
+    def _request_for(self, name):
+        """Return the url of the named route and the data to POST to it, or None to GET it."""
+        application = Application.objects.filter(club=self.club, status='pending').first()
+        member = Membership.objects.filter(club=self.club, type=3).first()
+        tournament = Tournament.objects.filter(club__membership__user=self.viewer).exclude(club=self.club).first()
+        kwargs = {
+            'new_application': {'club_id': self.club.id},
+            'show_user': {'user_id': member.user_id},
+            'edit_application': {'application_id': self.viewer.application_set.first().id},
+            'my_club': {'type': 2},
+            'view_app_to_club': {'club_id': self.club.id},
+            'change_app_status': {'application_id': application.id, 'accept': 1, 'club_id': self.club.id},
+            'bulk_change_app_status': {'club_id': self.club.id},
+            'club_members': {'club_id': self.club.id},
+            'change_member_type': {'user_id': member.user_id, 'club_id': self.club.id, 'promote': 1},
+            'create_tournament': {'club_id': self.club.id},
+            'sign_up_tournament': {'tournament_id': tournament.id},
+            'withdraw_tournament': {'tournament_id': tournament.id},
+            'club_profile': {'club_id': self.club.id},
+            'tournament_bracket': {'tournament_id': self.knockout.id},
+            'create_bracket': {'tournament_id': self.knockout.id},
+            'advance_bracket_slot': {'slot_id': BracketSlot.objects.get(tournament=self.knockout, round_number=1,
+                                                                        position=0).id},
+            'tournament_round': {'tournament_id': self.round_robin.id, 'number': 1},
+            'pair_next_round': {'tournament_id': self.swiss.id},
+            'record_game_result': {'game_id': Game.objects.get(round__tournament=self.round_robin, round__number=1,
+                                                               board=1).id},
+        }.get(name, {})
+        data = None
+        if name == 'bulk_change_app_status':
+            pending = Application.objects.filter(club=self.club, status='pending').values_list('id', flat=True)
+            data = {'application_ids': list(pending[:2]), 'accept': '1'}
+        elif name == 'record_game_result':
+            data = {'result': Game.WHITE_WIN}
+        elif name == 'pair_next_round':
+            data = {}
+        url = reverse(name, kwargs=kwargs)
+        if name in ('club_autocomplete', 'user_autocomplete'):
+            url += '?q=user'
+        return url, data
+
+    def _undo(self, name):
+        """Restore rows changed by a state-changing route so later sizes measure the same thing."""
+        if name == 'change_member_type':
+            Membership.objects.filter(club=self.club, type=2).exclude(user=self.viewer).update(type=3)
+        elif name == 'advance_bracket_slot':
+            BracketSlot.objects.filter(tournament=self.knockout, round_number__gt=1).update(player=None)
+        elif name == 'pair_next_round':
+            Round.objects.filter(tournament=self.swiss).delete()
+        elif name == 'record_game_result':
+            Game.objects.filter(round__tournament=self.round_robin).update(result='', recorded_at=None)
+
+    def _seed(self, size):
+        """Top up every table to roughly `size` seeded rows.
+
+        Seeded user i owns club i, which runs one tournament that user i has
+        entered.  The viewer owns the fixture club and is an officer of every
+        even club and an applicant to every odd one.  Even users are members of
+        the viewer's club, odd users have a pending application to it.
+        """
+        start, self.seeded = self.seeded, size
+        indices = range(start, size)
+        users = self._bulk_create(User, [
+            User(email=f'user{i}@example.org', name=f'User {i}', password=self.password, experience=i % 4 + 1)
+            for i in indices
+        ])
+        clubs = self._bulk_create(Club, [
+            Club(name=f'Club {i}', location=f'Location {i}', description=f'Description {i}') for i in indices
+        ])
+        deadline = datetime.now() + timedelta(days=7)
+        tournaments = self._bulk_create(Tournament, [
+            Tournament(name=f'Tournament {i}', organiser=user, description=f'Description {i}', deadline=deadline,
+                       capacity=96, club=club)
+            for i, user, club in zip(indices, users, clubs)
+        ])
+        TournamentMembers.objects.bulk_create([
+            TournamentMembers(user=user, tournament=tournament) for user, tournament in zip(users, tournaments)
+        ])
+        memberships = [Membership(user=user, club=club, type=1) for user, club in zip(users, clubs)]
+        applications = []
+        for i, user, club in zip(indices, users, clubs):
+            if i % 2 == 0:
+                memberships.append(Membership(user=self.viewer, club=club, type=2))
+                memberships.append(Membership(user=user, club=self.club, statement=f'Statement {i}', type=3))
+            else:
+                applications.append(Application(user=self.viewer, club=club, statement=f'Statement {i}',
+                                                status='pending'))
+                applications.append(Application(user=user, club=self.club, statement=f'Statement {i}',
+                                                status='pending'))
+        Membership.objects.bulk_create(memberships)
+        Application.objects.bulk_create(applications)
+        call_command('recount_clubs', stdout=StringIO())
+
+    def _bulk_create(self, model, objects):
+        """Insert the objects and return them with primary keys, which SQLite does not report back."""
+        model.objects.bulk_create(objects)
+        return list(model.objects.order_by('-id')[:len(objects)])[::-1]
+
+    @classmethod
+    def _format_table(cls):
+        sizes = sorted({size for counts in cls.results.values() for size in counts})
+        header = f'{"view":<22}{"budget":>8}' + ''.join(f'{size:>9}' for size in sizes)
+        rows = [header, '-' * len(header)]
+        for name, counts in cls.results.items():
+            budget = cls.BUDGETS.get(name)
+            rows.append(f'{name:<22}{"-" if budget is None else budget:>8}'
+                        + ''.join(f'{counts.get(size, ""):>9}' for size in sizes))
+        return '\n'.join(rows)
@@ -35,7 +35,7 @@ class SignUpTournamentViewTestCase(TestCase):
             name='test',
             organiser=self.organiser,
             description='test',
-            deadline='2026-10-25 14:30:59',
+            deadline=datetime.now() + timedelta(days=7),
             capacity=3,
             club=self.club)
         self.url = reverse(self.VIEW, kwargs={'tournament_id': self.tournament.id})
@@ -61,3 +61,50 @@ class SignUpTournamentViewTestCase(TestCase):
         self.tournament.is_contestant(self.user)
         # self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
         # self.assertTemplateUsed(response, f'tournament_list.html')
+
+    def test_sign_up_tournament_claims_a_seat(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self.client.get(self.url)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.contestant_count, 1)
+        self.assertTrue(self.tournament.is_contestant(self.user))
+
+    def test_sign_up_tournament_twice_takes_one_seat(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self.client.get(self.url)
+        response = self.client.get(self.url, follow=True)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.contestant_count, 1)
+        self.assertEqual(TournamentMembers.objects.count(), 1)
+        messages_list = list(response.context['messages'])
+        self.assertEqual(len(messages_list), 1)
+        self.assertIn('you already have a seat', messages_list[0].message)
+
+    def test_sign_up_tournament_rejected_when_full(self):
+        self.tournament.capacity = 2
+        self.tournament.contestant_count = 2
+        self.tournament.save()
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.get(self.url, follow=True)
+        self.assertEqual(TournamentMembers.objects.count(), 0)
+        messages_list = list(response.context['messages'])
+        self.assertEqual(len(messages_list), 1)
+        self.assertIn('full or closed', messages_list[0].message)
+
+    def test_sign_up_tournament_rejected_after_deadline(self):
+        self.tournament.deadline = datetime.now() - timedelta(minutes=1)
+        self.tournament.save()
+        self.client.login(email=self.user.email, password='Password123')
+        self.client.get(self.url)
+        self.assertEqual(TournamentMembers.objects.count(), 0)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.contestant_count, 0)
+
+    def test_withdraw_tournament_releases_seat(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self.client.get(self.url)
+        self.client.get(reverse('withdraw_tournament', kwargs={'tournament_id': self.tournament.id}))
+        self.client.get(reverse('withdraw_tournament', kwargs={'tournament_id': self.tournament.id}))
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.contestant_count, 0)
+        self.assertEqual(TournamentMembers.objects.count(), 0)
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from clubs.knockout import create_bracket
+from clubs.models import BracketSlot, Club, User, Tournament
+from clubs.tests.helpers import reverse_with_next
+
+
+class TournamentBracketViewTest(TestCase):
+    """Tests for the tournament bracket views"""
+
+    VIEW = 'tournament_bracket'
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        self.organiser = User.objects.get(email='johndoe@example.org')
+        self.user = User.objects.get(email='janedoe@example.org')
+        self.tournament = Tournament.objects.create(name='test', organiser=self.organiser, description='test',
+                                                    deadline=datetime.now() + timedelta(days=7), capacity=8,
+                                                    club=Club.objects.get(name='alpha_bravo'),
+                                                    format=Tournament.KNOCKOUT)
+        for user in User.objects.all():
+            self.tournament.claim_seat(user)
+        # Sign-up closes before the bracket is made
+        self.tournament.deadline = datetime.now() - timedelta(days=1)
+        self.tournament.save()
+        self.url = reverse(self.VIEW, kwargs={'tournament_id': self.tournament.id})
+
+    def test_tournament_bracket_url(self):
+        self.assertEqual(self.url, f'/{self.VIEW}/{self.tournament.id}/')
+
+    def test_tournament_bracket_redirects_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_organiser_can_create_bracket(self):
+        self.client.login(email=self.organiser.email, password='Password123')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'create bracket')
+        response = self.client.get(reverse('create_bracket', kwargs={'tournament_id': self.tournament.id}),
+                                   follow=True)
+        self.assertRedirects(response, self.url, status_code=302, target_status_code=200)
+        self.assertTrue(BracketSlot.objects.filter(tournament=self.tournament).exists())
+        self.assertContains(response, self.user.name)
+
+    def test_other_users_cannot_create_bracket(self):
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.get(self.url)
+        self.assertNotContains(response, 'create bracket')
+        self.client.get(reverse('create_bracket', kwargs={'tournament_id': self.tournament.id}))
+        self.assertFalse(BracketSlot.objects.filter(tournament=self.tournament).exists())
+
+    def test_organiser_cannot_create_bracket_while_sign_up_is_open(self):
+        self.tournament.deadline = datetime.now() + timedelta(days=1)
+        self.tournament.save()
+        self.client.login(email=self.organiser.email, password='Password123')
+        response = self.client.get(reverse('create_bracket', kwargs={'tournament_id': self.tournament.id}),
+                                   follow=True)
+        self.assertContains(response, 'Sign-up is still open')
+        self.assertFalse(BracketSlot.objects.filter(tournament=self.tournament).exists())
+
+    def test_organiser_cannot_create_bracket_for_other_formats(self):
+        self.tournament.format = Tournament.SWISS
+        self.tournament.save()
+        self.client.login(email=self.organiser.email, password='Password123')
+        response = self.client.get(reverse('create_bracket', kwargs={'tournament_id': self.tournament.id}),
+                                   follow=True)
+        self.assertContains(response, 'The tournament is not a knockout')
+        self.assertFalse(BracketSlot.objects.filter(tournament=self.tournament).exists())
+
+    def test_organiser_can_advance_winner(self):
+        create_bracket(self.tournament)
+        slot = BracketSlot.objects.get(tournament=self.tournament, round_number=1, position=0)
+        self.client.login(email=self.organiser.email, password='Password123')
+        response = self.client.get(reverse('advance_bracket_slot', kwargs={'slot_id': slot.id}))
+        self.assertRedirects(response, self.url, status_code=302, target_status_code=200)
+        winner = BracketSlot.objects.get(tournament=self.tournament, round_number=2, position=0)
+        self.assertEqual(winner.player_id, slot.player_id)
+
+    def test_other_users_cannot_advance_winner(self):
+        create_bracket(self.tournament)
+        slot = BracketSlot.objects.get(tournament=self.tournament, round_number=1, position=0)
+        self.client.login(email=self.user.email, password='Password123')
+        self.client.get(reverse('advance_bracket_slot', kwargs={'slot_id': slot.id}))
+        winner = BracketSlot.objects.get(tournament=self.tournament, round_number=2, position=0)
+        self.assertIsNone(winner.player_id)
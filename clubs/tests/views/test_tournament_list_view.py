@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import Club, User, Membership, Tournament
+from clubs.tests.helpers import reverse_with_next
+
+
+class TournamentListViewTest(TestCase):
+    """Tests for Tournament List view"""
+
+    VIEW = 'tournament_list'
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        self.organiser = User.objects.get(email='johndoe@example.org')
+        self.user = User.objects.get(email='janedoe@example.org')
+        self.other_user = User.objects.get(email='petrapickles@example.org')
+        self.club = Club.objects.get(name='alpha_bravo')
+        self.other_club = Club.objects.create(name='other', location='elsewhere', description='other club')
+        Membership.objects.create(user=self.organiser, club=self.club, type=1)
+        Membership.objects.create(user=self.user, club=self.club, type=3)
+        Membership.objects.create(user=self.other_user, club=self.other_club, type=1)
+        self.open_tournament = self._create_tournament('open', self.club, timedelta(days=7))
+        self.closed_tournament = self._create_tournament('closed', self.club, timedelta(days=-1))
+        self.other_tournament = self._create_tournament('elsewhere', self.other_club, timedelta(days=7))
+        self.open_tournament.claim_seat(self.user)
+        self.open_tournament.claim_seat(self.organiser)
+        self.url = reverse(self.VIEW)
+
+    def test_tournament_list_url(self):
+        self.assertEqual(self.url, f'/{self.VIEW}/')
+
+    def test_tournament_list_redirects_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_tournament_list_only_shows_tournaments_of_own_clubs(self):
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, f'{self.VIEW}.html')
+        self.assertEqual(list(response.context['tournaments']), [self.closed_tournament, self.open_tournament])
+
+    def test_tournament_list_annotates_state(self):
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.get(self.url)
+        closed, opened = response.context['tournaments']
+        self.assertEqual(opened.contestant_count, 2)
+        self.assertTrue(opened.is_signed_up)
+        self.assertTrue(opened.is_open)
+        self.assertEqual(closed.contestant_count, 0)
+        self.assertFalse(closed.is_signed_up)
+        self.assertFalse(closed.is_open)
+        self.assertContains(response, 'withdraw')
+        self.assertContains(response, 'over')
+
+    def test_tournament_list_offers_sign_up_to_other_members(self):
+        Membership.objects.create(user=self.other_user, club=self.club, type=3)
+        self.client.login(email=self.other_user.email, password='Password123')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'apply (2/3)')
+        self.assertNotContains(response, 'withdraw')
+
+    def _create_tournament(self, name, club, time_to_deadline):
+        return Tournament.objects.create(
+            name=name,
+            organiser=self.organiser,
+            description='test',
+            deadline=datetime.now() + time_to_deadline,
+            capacity=3,
+            club=club
+        )
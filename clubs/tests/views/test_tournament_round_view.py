@@ -0,0 +1,104 @@
+from datetime import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import Club, Game, User, Tournament, TournamentMembers
+from clubs.round_robin import schedule_round_robin
+from clubs.tests.helpers import reverse_with_next
+
+
+class TournamentRoundViewTest(TestCase):
+    """Tests for the tournament round view"""
+
+    VIEW = 'tournament_round'
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_users.json',
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(email='johndoe@example.org')
+        self.tournament = Tournament.objects.create(name='test', organiser=self.user, description='test',
+                                                    deadline=datetime.now(), capacity=8,
+                                                    club=Club.objects.get(name='alpha_bravo'),
+                                                    format=Tournament.ROUND_ROBIN)
+        for user in User.objects.all():
+            TournamentMembers.objects.create(user=user, tournament=self.tournament)
+        schedule_round_robin(self.tournament)
+        self.url = reverse(self.VIEW, kwargs={'tournament_id': self.tournament.id, 'number': 2})
+
+    def test_tournament_round_url(self):
+        self.assertEqual(self.url, f'/{self.VIEW}/{self.tournament.id}/2/')
+
+    def test_tournament_round_redirects_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_tournament_round_shows_only_that_round(self):
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, f'{self.VIEW}.html')
+        games = list(response.context['games'])
+        self.assertEqual(len(games), 2)
+        self.assertTrue(all(game.round.number == 2 for game in games))
+        self.assertEqual(response.context['round_count'], 3)
+        self.assertContains(response, 'previous')
+        self.assertContains(response, 'next')
+
+    def test_tournament_round_is_not_found_beyond_the_schedule(self):
+        self.client.login(email=self.user.email, password='Password123')
+        url = reverse(self.VIEW, kwargs={'tournament_id': self.tournament.id, 'number': 4})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_tournament_round_is_not_found_before_scheduling(self):
+        tournament = Tournament.objects.create(name='unscheduled', organiser=self.user, description='test',
+                                               deadline=datetime.now(), capacity=8,
+                                               club=Club.objects.get(name='alpha_bravo'),
+                                               format=Tournament.ROUND_ROBIN)
+        self.client.login(email=self.user.email, password='Password123')
+        url = reverse(self.VIEW, kwargs={'tournament_id': tournament.id, 'number': 1})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_organiser_sees_result_buttons_for_unfinished_games(self):
+        self.client.login(email=self.user.email, password='Password123')
+        self.assertContains(self.client.get(self.url), 'white won', count=2)
+        self.client.login(email='janedoe@example.org', password='Password123')
+        self.assertNotContains(self.client.get(self.url), 'white won')
+
+    def test_organiser_records_a_result_and_updates_ratings(self):
+        game = Game.objects.filter(round__tournament=self.tournament, round__number=2).first()
+        white_rating, black_rating = game.white.rating, game.black.rating
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.post(reverse('record_game_result', kwargs={'game_id': game.id}),
+                                    {'result': Game.WHITE_WIN})
+        self.assertRedirects(response, self.url, status_code=302, target_status_code=200)
+        game.refresh_from_db()
+        self.assertEqual(game.result, Game.WHITE_WIN)
+        self.assertIsNotNone(game.recorded_at)
+        self.assertGreater(User.objects.get(id=game.white_id).rating, white_rating)
+        self.assertLess(User.objects.get(id=game.black_id).rating, black_rating)
+
+    def test_result_cannot_be_recorded_twice_or_be_unknown(self):
+        game = Game.objects.filter(round__tournament=self.tournament, round__number=2).first()
+        url = reverse('record_game_result', kwargs={'game_id': game.id})
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.post(url, {'result': '2-0'}, follow=True)
+        self.assertContains(response, "That game&#x27;s result cannot be recorded")
+        self.client.post(url, {'result': Game.DRAW})
+        white_rating = User.objects.get(id=game.white_id).rating
+        response = self.client.post(url, {'result': Game.WHITE_WIN}, follow=True)
+        self.assertContains(response, "That game&#x27;s result cannot be recorded")
+        self.assertEqual(Game.objects.get(id=game.id).result, Game.DRAW)
+        self.assertEqual(User.objects.get(id=game.white_id).rating, white_rating)
+
+    def test_only_the_organiser_records_results_and_only_by_post(self):
+        game = Game.objects.filter(round__tournament=self.tournament, round__number=2).first()
+        url = reverse('record_game_result', kwargs={'game_id': game.id})
+        self.client.login(email=self.user.email, password='Password123')
+        self.client.get(url, {'result': Game.WHITE_WIN})
+        self.client.login(email='janedoe@example.org', password='Password123')
+        self.client.post(url, {'result': Game.WHITE_WIN})
+        self.assertEqual(Game.objects.get(id=game.id).result, '')
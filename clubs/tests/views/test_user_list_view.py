@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from clubs.models import User
@@ -36,6 +37,49 @@ class UserListTest(TestCase):
         response = self.client.get(self.url)
         self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
 
+    def test_search_matches_name_or_email_prefix(self):
+        self.client.login(email=self.user.email, password='Password123')
+        User.objects.create_user(email='zed@test.org', password='Password123', name='Alice Smith', experience=2)
+        User.objects.create_user(email='alice@test.org', password='Password123', name='Zoe', experience=4)
+        User.objects.create_user(email='bob@test.org', password='Password123', name='Bob', experience=2)
+        response = self.client.get(self.url, {'q': 'ALI'})
+        self.assertEqual([user.name for user in response.context['users']], ['Alice Smith', 'Zoe'])
+
+    def test_search_is_faceted_by_experience(self):
+        self.client.login(email=self.user.email, password='Password123')
+        User.objects.create_user(email='zed@test.org', password='Password123', name='Alice Smith', experience=2)
+        User.objects.create_user(email='alice@test.org', password='Password123', name='Zoe', experience=4)
+        response = self.client.get(self.url, {'q': 'ali'})
+        self.assertEqual(response.context['facets'],
+                         [(1, 'beginner', 0), (2, 'intermediate', 1), (3, 'advanced', 0), (4, 'magnus carlson', 1)])
+        self.assertContains(response, 'intermediate (1)')
+        response = self.client.get(self.url, {'q': 'ali', 'experience': '4'})
+        self.assertEqual([user.name for user in response.context['users']], ['Zoe'])
+
+    def test_experience_that_is_not_a_level_is_ignored(self):
+        self.client.login(email=self.user.email, password='Password123')
+        User.objects.create_user(email='zoe@test.org', password='Password123', name='Zoe', experience=4)
+        for params in ({'experience': '99999999999999999999'}, {'q': 'zoe', 'experience': '99999999999999999999'},
+                       {'experience': '5'}, {'experience': '-1'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('Zoe', [user.name for user in response.context['users']])
+
+    def test_user_autocomplete_is_limited_and_cached(self):
+        cache.clear()
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_users(self.USERS_CREATED_COUNT)
+        url = reverse('user_autocomplete')
+        with self.settings(AUTOCOMPLETE_LIMIT=5):
+            response = self.client.get(url, {'q': 'name'})
+        self.assertEqual(len(response.json()['users']), 5)
+        self.assertIn('max-age', response['Cache-Control'])
+        User.objects.filter(name__startswith='Name').update(name='Renamed')
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'q': 'NAME'})
+        self.assertEqual(len(response.json()['users']), 5)
+        self.assertEqual(self.client.get(url).json(), {'users': []})
+
     def _create_test_users(self, user_count):
         for user in range(user_count):
             user_id = user + self.CONSTANT
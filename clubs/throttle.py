@@ -0,0 +1,57 @@
+"""Token-bucket throttling of failed logins, by client IP address and by email.
+
+Every IP address and every email has a bucket of LOGIN_THROTTLE_RATES tokens,
+refilled one at a time, and each failed login takes a token from both.  An
+attempt finding either bucket empty is turned away before any password is
+hashed, so a credential-stuffing run costs a cache lookup per attempt rather
+than a hash.  Buckets live in the 'throttle' cache, shared by every worker,
+and are only stored once a login fails, so checking an attempt is one
+get_many and only failed logins write.  Concurrent attempts may each see the same
+last token, so a burst can overshoot a bucket by at most a token per worker.
+"""
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def client_ip(request):
+    """Return the client's IP address, as seen by the last of settings.NUM_PROXIES proxies in front of the site."""
+    if settings.NUM_PROXIES:
+        # Each proxy appends the address it received the request from, and anything further left may be forged
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        return forwarded[-min(settings.NUM_PROXIES, len(forwarded))].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class LoginThrottle:
+    """The buckets of a login attempt, read when it is created."""
+
+    def __init__(self, request, email):
+        # Hashing keeps the keys short and safe for any cache backend
+        self.keys = {
+            kind: f"login_throttle:{kind}:{hashlib.sha256(value.lower().encode()).hexdigest()}"
+            for kind, value in (('ip', client_ip(request)), ('email', email))
+        }
+        self.now = time.time()
+        self.tokens = {}
+        found = caches['throttle'].get_many(self.keys.values())
+        for kind, key in self.keys.items():
+            capacity, interval = settings.LOGIN_THROTTLE_RATES[kind]
+            tokens, updated = found.get(key, (capacity, self.now))
+            self.tokens[kind] = min(capacity, tokens + (self.now - updated) / interval)
+
+    def wait(self):
+        """Return the seconds until the attempt would be allowed, 0 if it is allowed now."""
+        rates = settings.LOGIN_THROTTLE_RATES
+        return max([math.ceil((1 - tokens) * rates[kind][1])
+                    for kind, tokens in self.tokens.items() if tokens < 1], default=0)
+
+    def failed(self):
+        """Take a token from each bucket for a failed login."""
+        rates = settings.LOGIN_THROTTLE_RATES
+        buckets = {key: (max(0, self.tokens[kind] - 1), self.now) for kind, key in self.keys.items()}
+        # Long enough for either bucket to refill from empty, after which a missing bucket is a full one
+        caches['throttle'].set_many(buckets, max(capacity * interval for capacity, interval in rates.values()))
@@ -1,13 +1,28 @@
 import django
 import datetime
+from functools import partial
+from urllib.parse import quote
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.hashers import check_password
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from .models import TournamentMembers, User, Application, Club, Membership, Tournament
+from django.db import transaction
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q, Subquery
+from .models import TournamentMembers, User, Application, Club, Membership, Tournament, BracketSlot, Round, Game
+from django.http import Http404, JsonResponse
+from django.views.decorators.cache import cache_control
 from django.shortcuts import redirect, render, get_object_or_404
+from django.template.loader import render_to_string
+from clubs import knockout, swiss
+from clubs.cache import cached_rendering, cached_renderings, versions
 from clubs.helpers import login_prohibited
+from clubs.pagination import paginate
+from clubs.routers import read_from_replica
+from clubs.search import experience_facets, search_clubs, search_users
+from clubs.throttle import LoginThrottle
 from .forms import SignUpForm, ApplicationForm, ClubForm, LogInForm, ProfileForm, PasswordForm, TournamentForm
 
 @login_prohibited
@@ -69,11 +84,18 @@ def log_in(request):
         if form.is_valid():
             email = form.cleaned_data.get('email')
             password = form.cleaned_data.get('password')
+            throttle = LoginThrottle(request, email)
+            wait = throttle.wait()
+            if wait:
+                messages.add_message(request, messages.ERROR,
+                                     f"too many failed attempts to log in, try again in {wait} seconds")
+                return render(request, 'log_in.html', {'form': LogInForm()}, status=429)
             user = authenticate(email=email, password=password)
             if user is not None:
                 login(request, user)
                 redirect_url = request.POST.get('next') or 'feed'
                 return redirect(redirect_url)
+            throttle.failed()
         messages.add_message(request, messages.ERROR, "incorrect email or password")
 
     form = LogInForm()
@@ -90,17 +112,47 @@ def log_out(request):
 @login_required
 def show_user(request, user_id):
     try:
-        user = User.objects.get(id=user_id)
+        profile = cached_rendering('user', user_id, lambda: render_to_string(
+            'partials/user_profile.html', {'user': User.objects.get(id=user_id)}
+        ))
     except ObjectDoesNotExist:
         return redirect('user_list')
     else:
-        return render(request, 'show_user.html', {'user': user})
+        return render(request, 'show_user.html', {'profile': profile})
 
 
 @login_required
+@read_from_replica
 def user_list(request):
-    users = User.objects.all()
-    return render(request, 'user_list.html', {'users': users})
+    query = request.GET.get('q', '').strip()
+    users = search_users(User.objects.all(), query)
+    facets = experience_facets(users) if query else None
+    experience = request.GET.get('experience', '')
+    # Anything but a level, such as a number too big for the database, leaves the list unfiltered
+    if experience in {str(level) for level, _ in User.LEVEL}:
+        users = users.filter(experience=experience)
+    else:
+        experience = ''
+    users = paginate(request, users, ['experience', 'id'], settings.PAGE_SIZE)
+    return render(request, 'user_list.html', {'users': users, 'query': query, 'facets': facets,
+                                              'experience': experience})
+
+
+@login_required
+@cache_control(private=True, max_age=settings.AUTOCOMPLETE_CACHE_SECONDS)
+def user_autocomplete(request):
+    """Return the ids and names of the first users whose name or email starts with q, as JSON."""
+    query = request.GET.get('q', '').strip()[:100]
+    if not query:
+        return JsonResponse({'users': []})
+
+    def matches():
+        users = search_users(User.objects.all(), query).order_by('name_key', 'id')
+        return [{'id': user_id, 'name': name}
+                for user_id, name in users.values_list('id', 'name')[:settings.AUTOCOMPLETE_LIMIT]]
+
+    key = f'user_autocomplete:{quote(query.lower())}'
+    return JsonResponse({'users': cache.get_or_set(key, matches, settings.AUTOCOMPLETE_CACHE_SECONDS)})
 
 
 @login_required
@@ -117,8 +169,8 @@ def new_application(request, club_id):
 
 @login_required
 def view_applications(request):
-    user = User.objects.get(id=request.user.id)
-    applications = user.application_set.all()
+    applications = paginate(request, request.user.application_set.select_related('club'), ['-created_at', 'id'],
+                            settings.PAGE_SIZE)
     return render(request, 'view_applications.html', {'applications': applications})
 
 
@@ -144,15 +196,32 @@ def create_club(request):
 
 @login_required
 def club_profile(request, club_id):
-    club = Club.objects.get(id=club_id)
-    return render(request, 'club_profile.html', {'club': club})
+    profile = cached_rendering('club', club_id, lambda: render_to_string(
+        'partials/club_profile.html', {'club': Club.objects.get(id=club_id)}
+    ))
+    return render(request, 'club_profile.html', {'profile': profile})
 
 
 @login_required
+@read_from_replica
 def club_list(request):
-    applied = request.user.application_set.all()
-    clubs = [j for j in Club.objects.all() if j not in [i.club for i in applied]]
-    return render(request, 'club_list.html', {'clubs': clubs})
+    owners = Membership.objects.filter(club=OuterRef('pk'), type=1)
+    clubs = Club.objects.exclude(application__user=request.user).annotate(
+        owner_name=Subquery(owners.values('user__name')[:1])
+    ).filter(owner_name__isnull=False)
+    query = request.GET.get('q', '').strip()
+    if query:
+        clubs = paginate(request, search_clubs(clubs, query), ['rank', 'id'], settings.PAGE_SIZE)
+    else:
+        clubs = paginate(request, clubs, ['id'], settings.PAGE_SIZE)
+    return render(request, 'club_list.html', {'clubs': clubs, 'query': query})
+
+
+@login_required
+def club_autocomplete(request):
+    """Return the names of the clubs best matching the partial search in q, as JSON."""
+    clubs = search_clubs(Club.objects.all(), request.GET.get('q', '')).order_by('rank', 'id')
+    return JsonResponse({'clubs': list(clubs.values_list('name', flat=True)[:settings.AUTOCOMPLETE_LIMIT])})
 
 
 @login_required
@@ -162,9 +231,9 @@ def my_clubs(request, type=None):
                      2: 'officer', 
                      3: 'member'}
     if type and type > 0: 
-        memberships = Membership.objects.filter(user=request.user, type=type) or None
+        memberships = Membership.objects.filter(user=request.user, type=type).select_related('club') or None
     else:
-        memberships = request.user.membership_set.all()
+        memberships = request.user.membership_set.select_related('club')
     if memberships:
         return render(request, 'my_clubs.html', {'memberships': memberships})
     return render(request, 'my_clubs.html', {'type': response_dict[type] if type is not None else ''})
@@ -172,30 +241,66 @@ def my_clubs(request, type=None):
 
 @login_required
 def view_app_to_club(request, club_id):
-    applications = [i for i in Club.objects.get(id=club_id).application_set.all() if
-                    i in Application.objects.filter(status='pending')]
-    return render(request, 'view_app_to_club.html', {'applications': applications})
+    return render_pending_applications(request, club_id)
 
 
 @login_required
 def change_app_status(request, application_id, accept, club_id):
-    application = get_object_or_404(Application, id=application_id)
-    if accept:
-        application.status = 'accepted'
-        Membership.objects.create(user=application.user, club=application.club, statement=application.statement, type=3)
-    else:
-        application.status = 'rejected'
-    application.save()
-    applications = [i for i in Club.objects.get(id=club_id).application_set.all() if
-                    i in Application.objects.filter(status='pending')]
-    return render(request, 'view_app_to_club.html', {'applications': applications})
+    with transaction.atomic():
+        # Lock the application so a double click or a second officer cannot review it twice
+        application = get_object_or_404(
+            Application.objects.select_for_update(of=('self',)).select_related('club'), id=application_id
+        )
+        if application.status == 'pending':
+            application.status = 'accepted' if accept else 'rejected'
+            application.save(update_fields=['status'])
+            created = False
+            if accept:
+                _, created = Membership.objects.get_or_create(
+                    user_id=application.user_id, club_id=application.club_id,
+                    defaults={'statement': application.statement, 'type': 3}
+                )
+            application.club.adjust_counts(members=1 if created else 0, pending_applications=-1)
+    return render_pending_applications(request, club_id)
+
+
+@login_required
+def bulk_change_app_status(request, club_id):
+    """Accept or reject every pending application of the club listed in the POSTed application_ids."""
+    club = get_object_or_404(Club, id=club_id)
+    if request.method != 'POST' or not Membership.objects.filter(user=request.user, club=club, type__in=(1, 2)).exists():
+        return redirect('view_app_to_club', club_id)
+    accept = request.POST.get('accept') == '1'
+    application_ids = [i for i in request.POST.getlist('application_ids') if i.isdigit()]
+    with transaction.atomic():
+        pending = list(Application.objects.select_for_update().filter(
+            club=club, id__in=application_ids, status='pending'
+        ).values_list('id', 'user_id', 'statement'))
+        new_members = []
+        if accept:
+            existing = set(Membership.objects.filter(club=club, user_id__in=[i[1] for i in pending])
+                           .values_list('user_id', flat=True))
+            new_members = [Membership(user_id=user_id, club=club, statement=statement, type=3)
+                           for _, user_id, statement in pending if user_id not in existing]
+            Membership.objects.bulk_create(new_members)
+        if pending:
+            Application.objects.filter(id__in=[i[0] for i in pending]).update(
+                status='accepted' if accept else 'rejected'
+            )
+            club.adjust_counts(members=len(new_members), pending_applications=-len(pending))
+    messages.add_message(request, messages.SUCCESS,
+                         f"{'Accepted' if accept else 'Rejected'} {len(pending)} applications")
+    return redirect('view_app_to_club', club_id)
 
 
 @login_required
+@read_from_replica
 def club_members(request, club_id):
-    memberships = Club.objects.get(id=club_id).membership_set.all()
-    return render(request, 'club_members.html',
-                  {'memberships': memberships, 'type': request.user.get_membership(club_id).type, 'user': request.user})
+    memberships = paginate(request, Membership.objects.filter(club_id=club_id).select_related('user'), ['type', 'id'],
+                           settings.PAGE_SIZE)
+    type = request.user.get_membership(club_id).type
+    return render(request, 'club_members.html', {'memberships': memberships, 'type': type, 'user': request.user,
+                                                 'rows': render_member_rows(memberships, type, request.user)})
 
 
 @login_required
@@ -216,8 +321,16 @@ def change_member_type(request, user_id, club_id, promote):
 
 
 @login_required
+@read_from_replica
 def tournament_list(request):
-    tournaments = [j for j in [Tournament.objects.filter(club=i.club) for i in request.user.membership_set.all()]]
+    signed_up = TournamentMembers.objects.filter(tournament=OuterRef('pk'), user=request.user)
+    tournaments = Tournament.objects.filter(
+        club__in=request.user.membership_set.values('club')
+    ).select_related('club', 'organiser').annotate(
+        is_signed_up=Exists(signed_up),
+        is_open=ExpressionWrapper(Q(deadline__gt=datetime.datetime.now()), output_field=BooleanField()),
+        is_paired=Exists(Round.objects.filter(tournament=OuterRef('pk')))
+    ).order_by('deadline', 'id')
     return render(request, "tournament_list.html", {'tournaments': tournaments, 'user': request.user})
 
 
@@ -236,12 +349,114 @@ def create_tournament(request, club_id):
 
 @login_required
 def sign_up_tournament(request, tournament_id):
-    if not Tournament.objects.get(id=tournament_id).is_contestant(request.user):
-        TournamentMembers.objects.create(user=request.user, tournament=Tournament.objects.get(id=tournament_id))
+    if not Tournament(id=tournament_id).claim_seat(request.user):
+        # Only a failed sign-up pays for finding out why it failed
+        if TournamentMembers.objects.filter(user=request.user, tournament_id=tournament_id).exists():
+            messages.add_message(request, messages.ERROR, "Could not sign up: you already have a seat")
+        else:
+            messages.add_message(request, messages.ERROR, "Could not sign up: the tournament is full or closed")
     return redirect('tournament_list')
 
 
 @login_required
 def withdraw_tournament(request, tournament_id):
-    TournamentMembers.objects.get(user=request.user, tournament=Tournament.objects.get(id=tournament_id)).delete()
+    Tournament(id=tournament_id).release_seat(request.user)
     return redirect('tournament_list')
+
+
+@login_required
+def tournament_bracket(request, tournament_id):
+    tournament = get_object_or_404(Tournament.objects.select_related('organiser'), id=tournament_id)
+    return render(request, 'tournament_bracket.html', {
+        'tournament': tournament,
+        'rounds': knockout.bracket_rounds(tournament),
+        'is_organiser': tournament.organiser_id == request.user.id,
+    })
+
+
+@login_required
+def create_bracket(request, tournament_id):
+    tournament = get_object_or_404(Tournament, id=tournament_id)
+    if tournament.organiser_id == request.user.id:
+        try:
+            knockout.create_bracket(tournament)
+        except ValueError as error:
+            messages.add_message(request, messages.ERROR, str(error))
+    return redirect('tournament_bracket', tournament_id)
+
+
+@login_required
+def advance_bracket_slot(request, slot_id):
+    """Record the player in the slot as the winner of their match."""
+    slot = get_object_or_404(BracketSlot.objects.select_related('tournament'), id=slot_id)
+    if slot.tournament.organiser_id == request.user.id and not slot.advance():
+        messages.add_message(request, messages.ERROR, "That match cannot be decided")
+    return redirect('tournament_bracket', slot.tournament_id)
+
+
+@login_required
+def tournament_round(request, tournament_id, number):
+    """Show the games of one round, without loading the rest of the schedule."""
+    tournament = get_object_or_404(Tournament, id=tournament_id)
+    round_count = Round.objects.filter(tournament=tournament).count()
+    # Covers tournaments that have not been scheduled yet, which have no rounds at all
+    if not 1 <= number <= round_count:
+        raise Http404('The tournament has no such round')
+    games = Game.objects.filter(round__tournament=tournament, round__number=number).select_related('white', 'black')
+    return render(request, 'tournament_round.html', {
+        'tournament': tournament,
+        'number': number,
+        'games': games,
+        'round_count': round_count,
+        'is_organiser': tournament.organiser_id == request.user.id,
+        'is_swiss': tournament.format == Tournament.SWISS,
+        'results': Game.RESULTS,
+    })
+
+
+@login_required
+def pair_next_round(request, tournament_id):
+    """Pair the next round of a Swiss tournament once every game of the last one has a result."""
+    tournament = get_object_or_404(Tournament, id=tournament_id)
+    if request.method != 'POST' or tournament.organiser_id != request.user.id:
+        return redirect('tournament_list')
+    try:
+        new_round = swiss.pair_next_round(tournament)
+    except ValueError as error:
+        messages.add_message(request, messages.ERROR, str(error))
+        round_count = Round.objects.filter(tournament=tournament).count()
+        return redirect('tournament_round', tournament_id, round_count) if round_count else redirect('tournament_list')
+    return redirect('tournament_round', tournament_id, new_round.number)
+
+
+@login_required
+def record_game_result(request, game_id):
+    """Record the POSTed result of an unfinished game, updating both players' ratings."""
+    game = get_object_or_404(Game.objects.select_related('round__tournament'), id=game_id)
+    if request.method == 'POST' and game.round.tournament.organiser_id == request.user.id:
+        result = request.POST.get('result')
+        if result not in Game.POINTS or not game.record_result(result):
+            messages.add_message(request, messages.ERROR, "That game's result cannot be recorded")
+    return redirect('tournament_round', game.round.tournament_id, game.round.number)
+
+
+def render_pending_applications(request, club_id):
+    applications = paginate(request, Application.objects.filter(club_id=club_id, status='pending').select_related('user'),
+                            ['-created_at', 'id'], settings.PAGE_SIZE)
+    return render(request, 'view_app_to_club.html', {'applications': applications, 'club_id': club_id})
+
+
+def render_member_rows(memberships, type, viewer):
+    """Render the roster rows of the memberships for a viewer of the given membership type, cached where possible.
+
+    A row shows the membership and its user, and its buttons depend on the
+    viewer's type and on whether the row is the viewer's own.
+    """
+    membership_versions = versions('membership', [membership.id for membership in memberships])
+    user_versions = versions('user', [membership.user_id for membership in memberships])
+    return cached_renderings([
+        (f'membership:{membership.id}:{membership_versions[membership.id]}.{user_versions[membership.user_id]}:'
+         f'{type}:{int(membership.user_id == viewer.id)}',
+         partial(render_to_string, 'partials/member_row.html', {'membership': membership, 'type': type, 'user': viewer}))
+        for membership in memberships
+    ])
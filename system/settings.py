@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'clubs.timing.TimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,13 +53,14 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'clubs.routers.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'system.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'clubs.timing.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -85,6 +87,158 @@ DATABASES = {
     }
 }
 
+# Read replica
+# Set REPLICA_NAME to a second SQLite file, kept in step with the primary by the replicate command, and the list
+# views read from it, except for REPLICA_STICKY_SECONDS after a browser writes, so users read their own writes.
+
+REPLICA_NAME = os.environ.get('REPLICA_NAME')
+
+if REPLICA_NAME:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': REPLICA_NAME,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['clubs.routers.ReplicaRouter']
+
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+
+# SQLite pragmas, run on every new connection by clubs.sqlite
+# Choose them with SQLITE_PROFILE: 'production' (the default, WAL so readers never wait for a writer) or 'default'
+# (SQLite's own defaults, with a rollback journal).  Override any one with SQLITE_<PRAGMA>, such as
+# SQLITE_MMAP_SIZE=0.  The busy timeout is in milliseconds, a negative cache size in KiB.
+
+SQLITE_PROFILES = {
+    'production': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    'default': {
+        'busy_timeout': 5000,
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -2000,
+        'temp_store': 'DEFAULT',
+    },
+}
+
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+
+SQLITE_PRAGMAS = {
+    name: os.environ.get(f'SQLITE_{name.upper()}', value) for name, value in SQLITE_PROFILES[SQLITE_PROFILE].items()
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Choose the backend with CACHE_BACKEND: 'locmem' (the default, one cache per process), 'file' or 'db'
+# (shared by every process; create the table with `python manage.py createcachetable`).  CACHE_LOCATION
+# overrides the directory or table.  Several workers must share the cache, or each keeps serving renderings the
+# others invalidated, so locmem is refused outside DEBUG.
+
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'clubs'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', os.path.join(BASE_DIR, 'cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'clubs_cache'),
+}
+
+CACHE_BACKEND, CACHE_LOCATION = CACHE_BACKENDS[os.environ.get('CACHE_BACKEND', 'locmem')]
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_LOCATION),
+    }
+}
+
+# Seconds a cached rendering of a club or user profile is kept; changes invalidate it sooner
+RENDERING_CACHE_SECONDS = 60 * 60
+
+# Sessions
+# https://docs.djangoproject.com/en/3.2/topics/http/sessions/
+# Choose where sessions live with SESSION_MODE: 'db' (the default), 'cached_db' (read from the cache, written
+# through to the database), 'cache' (the cache only, so use a shared CACHE_BACKEND and expect sessions to be
+# lost on eviction) or 'signed_cookies' (the browser keeps the session, signed with SECRET_KEY).
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('SESSION_MODE', 'db')]
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/3.2/topics/auth/passwords/
+# Choose how new passwords are hashed with PASSWORD_HASHER: 'scrypt' (the default), 'argon2' (needs argon2-cffi) or
+# 'pbkdf2'.  Every hasher stays listed so existing hashes still verify, and each is rehashed with the chosen one on
+# its user's next successful login.
+
+PASSWORD_HASHER_PROFILES = {
+    'scrypt': 'clubs.hashers.ScryptPasswordHasher',
+    'argon2': 'clubs.hashers.Argon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'scrypt')
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[PASSWORD_HASHER]] + [
+    hasher for profile, hasher in PASSWORD_HASHER_PROFILES.items() if profile != PASSWORD_HASHER
+]
+
+
+# Login throttling
+# Failed logins take a token from a bucket for the client's IP address and another for the email, holding
+# (capacity, seconds to refill one token); an empty bucket turns logins away before any password is hashed.
+# Behind proxies, such as Heroku's router, set NUM_PROXIES so the client's address is read from X-Forwarded-For.
+# The buckets live in the 'throttle' cache, which every worker must share for the rates to hold, so it is the
+# database cache unless THROTTLE_CACHE_BACKEND names another of CACHE_BACKENDS; locmem is refused outside DEBUG.
+
+LOGIN_THROTTLE_RATES = {
+    'ip': (30, 2),
+    'email': (5, 60),
+}
+
+NUM_PROXIES = int(os.environ.get('NUM_PROXIES', 0))
+
+THROTTLE_CACHE_BACKEND, THROTTLE_CACHE_LOCATION = CACHE_BACKENDS[os.environ.get('THROTTLE_CACHE_BACKEND', 'db')]
+
+CACHES['throttle'] = {
+    'BACKEND': THROTTLE_CACHE_BACKEND,
+    'LOCATION': os.environ.get('THROTTLE_CACHE_LOCATION', THROTTLE_CACHE_LOCATION),
+}
+
+
+# Request timing
+# clubs.timing.TimingMiddleware reports the SQL, template and total time of a TIMING_SAMPLE_RATE fraction of
+# requests, between 0 and 1, in a Server-Timing header and a line on the 'clubs.timing' logger, which logs to the
+# console as bare logfmt.
+
+TIMING_SAMPLE_RATE = float(os.environ.get('TIMING_SAMPLE_RATE', 0.1))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'timing': {'format': '%(asctime)s timing %(message)s'},
+    },
+    'handlers': {
+        'timing': {'class': 'logging.StreamHandler', 'formatter': 'timing'},
+    },
+    'loggers': {
+        'clubs.timing': {'handlers': ['timing'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -143,9 +297,18 @@ LOGIN_URL = 'log_in'
 # URL where @login_prohibited redirects to
 REDIRECT_URL_WHEN_LOGGED_IN = 'feed'
 
+# Number of rows shown per page of the user, club, application and member lists
+PAGE_SIZE = 50
+
+# Number of suggestions offered while typing in a search box
+AUTOCOMPLETE_LIMIT = 10
+# Seconds autocomplete suggestions are cached for, short enough that new users soon show up
+AUTOCOMPLETE_CACHE_SECONDS = 60
+
 MESSAGE_TAGS = {
     message_constants.DEBUG: 'dark',
     message_constants.ERROR: 'danger',
 }
 
-django_heroku.settings(locals())
\ No newline at end of file
+# Heroku configures the rest, but not logging, which is configured above
+django_heroku.settings(locals(), logging=False)
@@ -0,0 +1,5 @@
+"""Settings for running the tests, which are the development settings with request timing off."""
+from system.settings import *  # noqa: F401, F403
+
+# Tests that check the timings turn sampling on with override_settings
+TIMING_SAMPLE_RATE = 0
@@ -28,17 +28,20 @@ urlpatterns = [
     path('new_application/', views.new_application, name='new_application'),
     path('user/<int:user_id>', views.show_user, name='show_user'),
     path('users/', views.user_list, name='user_list'),
+    path('user_autocomplete/', views.user_autocomplete, name='user_autocomplete'),
     path('view_applications/', views.view_applications, name='view_applications'),
     path('edit_application/<int:application_id>/', views.edit_application, name='edit_application'),
     path('edit_application/', views.edit_application, name='edit_application'),
     path('edit_profile/', views.edit_profile, name='edit_profile'),
     path('create_club/', views.create_club, name='create_club'),
     path('club_list/', views.club_list, name='club_list'),
+    path('club_autocomplete/', views.club_autocomplete, name='club_autocomplete'),
     path('change_password/', views.change_password, name='change_password'),
     path('my_clubs/', views.my_clubs, name='my_clubs'),
     path('my_clubs/<int:type>/', views.my_clubs, name='my_club'),
     path('view_app_to_club/<int:club_id>/', views.view_app_to_club, name='view_app_to_club'),
     path('change_app_status/<int:application_id>/<int:accept>/<int:club_id>/', views.change_app_status, name='change_app_status'),
+    path('bulk_change_app_status/<int:club_id>/', views.bulk_change_app_status, name='bulk_change_app_status'),
     path('club_members/<int:club_id>/', views.club_members, name='club_members'),
     path('change_member_type/<int:user_id>/<int:club_id>/<int:promote>/', views.change_member_type, name='change_member_type'),
     path('create_tournament/<int:club_id>/', views.create_tournament, name='create_tournament'),
@@ -46,4 +49,10 @@ urlpatterns = [
     path('sign_up_tournament/<int:tournament_id>/', views.sign_up_tournament, name='sign_up_tournament'),
     path('withdraw_tournament/<int:tournament_id>/', views.withdraw_tournament, name='withdraw_tournament'),
     path('club_profile/<int:club_id>/', views.club_profile, name='club_profile'),
+    path('tournament_bracket/<int:tournament_id>/', views.tournament_bracket, name='tournament_bracket'),
+    path('create_bracket/<int:tournament_id>/', views.create_bracket, name='create_bracket'),
+    path('advance_bracket_slot/<int:slot_id>/', views.advance_bracket_slot, name='advance_bracket_slot'),
+    path('tournament_round/<int:tournament_id>/<int:number>/', views.tournament_round, name='tournament_round'),
+    path('pair_next_round/<int:tournament_id>/', views.pair_next_round, name='pair_next_round'),
+    path('record_game_result/<int:game_id>/', views.record_game_result, name='record_game_result'),
 ]